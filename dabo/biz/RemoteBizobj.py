@@ -1,19 +1,59 @@
 # -*- coding: utf-8 -*-
-import pickle
 import os
 import time
+import hashlib
+import weakref
 
 import dabo
 from dabo.dLocalize import _
 import dabo.dConstants as kons
 from dabo.lib.connParser import importConnections
+from dabo.lib.dataCodec import encodeDataSet, decodeDataSet, encodeValue
 import dabo.dException as dException
 from dBizobj import dBizobj
+from dBizCacheStore import dSQLiteBizCacheStore
+
+
+# Weak references to the bizobjs holding pooled connections. Their callbacks
+# give the connection back to its pool when the bizobj is garbage collected.
+_connectionFinalizers = set()
+
+
+def _releaseOnCollect(biz, conn):
+	def release(ref):
+		_connectionFinalizers.discard(ref)
+		dabo.log.warn(_("A RemoteBizobj was collected without releaseConnection() "
+				"being called; releasing its pooled connection."))
+		conn.release()
+	ref = weakref.ref(biz, release)
+	_connectionFinalizers.add(ref)
+	return ref
+
+
+def _rowSignature(rec):
+	"""
+	Return a string that identifies the contents of the record. This is the JSON
+	of the values in their encoded form, so that the signature is the same on
+	both sides of the data codec.
+	"""
+	return dabo.lib.jsonEncode(sorted([(unicode(fld), encodeValue(val))
+			for fld, val in rec.items()]))
+
+
+def getDataVersion(rows):
+	"""Return a string that identifies the contents and order of the records."""
+	hsh = hashlib.md5()
+	for rec in rows:
+		hsh.update(_rowSignature(rec))
+	return hsh.hexdigest()
 
 
 
 class RemoteBizobj(dBizobj):
 	cacheDir = None
+	# The dBizCacheStore holding the cursor data between requests. If it is
+	# not set, a dSQLiteBizCacheStore in cacheDir is created on first use.
+	cacheStore = None
 
 	def _beforeInit(self):
 		return super(RemoteBizobj, self)._beforeInit()
@@ -37,6 +77,14 @@ class RemoteBizobj(dBizobj):
 			os.makedirs(cls.cacheDir)
 
 
+	@classmethod
+	def _getCacheStore(cls, pth=None):
+		if cls.cacheStore is None:
+			cls._createCacheDir(pth)
+			cls.cacheStore = dSQLiteBizCacheStore(os.path.join(cls.cacheDir, "bizcache.db"))
+		return cls.cacheStore
+
+
 	def defineConnection(self):
 		"""You must define and create the connection in this method. Otherwise
 		an error will be raised. Pass the connection information to setConnectionParams();
@@ -50,31 +98,47 @@ class RemoteBizobj(dBizobj):
 
 
 	@classmethod
-	def load(cls, hashval, ds, pth):
+	def load(cls, hashval, ds, pth=None):
+		"""Returns a bizobj for the client bizobj identified by hashval. The data
+		stored by storeToCache() is restored for each cursor as it is created.
+		"""
+		cls._getCacheStore(pth)
 		biz = cls()
 		biz.DataSource = ds
 		biz.hashval = hashval
-
-		cls._createCacheDir(pth)
-		pth = os.path.join(cls.cacheDir, hashval)
-		if os.path.exists(pth):
-			f = file(pth)
-			kf, crsData = pickle.load(f)
-			f.close()
-			biz.KeyField = kf
-			# This is a dict with cursor keys as the keys, and
-			# values as a (dataset, typedef) tuple.
-			for kk, (ds, typinfo) in crsData.items():
-				tmpCursor = biz.createCursor(key=kk)
-				tmpCursor._storeData(ds, typinfo)
+		for kk, crs in biz._cursorDictReference().items():
+			biz._restoreCursor(crs, kk)
 		return biz
 
 
+	def createCursor(self, key=None, addToCursorCollection=True):
+		crs = super(RemoteBizobj, self).createCursor(key=key,
+				addToCursorCollection=addToCursorCollection)
+		if crs is not None and addToCursorCollection and getattr(self, "hashval", None):
+			if key is None:
+				key = self._CurrentCursorKey
+			self._restoreCursor(crs, key)
+		return crs
+
+
+	def _restoreCursor(self, crs, key):
+		"""Give the cursor the data stored for it by storeToCache(), if any."""
+		enc = self._getCacheStore().get(self.hashval, key)
+		if enc is not None:
+			data, typinfo, stru, extra = decodeDataSet(enc)
+			self.KeyField = extra["keyField"][0]
+			crs._storeData(data, typinfo)
+
+
 	def setConnectionParams(self, cxnfile=None, dbType=None, database=None,
 			host=None, user=None, password=None, plainTextPassword=None):
+		"""The connection is acquired from the shared pool for these settings, so
+		call releaseConnection() once the request has been handled, unless it
+		ends with applyDiffAndSave(primary=True), which does that itself.
+		"""
 		if cxnfile:
 			cxDict = importConnections(cxnfile)
-			self.setConnection(cxDict.values()[0])
+			ci = dabo.db.dConnectInfo(cxDict.values()[0])
 		else:
 			cxnDict = {"DbType": dbType, "Database": database}
 			if host:
@@ -86,24 +150,107 @@ class RemoteBizobj(dBizobj):
 			if password:
 				cxnDict["Password"] = password
 			ci = dabo.db.dConnectInfo(cxnDict)
-			cn = dabo.db.dConnection(ci)
-			self.setConnection(cn)
+		conn = dabo.db.getPool(ci).acquire()
+		self.setConnection(conn)
+		# In case releaseConnection() isn't called, release the connection
+		# when this bizobj is collected rather than leaking the pool slot.
+		self._connectionFinalizer = _releaseOnCollect(self, conn)
+
+
+	def releaseConnection(self):
+		_connectionFinalizers.discard(self.__dict__.pop("_connectionFinalizer", None))
+		super(RemoteBizobj, self).releaseConnection()
 
 
 	def storeToCache(self, hashval):
 		"""Store data info to the cache for the next time the same bizobj
-		is needed.
+		is needed. Each cursor is stored separately.
 		"""
-		self._createCacheDir()
-		pth = os.path.join(self.cacheDir, hashval)
-		f = file(pth, "w")
-		pd = {}
+		store = self._getCacheStore()
 		cursorDict = self._cursorDictReference()
 		for kk, cursor in cursorDict.items():
-			pd[kk] = (cursor.getDataSet(returnInternals=True), cursor.getDataTypes())
-		dataToStore = (self.KeyField, pd)
-		pickle.dump(dataToStore, f)
-		f.close()
+			enc = encodeDataSet(cursor.getDataSet(returnInternals=True),
+					cursor.getDataTypes(), keyField=[self.KeyField])
+			store.set(hashval, kk, enc)
+
+
+	def getEncodedDataSet(self):
+		"""Returns the records of the current cursor in the format that the client's
+		RemoteConnector reads, such as for the response to a delete.
+		"""
+		return encodeDataSet(list(self._CurrentCursor.getDataSet()),
+				self.getDataTypes(), self.getDataStructure())
+
+
+	def requeryForClient(self, sql, params=None, clientVersion=None):
+		"""Runs the query sent by the client's RemoteConnector.requery(), and returns
+		a (status, version, body) tuple for the response. The version identifies
+		the resulting data, and should be sent as the ETag header. The client sends
+		it back as the If-None-Match header of its next requery; pass that as the
+		'clientVersion' parameter.
+
+		If the client's data is still current, the status is 304, and the body is
+		empty. Otherwise the status is 200. If the client's data is the data that
+		was cached for this bizobj by storeToCache(), and only some of the rows
+		have changed, the body just contains those rows and the PKs of the deleted
+		ones. Otherwise it contains the complete data set.
+
+		Call storeToCache() afterwards, since that data is the base of the next
+		delta.
+		"""
+		if clientVersion:
+			clientVersion = clientVersion.strip('"')
+		crs = self._CurrentCursor
+		kf = self.KeyField
+		prior = None
+		if clientVersion and isinstance(kf, basestring) and "," not in kf:
+			prior = list(crs.getDataSet())
+			if getDataVersion(prior) != clientVersion:
+				# The client has some other data.
+				prior = None
+		self.storeRemoteSQL(sql)
+		if params:
+			self.setParams(params)
+		self.requery()
+		rows = list(crs.getDataSet())
+		version = getDataVersion(rows)
+		if version == clientVersion:
+			return (304, version, "")
+		if prior is not None:
+			delta = self._getDelta(prior, rows, kf)
+			if delta is not None:
+				changed, deleted, order = delta
+				extra = {"deleted": deleted}
+				if order is not None:
+					extra["order"] = order
+				return (200, version, encodeDataSet(changed, self.getDataTypes(), **extra))
+		body = encodeDataSet(rows, self.getDataTypes(), self.getDataStructure())
+		return (200, version, body)
+
+
+	def _getDelta(self, prior, rows, kf):
+		"""Returns a (changed rows, deleted PKs, PK order) tuple with the changes
+		that turn the 'prior' records into 'rows'. The order is None if the client
+		gets the right one by removing the deleted rows and appending the new ones.
+		Returns None if sending all the rows would be about as efficient.
+		"""
+		priorSigs = dict([(rec[kf], _rowSignature(rec)) for rec in prior])
+		pks = [rec[kf] for rec in rows]
+		pkSet = set(pks)
+		if len(priorSigs) != len(prior) or len(pkSet) != len(rows):
+			# The KeyField isn't unique in these results.
+			return None
+		changed = [rec for rec in rows if priorSigs.get(rec[kf]) != _rowSignature(rec)]
+		deleted = [rec[kf] for rec in prior if rec[kf] not in pkSet]
+		if 2 * (len(changed) + len(deleted)) > len(rows):
+			return None
+		expected = [rec[kf] for rec in prior if rec[kf] in pkSet]
+		expected += [rec[kf] for rec in changed if rec[kf] not in priorSigs]
+		if expected == pks:
+			order = None
+		else:
+			order = pks
+		return (changed, deleted, order)
 
 
 	def storeRemoteSQL(self, sql):
@@ -135,7 +282,17 @@ class RemoteBizobj(dBizobj):
 
 		If this is the primary bizobj called from the web server, the 'primary'
 		parameter will be true, meaning that this bizobj will handle transactions.
+		As that ends the request, it also releases its pooled connection.
 		"""
+		try:
+			return self._applyDiffAndSave(diff, primary)
+		finally:
+			if primary and "_connectionFinalizer" in self.__dict__:
+				self.releaseConnection()
+
+
+	def _applyDiffAndSave(self, diff, primary=False):
+		"""Does the work of applyDiffAndSave()."""
 		if primary:
 			self._CurrentCursor.beginTransaction()
 		myDiff = diff.pop(self.hashval, None)
@@ -175,7 +332,10 @@ class RemoteBizobj(dBizobj):
 					if not kidClass:
 						abort(404, _("DataSource '%s' not found") % kidDS)
 					kidBiz = kidClass.load(kidHash, kidDS)
-					kidBiz.applyDiffAndSave({kidHash: kidInfo})
+					try:
+						kidBiz.applyDiffAndSave({kidHash: kidInfo})
+					finally:
+						kidBiz.releaseConnection()
 
 			try:
 				self.saveAll()
@@ -22,6 +22,7 @@ So, dabo.biz sits in between dabo.db and dabo.ui
 """
 from dBizobj import dBizobj
 from RemoteBizobj import RemoteBizobj
+from dBizCacheStore import dBizCacheStore, dSQLiteBizCacheStore
 
 from dAutoBizobj import dAutoBizobj
 from dAutoBizobj import autoCreateTables
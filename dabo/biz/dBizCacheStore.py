@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+try:
+	from pysqlite2 import dbapi2 as sqlite
+except ImportError:
+	import sqlite3 as sqlite
+import dabo
+from dabo.dLocalize import _
+from dabo.dObject import dObject
+from dabo.lib.lruCache import LRUCache
+
+
+
+class dBizCacheStore(dObject):
+	"""
+	Holds the cursor data of RemoteBizobj instances between requests. Each
+	cursor is stored separately, keyed by the bizobj's hashval and the cursor's
+	key, so that a child bizobj only reads the cursors it needs.
+
+	Recently used entries are kept in memory, in front of the backing store
+	implemented by subclasses in _read(), _readStored(), _write(), _delete(),
+	_evict(), _storedCount() and _storedSize(). An entry in memory is only used
+	while the backing store holds the same version of it, so that processes
+	sharing the backing store never get data that another one has replaced.
+	Entries expire TimeToLive seconds after they were stored, and the least
+	recently stored ones are evicted once the backing store holds more than
+	MaxSize bytes.
+	"""
+	# Check the size of the backing store after this many writes.
+	evictionCheckInterval = 50
+
+	def __init__(self, *args, **kwargs):
+		self._baseClass = dBizCacheStore
+		self._memory = LRUCache(200)
+		self._timeToLive = 3600
+		self._maxSize = 100 * 1024 * 1024
+		self._hits = self._misses = self._evictions = 0
+		self._writesSinceEviction = 0
+		self._lock = threading.Lock()
+		super(dBizCacheStore, self).__init__(*args, **kwargs)
+
+
+	def get(self, hashval, cursorKey):
+		"""Return the data stored for the cursor, or None if there is none."""
+		key = (hashval, repr(cursorKey))
+		minTime = time.time() - self.TimeToLive
+		stored = self._readStored(*key)
+		entry = None
+		if stored is not None and stored >= minTime:
+			entry = self._memory.get(key)
+			if entry is None or entry[1] != stored:
+				# Not in memory, or replaced since it was read.
+				entry = self._read(*key)
+		if entry is None or entry[1] < minTime:
+			self._memory.pop(key)
+			self._misses += 1
+			return None
+		self._memory[key] = entry
+		self._hits += 1
+		return entry[0]
+
+
+	def set(self, hashval, cursorKey, data):
+		"""Store the data, a string, for the cursor."""
+		key = (hashval, repr(cursorKey))
+		entry = (data, time.time())
+		self._memory[key] = entry
+		self._write(key[0], key[1], *entry)
+		self._lock.acquire()
+		try:
+			self._writesSinceEviction += 1
+			evict = (self._writesSinceEviction >= self.evictionCheckInterval)
+			if evict:
+				self._writesSinceEviction = 0
+		finally:
+			self._lock.release()
+		if evict:
+			self.evict()
+
+
+	def delete(self, hashval):
+		"""Remove the data stored for all of the cursors of a bizobj."""
+		for key in self._memory.keys():
+			if key[0] == hashval:
+				self._memory.pop(key)
+		self._delete(hashval)
+
+
+	def evict(self):
+		"""
+		Remove the expired entries, and the oldest ones if the backing store
+		is larger than MaxSize. This also happens automatically as data is stored.
+		"""
+		self._evictions += self._evict(time.time() - self.TimeToLive, self.MaxSize)
+
+
+	def close(self):
+		"""Release the resources used by the backing store."""
+		pass
+
+
+	def _read(self, hashval, cursorKey):
+		"""Return a (data, time stored) tuple, or None if the key isn't stored."""
+		raise NotImplementedError
+
+
+	def _readStored(self, hashval, cursorKey):
+		"""Return the time the key's data was stored, or None if it isn't stored."""
+		raise NotImplementedError
+
+
+	def _write(self, hashval, cursorKey, data, stored):
+		raise NotImplementedError
+
+
+	def _delete(self, hashval):
+		raise NotImplementedError
+
+
+	def _evict(self, minTime, maxSize):
+		"""
+		Remove the entries stored before minTime, and the oldest entries
+		until no more than maxSize bytes are stored. Return the number removed.
+		"""
+		raise NotImplementedError
+
+
+	def _storedCount(self):
+		raise NotImplementedError
+
+
+	def _storedSize(self):
+		raise NotImplementedError
+
+
+	def _getCount(self):
+		return self._storedCount()
+
+
+	def _getEvictions(self):
+		return self._evictions
+
+
+	def _getHits(self):
+		return self._hits
+
+
+	def _getMaxSize(self):
+		return self._maxSize
+
+	def _setMaxSize(self, val):
+		self._maxSize = val
+
+
+	def _getMemoryItems(self):
+		return self._memory.MaxSize
+
+	def _setMemoryItems(self, val):
+		self._memory.MaxSize = val
+
+
+	def _getMisses(self):
+		return self._misses
+
+
+	def _getSize(self):
+		return self._storedSize()
+
+
+	def _getTimeToLive(self):
+		return self._timeToLive
+
+	def _setTimeToLive(self, val):
+		self._timeToLive = val
+
+
+	Count = property(_getCount, None, None,
+			_("Number of cursors held in the backing store.  (int)"))
+
+	Evictions = property(_getEvictions, None, None,
+			_("Number of entries removed because they expired or the store was full.  (int)"))
+
+	Hits = property(_getHits, None, None,
+			_("Number of get() calls that found data.  (int)"))
+
+	MaxSize = property(_getMaxSize, _setMaxSize, None,
+			_("""Bytes of data the backing store may hold before the least recently
+			stored entries are evicted. Default=100MB  (int)"""))
+
+	MemoryItems = property(_getMemoryItems, _setMemoryItems, None,
+			_("Number of entries kept in memory. Default=200  (int)"))
+
+	Misses = property(_getMisses, None, None,
+			_("Number of get() calls that found no data, or only expired data.  (int)"))
+
+	Size = property(_getSize, None, None,
+			_("Bytes of data held in the backing store.  (int)"))
+
+	TimeToLive = property(_getTimeToLive, _setTimeToLive, None,
+			_("Seconds that stored data remains available. Default=3600  (int)"))
+
+
+
+class dSQLiteBizCacheStore(dBizCacheStore):
+	"""Keeps the cached cursor data in a table in an SQLite database file."""
+	def __init__(self, database, *args, **kwargs):
+		self._database = database
+		self._connection = sqlite.connect(database, check_same_thread=False)
+		self._connection.executescript("""
+create table if not exists bizcache (hashval TEXT, cursorkey TEXT, data BLOB,
+		size INTEGER, stored REAL, primary key (hashval, cursorkey));
+create index if not exists bizcache_stored on bizcache (stored);
+""")
+		super(dSQLiteBizCacheStore, self).__init__(*args, **kwargs)
+
+
+	def close(self):
+		self._connection.close()
+
+
+	def _execute(self, sql, params=(), commit=False):
+		"""Run the statement, returning all the rows it produces."""
+		self._lock.acquire()
+		try:
+			rows = self._connection.execute(sql, params).fetchall()
+			if commit:
+				self._connection.commit()
+			return rows
+		finally:
+			self._lock.release()
+
+
+	def _read(self, hashval, cursorKey):
+		rows = self._execute("select data, stored from bizcache where hashval = ? and cursorkey = ?",
+				(hashval, cursorKey))
+		if not rows:
+			return None
+		return (str(rows[0][0]), rows[0][1])
+
+
+	def _readStored(self, hashval, cursorKey):
+		rows = self._execute("select stored from bizcache where hashval = ? and cursorkey = ?",
+				(hashval, cursorKey))
+		if not rows:
+			return None
+		return rows[0][0]
+
+
+	def _write(self, hashval, cursorKey, data, stored):
+		self._execute("insert or replace into bizcache values (?, ?, ?, ?, ?)",
+				(hashval, cursorKey, sqlite.Binary(data), len(data), stored), commit=True)
+
+
+	def _delete(self, hashval):
+		self._execute("delete from bizcache where hashval = ?", (hashval, ), commit=True)
+
+
+	def _evict(self, minTime, maxSize):
+		self._lock.acquire()
+		try:
+			conn = self._connection
+			removed = conn.execute("delete from bizcache where stored < ?", (minTime, )).rowcount
+			excess = (conn.execute("select sum(size) from bizcache").fetchone()[0] or 0) - maxSize
+			if excess > 0:
+				oldest = []
+				for hashval, cursorKey, size in conn.execute(
+						"select hashval, cursorkey, size from bizcache order by stored"):
+					oldest.append((hashval, cursorKey))
+					excess -= size
+					if excess <= 0:
+						break
+				conn.executemany("delete from bizcache where hashval = ? and cursorkey = ?", oldest)
+				removed += len(oldest)
+			conn.commit()
+		finally:
+			self._lock.release()
+		return removed
+
+
+	def _storedCount(self):
+		return self._execute("select count(*) from bizcache")[0][0]
+
+
+	def _storedSize(self):
+		return self._execute("select sum(size) from bizcache")[0][0] or 0
+
+
+	def _getDatabase(self):
+		return self._database
+
+
+	Database = property(_getDatabase, None, None,
+			_("Path of the SQLite database file holding the data.  (str)"))
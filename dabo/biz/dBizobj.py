@@ -23,6 +23,13 @@ class dBizobj(dObject):
 	""" The middle tier, where the business logic resides."""
 	# Class to instantiate for the cursor object
 	dCursorMixinClass = dCursorMixin
+	# Methods called by save() for each row. When none are overridden, saveAll()
+	# can save the rows of a bizobj without children in batches.
+	_rowSaveMethods = ("save", "beforeSave", "afterSave", "afterChange", "_validate",
+			"validateRecord", "_onSaveNew", "onSaveNew")
+	# Methods that deleteAll() relies on deleting each row. When none are
+	# overridden, the rows of a bizobj without children are deleted in bulk.
+	_rowDeleteMethods = ("delete", "afterDelete", "onDeleteLastRecord")
 	# Tell dObject that we'll call before and afterInit manually:
 	_call_beforeInit, _call_afterInit, _call_initProperties = False, False, False
 
@@ -36,6 +43,12 @@ class dBizobj(dObject):
 		self.__cursors = {}
 		# PK of the currently-selected cursor
 		self.__currentCursorKey = None
+		# When each cursor was last made current, for evicting the least
+		# recently used ones when MaxCachedCursors is set.
+		self.__cursorTicks = {}
+		self.__cursorTick = 0
+		self._maxCachedCursors = None
+		self._cursorCacheHits = self._cursorCacheMisses = 0
 		# Description of the data represented by this bizobj
 		self._dataStructure = None
 		self._dataSource = self._dataSourceName = ""
@@ -77,6 +90,14 @@ class dBizobj(dObject):
 		self.__relationDictSet = False
 		# Do we try to same on the same record during a requery?
 		self._restorePositionOnRequery = True
+		# Paging: the rows per page, the current page, and the sort values of
+		# the last row of each visited page, keyed on the number of the page
+		# that follows it.
+		self._pageSize = 0
+		self._pageNumber = None
+		self._pageIsLast = False
+		self._pageBounds = {}
+		self._pageSignature = None
 
 		# Various attributes used for Properties
 		self._caption = ""
@@ -96,6 +117,10 @@ class dBizobj(dObject):
 		self.exitScan = False
 		self.dbapiCursorClass = None
 		self._childCacheInterval = None
+		self._prefetchChildren = False
+		# Keys of the cursors that were filled by prefetchChildren(), and
+		# haven't been used yet.
+		self._prefetchedKeys = set()
 
 		##########################################
 		### referential integrity stuff ####
@@ -141,6 +166,27 @@ class dBizobj(dObject):
 		return self._connection
 
 
+	def releaseConnection(self):
+		"""
+		Give the connection used by this bizobj and its children back to the
+		dConnectionPool it was acquired from. Connections that don't come from
+		a pool are left open. Either way, this bizobj and its children no longer
+		reference the connection, and their cursors must not be used again
+		until setConnection() is called.
+		"""
+		conn = self._connection
+		self._dropConnection(conn)
+		if conn is not None and conn.IsPooled:
+			conn.release()
+
+
+	def _dropConnection(self, conn):
+		if self._connection is conn:
+			self._connection = self._cursorFactory = None
+		for child in self._children:
+			child._dropConnection(conn)
+
+
 	def clear(self, confirmed=False):
 		"""
 		Clear all cursors and records from self and children.
@@ -181,6 +227,9 @@ class dBizobj(dObject):
 					or (not flush_changed and cursor.isChanged()):
 				cursors[key] = cursor
 		self.__cursors = cursors
+		for key in self.__cursorTicks.keys():
+			if key not in cursors:
+				del self.__cursorTicks[key]
 		if flush_current:
 			self.__currentCursorKey = None
 		for child in self._children:
@@ -271,6 +320,7 @@ class dBizobj(dObject):
 		crs.setCursorFactory(cf.getCursor, cursorClass)
 		if addToCursorCollection:
 			self.__cursors[key] = crs
+			self.__touchCursor(key)
 			crs.sqlManager = self.SqlManager
 		if _dataStructure is not None:
 			crs._dataStructure = _dataStructure
@@ -289,6 +339,86 @@ class dBizobj(dObject):
 		return crs
 
 
+	def __touchCursor(self, key):
+		"""Record that the cursor for the passed key was just used."""
+		self.__cursorTick += 1
+		self.__cursorTicks[key] = self.__cursorTick
+
+
+	def _trimCursors(self):
+		"""
+		Drop the least recently used cursors until no more than MaxCachedCursors
+		are left. The current cursor is never dropped. Neither are cursors with
+		changes, or whose rows have changed records in the cursors of the child
+		bizobjs. When a cursor is dropped, the child cursors that belong to its
+		rows are dropped along with it.
+		"""
+		maxCursors = self._maxCachedCursors
+		cursors = self.__cursors
+		if not maxCursors or len(cursors) <= maxCursors:
+			return
+		excess = len(cursors) - maxCursors
+		ticks = self.__cursorTicks
+		for key in sorted(cursors, key=lambda key: ticks.get(key, 0)):
+			if not excess:
+				break
+			if self._canDropCursor(key):
+				self._dropCursor(key)
+				excess -= 1
+
+
+	def _canDropCursor(self, key):
+		"""
+		Return True if the cursor for the passed key, and the child cursors that
+		belong to its rows, can be dropped without losing changes.
+		"""
+		if key == self.__currentCursorKey:
+			return False
+		cursor = self.__cursors[key]
+		if cursor.isChanged(allRows=True, includeNewUnchanged=True):
+			return False
+		for child in self._children:
+			for childKey in child._getChildCursorKeys(cursor):
+				if not child._canDropCursor(childKey):
+					return False
+		return True
+
+
+	def _dropCursor(self, key):
+		"""Drop the cursor for the passed key, along with its child cursors."""
+		cursor = self.__cursors.pop(key)
+		self.__cursorTicks.pop(key, None)
+		self._prefetchedKeys.discard(key)
+		for child in self._children:
+			for childKey in child._getChildCursorKeys(cursor):
+				child._dropCursor(childKey)
+
+
+	def _getChildCursorKeys(self, parentCursor):
+		"""
+		Return the keys of this child bizobj's cursors that belong to the rows of
+		the passed cursor of the parent.
+		"""
+		cursors = self.__cursors
+		if not cursors:
+			return []
+		fld = self.ParentLinkField
+		if fld:
+			flds = fld.replace(" ", "").split(",")
+		ret = []
+		for rec in parentCursor._records:
+			if fld:
+				parentCursor._correctFieldTypesIfNeeded(rec)
+				key = tuple([rec[linkField] for linkField in flds])
+				if len(key) == 1:
+					key = key[0]
+			else:
+				key = parentCursor.pkExpression(rec)
+			if key in cursors:
+				ret.append(key)
+		return ret
+
+
 	def _getCursorClass(self, main, secondary):
 		class cursorMix(main, secondary):
 			superMixin = main
@@ -485,16 +615,31 @@ class dBizobj(dObject):
 		if errMsg:
 			raise dException.BusinessRuleViolation(errMsg)
 
-		startTransaction = startTransaction and self.beginTransaction()
+		if self._canBatchSave() and self.isAnyChanged():
+			if self.KeyField is None:
+				raise dException.MissingPKException(
+						_("No key field defined for table: %s") % self.DataSource)
+			startTransaction = startTransaction and self.beginTransaction()
+			# Nothing needs to run between the rows, so let the cursor save
+			# them all at once, in batches of alike rows.
+			try:
+				self._CurrentCursor.save(allRows=True,
+						includeNewUnchanged=self.SaveNewUnchanged)
+			except (dException.DBQueryException, dException.dException):
+				if startTransaction:
+					self.rollbackTransaction()
+				raise
+		else:
+			startTransaction = startTransaction and self.beginTransaction()
 
-		# First save the rows we know we've visited:
-		try:
-			self.scanKeys(self.save, self._visitedKeys, startTransaction=False,
-					saveTheChildren=saveTheChildren, scanRequeryChildren=False)
-		except (dException.DBQueryException, dException.dException):
-			if startTransaction:
-				self.rollbackTransaction()
-			raise
+			# First save the rows we know we've visited:
+			try:
+				self.scanKeys(self.save, self._visitedKeys, startTransaction=False,
+						saveTheChildren=saveTheChildren, scanRequeryChildren=False)
+			except (dException.DBQueryException, dException.dException):
+				if startTransaction:
+					self.rollbackTransaction()
+				raise
 
 		# Finally, scan all rows only if there are still potentially unsaved rows.
 		# The isAnyChanged() call will be expensive if there are changes buried
@@ -516,6 +661,29 @@ class dBizobj(dObject):
 		self.afterSaveAll()
 
 
+	def _canBatchSave(self):
+		"""
+		Return True if saveAll() can have the cursor save all the changed rows
+		in one call: there are no child bizobjs, and none of the methods that
+		save() calls for each row are overridden. The rows are saved in the
+		order of the cursor, rather than the visited rows first.
+		"""
+		return not self._children and not self._isOverridden(self._rowSaveMethods)
+
+
+	def _isOverridden(self, names):
+		"""
+		Return True if any of the named methods is overridden by a subclass, or
+		set on the instance.
+		"""
+		for name in names:
+			if name in self.__dict__:
+				return True
+			if getattr(self.__class__, name).im_func is not getattr(dBizobj, name).im_func:
+				return True
+		return False
+
+
 	def save(self, startTransaction=True, saveTheChildren=True):
 		"""
 		Save any changes that have been made in the current row.
@@ -726,9 +894,12 @@ class dBizobj(dObject):
 		cursorKey = self.__currentCursorKey
 		startTransaction = startTransaction and self.beginTransaction()
 		try:
-			while self.RowCount > 0:
-				self.first()
-				self.delete(startTransaction=False, inLoop=True)
+			if not self._canBatchDelete():
+				while self.RowCount > 0:
+					self.first()
+					self.delete(startTransaction=False, inLoop=True)
+			elif self.RowCount > 0:
+				self._deleteAllRows()
 			if startTransaction:
 				self.commitTransaction()
 
@@ -748,6 +919,35 @@ class dBizobj(dObject):
 		self._CurrentCursor = cursorKey
 
 
+	def _canBatchDelete(self):
+		"""
+		Return True if deleteAll() can delete the rows with bulk deletes: there
+		are no child bizobjs, and none of the _rowDeleteMethods are overridden.
+		"""
+		return not self._children and not self._isOverridden(self._rowDeleteMethods)
+
+
+	def _deleteAllRows(self):
+		"""
+		Delete all the rows of a bizobj without children with bulk deletes,
+		after the delete hooks have approved each of the rows.
+		"""
+		cursor = self._CurrentCursor
+		if self.KeyField is None:
+			raise dException.dException(
+					_("No key field defined for table: ") + self.DataSource)
+		for row in xrange(self.RowCount):
+			cursor.RowNumber = row
+			errMsg = self.beforeDelete()
+			if not errMsg:
+				errMsg = self.beforePointerMove()
+			if errMsg:
+				raise dException.BusinessRuleViolation(errMsg)
+		cursor.deleteRows()
+		# Hook method for handling the deletion of the last record in the cursor.
+		self.onDeleteLastRecord()
+
+
 	def execute(self, sql, params=None):
 		"""Execute the sql on the cursor. Dangerous. Use executeSafe instead."""
 		self._syncWithCursors()
@@ -924,6 +1124,8 @@ class dBizobj(dObject):
 		requeryChildren = kwargs.pop("scanRequeryChildren", self.ScanRequeryChildren)
 		currentStatus = self.__getCurrentStatus()
 		ret = None
+		if requeryChildren and self._prefetchChildren:
+			self.prefetchChildren(rows)
 
 		try:
 			if reverse:
@@ -1208,10 +1410,147 @@ class dBizobj(dObject):
 
 		If convertQMarks is True (default is False), any ?'s in the sql will
 		get converted to whatever the marker is for the database backend.
+
+		When PageSize is set, only the first page of rows is loaded; see
+		requeryPage().
 		"""
 		rp = self._RemoteProxy
 		if rp:
 			return rp.requery()
+		if self.PageSize and not self.UserSQL:
+			self._pageSignature = None
+			self._requeryPage(0, convertQMarks=convertQMarks)
+		else:
+			self._pageNumber = None
+			self._requery(convertQMarks=convertQMarks)
+
+
+	def requeryPage(self, pageNum, convertQMarks=False):
+		"""
+		Requery the data set to hold page number 'pageNum' (starting at 0) of
+		PageSize rows. The rows are ordered on the current sort column, if any,
+		followed by the primary key.
+
+		A page that follows one that has already been visited starts right
+		after the last row of that page (keyset paging), so the database
+		doesn't have to skip over the rows of the earlier pages. Other pages
+		are reached by skipping rows, on backends that support it.
+
+		Unsaved changes survive a change of page: changed and new records, and
+		records whose children have changes, are kept in the data set after the
+		rows of the page until they are saved or canceled.
+		"""
+		if self._RemoteProxy:
+			raise dException.dException(_("Remote bizobjs can't be requeried by page."))
+		if not self.PageSize:
+			raise dException.dException(_("PageSize must be set to requery by page."))
+		if self.UserSQL:
+			raise dException.dException(
+					_("Requerying by page requires SQL built with the SQL Builder methods."))
+		if pageNum < 0:
+			raise dException.dException(_("Invalid page number: %s") % pageNum)
+		self._requeryPage(pageNum, convertQMarks=convertQMarks, keepChanges=True)
+
+
+	def nextPage(self):
+		"""
+		Requery the data set to hold the page after the current one. Returns
+		False, without requerying, if the current page is the last one.
+		"""
+		if self._pageNumber is None:
+			self.requeryPage(0)
+		elif self._pageIsLast:
+			return False
+		else:
+			self.requeryPage(self._pageNumber + 1)
+		return True
+
+
+	def priorPage(self):
+		"""
+		Requery the data set to hold the page before the current one, with the
+		last row of that page as the current row. Returns False, without
+		requerying, if the current page is the first one.
+		"""
+		if not self._pageNumber:
+			return False
+		self._requeryPage(self._pageNumber - 1, keepChanges=True, toLastRow=True)
+		return True
+
+
+	def _requeryPage(self, pageNum, convertQMarks=False, keepChanges=False,
+			toLastRow=False):
+		"""Load the page, once the arguments have been checked."""
+		cursor = self._CurrentCursor
+		kf = cursor.KeyField
+		if not isinstance(kf, tuple):
+			kf = (kf,)
+		orderFields = kf
+		sortCol = cursor.sortColumn
+		if sortCol and sortCol not in kf:
+			orderFields = (sortCol,) + kf
+		descending = (cursor.sortOrder.upper() == "DESC")
+		# Bounds only apply to the query, order and parent record they came from.
+		signature = (orderFields, descending, cursor.getSQL(), self.getParams(),
+				self.setChildLinkFilter())
+		if signature != self._pageSignature:
+			self._pageSignature = signature
+			self._pageBounds = {}
+		afterValues = self._pageBounds.get(pageNum)
+		offset = 0
+		if afterValues is None:
+			offset = pageNum * self.PageSize
+		sql, params = cursor.getPageSQL(self.PageSize, offset=offset,
+				orderFields=orderFields, afterValues=afterValues, descending=descending)
+
+		stash = None
+		if keepChanges:
+			stash = cursor._stashRecords(self._getPageKeepKeys())
+		self._requery(convertQMarks=convertQMarks,
+				page=(pageNum, sql, params, orderFields, stash, toLastRow))
+
+
+	def _getPageKeepKeys(self):
+		"""
+		Return the PKs of the records that have to stay in the data set when
+		another page is loaded.
+		"""
+		cursor = self._CurrentCursor
+		keys = set(cursor._mementos) | set(cursor._newRecords)
+		def _addIfChanged():
+			if self.isChanged():
+				keys.add(self.getPK())
+		# Only rows that were visited can have changed children.
+		self.scanKeys(_addIfChanged, self._visitedKeys - keys, scanRequeryChildren=False)
+		return keys
+
+
+	def _storePage(self, pageNum, orderFields, stash, toLastRow):
+		"""
+		Note the bounds of the page that was just loaded, and put back the
+		records that were kept from the previous data set.
+		"""
+		cursor = self._CurrentCursor
+		pageRows = cursor.RowCount
+		self._pageNumber = pageNum
+		self._pageIsLast = (pageRows < self.PageSize)
+		if not self._pageIsLast:
+			self._pageBounds[pageNum + 1] = tuple([cursor.getFieldVal(fld, pageRows - 1)
+					for fld in orderFields])
+		if stash:
+			cursor._restoreRecords(stash)
+		if toLastRow:
+			cursor.RowNumber = pageRows - 1
+		else:
+			cursor.RowNumber = 0
+
+
+	def _requery(self, convertQMarks=False, page=None):
+		"""
+		Run the requery. If 'page' is passed, it contains the page number, the
+		SQL and added params for the page, the fields it is ordered on, the
+		records to keep, and whether to move to the last row of the page.
+		"""
 		errMsg = self.beforeRequery()
 		if errMsg:
 			raise dException.BusinessRuleViolation(errMsg)
@@ -1224,6 +1563,10 @@ class dBizobj(dObject):
 		# Hook method for creating the param tuple. Note that the child filter
 		# clause, if any, will always be the first clause in the WHERE expression.
 		params = _childParamTuple + self.getParams()
+		pageSQL = None
+		if page is not None:
+			pageNum, pageSQL, pageParams, orderFields, stash, toLastRow = page
+			params += pageParams
 		uiException = None
 
 		# Since the FK value can't be None, we don't need to run non matching
@@ -1238,8 +1581,9 @@ class dBizobj(dObject):
 			oldDataStructure = hash(self.DataStructure)
 			# run the requery
 			cursor = self._CurrentCursor
+			self._prefetchedKeys.discard(self.__currentCursorKey)
 			try:
-				cursor.requery(params, convertQMarks=convertQMarks)
+				cursor.requery(params, convertQMarks=convertQMarks, sql=pageSQL)
 			except dException.ConnectionLostException:
 				raise
 			except dException.DBQueryException:
@@ -1249,9 +1593,14 @@ class dBizobj(dObject):
 				uiException = dException.NoRecordsException
 			except dException.dException:
 				raise
-			self._visitedKeys.clear()
-			if self.RestorePositionOnRequery:
-				self._positionUsingPK(currPK, updateChildren=False)
+			if page is not None:
+				# Visited keys are kept, so that the changes that were carried
+				# over are found by saveAll() and cancelAll().
+				self._storePage(pageNum, orderFields, stash, toLastRow)
+			else:
+				self._visitedKeys.clear()
+				if self.RestorePositionOnRequery:
+					self._positionUsingPK(currPK, updateChildren=False)
 			if hash(self.DataStructure) != oldDataStructure:
 				self._clearCursorRecord()
 
@@ -1955,8 +2304,100 @@ class dBizobj(dObject):
 			self.afterChildRequery()
 
 
+	def prefetchChildren(self, rows=None):
+		"""
+		Load the child records for the passed rows of this bizobj, or for all of
+		its rows, with one query per child for each block of parent link values,
+		instead of one query per child for every row. The records are stored in
+		the child cursors for those parent rows, which then count as freshly
+		requeried: moving to one of the rows uses them instead of requerying
+		the children, the first time and for as long as ChildCacheInterval
+		allows.
+
+		Children whose cursors have unsaved changes are skipped, as are
+		children linked on more than one field, that use UserSQL or an
+		explicit limit clause, or that don't select their LinkField; those
+		are requeried as usual.
+		"""
+		if not self._children or not self.RowCount:
+			return
+		if rows is None:
+			rows = xrange(self.RowCount)
+		for child in self._children:
+			if child.RequeryWithParent:
+				child._prefetchForParentRows(rows)
+
+
+	def _prefetchForParentRows(self, rows):
+		"""Load this child's records for the passed rows of the parent. See prefetchChildren()."""
+		parent = self.Parent
+		crs = self._CurrentCursor
+		linkField = self.LinkField.strip()
+		parentField = self.ParentLinkField or parent.KeyField
+		if not linkField or "," in linkField or isinstance(parentField, tuple) \
+				or crs.UserSQL or crs.getLimitClause():
+			return
+		linkField = linkField.split(".")[-1]
+		pcrs = parent._CurrentCursor
+		pcrs._fetchRemaining()
+		values = []
+		seen = set()
+		for row in rows:
+			if not self.ParentLinkField and kons.CURSOR_TMPKEY_FIELD in pcrs._records[row]:
+				# A new parent can't have saved child records yet.
+				continue
+			val = pcrs.getFieldVal(parentField, row)
+			if val is None or val in seen:
+				continue
+			seen.add(val)
+			existing = self.__cursors.get(val)
+			if existing is not None and existing.isChanged(allRows=True,
+					includeNewUnchanged=True):
+				continue
+			values.append(val)
+		if not values:
+			return
+
+		crs._syncAuxProperties()
+		aux = crs.AuxCursor
+		params = self.getParams()
+		blockSize = crs.BackendObject.getInListBatchSize(len(params))
+		groups = {}
+		for pos in xrange(0, len(values), blockSize):
+			block = values[pos:pos + blockSize]
+			aux.execute(crs.getChildBlockSQL(linkField, len(block)), tuple(block) + params)
+			if linkField not in [fld[0] for fld in aux.FieldDescription]:
+				# The records can't be told apart by parent; leave them to the
+				# regular requery.
+				return
+			for rec in aux._records:
+				aux._correctFieldTypesIfNeeded(rec)
+				groups.setdefault(rec[linkField], []).append(rec)
+		typs = aux._types
+		for val in values:
+			cursor = self.__cursors.get(val)
+			if cursor is None:
+				# Don't let the new cursor requery itself.
+				requeryOnLoad = self._requeryOnLoad
+				self._requeryOnLoad = False
+				try:
+					cursor = self.createCursor(key=val)
+				finally:
+					self._requeryOnLoad = requeryOnLoad
+			# The parent values can be of another type than the link field.
+			cursor._storeData(groups.get(aux._correctFieldType(val, linkField), []), typs)
+			# This will handle bounds issues
+			cursor.RowNumber = cursor.RowNumber
+			self._prefetchedKeys.add(val)
+
+
 	def cacheExpired(self):
 		"""This controls if a child requery is needed when a parent is requeried."""
+		key = self.__currentCursorKey
+		if key in self._prefetchedKeys:
+			# The records were just prefetched, so they count as fresh once.
+			self._prefetchedKeys.discard(key)
+			return False
 		if self._childCacheInterval:
 			last = self._CurrentCursor.lastRequeryTime
 			if last:
@@ -1973,8 +2414,10 @@ class dBizobj(dObject):
 		"""
 		if _allCursors:
 			cursors = self.__cursors.values()
+			self._prefetchedKeys.clear()
 		else:
 			cursors = [self._CurrentCursor]
+			self._prefetchedKeys.discard(self.__currentCursorKey)
 
 		for cursor in cursors:
 			cursor.clearLastRequeryTime()
@@ -2138,6 +2581,14 @@ class dBizobj(dObject):
 		"""
 		cc = self._CurrentCursor
 		if cc is not None:
+			if self._prefetchChildren and self._children:
+				requeryChildren = [vf for vf in self._virtualFields.values()
+						if isinstance(vf, dict) and vf.get("requery_children")]
+				if requeryChildren:
+					if rows is None:
+						self.prefetchChildren(xrange(rowStart, self.RowCount))
+					else:
+						self.prefetchChildren(xrange(rowStart, rowStart + rows))
 			return cc.getDataSet(
 				flds, rowStart, rows, returnInternals=returnInternals,
 				_rowChangeCallback=self._changeRowNumCallback)
@@ -2736,6 +3187,7 @@ afterDelete() which is only called after a delete().""")
 		oldKey = self.__currentCursorKey
 		if newKey <> oldKey:
 			self.__cursors[newKey] = self.__cursors.pop(oldKey)
+			self.__cursorTicks[newKey] = self.__cursorTicks.pop(oldKey, 0)
 			self.__currentCursorKey = newKey
 
 
@@ -2809,9 +3261,15 @@ afterDelete() which is only called after a delete().""")
 		""" Sees if there is a cursor in the cursors dict with a key that matches
 		the current parent key. If not, creates one.
 		"""
+		changed = (val != self.__currentCursorKey)
 		self.__currentCursorKey = val
 		if val not in self.__cursors:
+			self._cursorCacheMisses += 1
 			self.createCursor()
+			self._trimCursors()
+		elif changed:
+			self._cursorCacheHits += 1
+			self.__touchCursor(val)
 
 
 	def _getCurrentCursorKey(self):
@@ -2927,6 +3385,14 @@ afterDelete() which is only called after a delete().""")
 		self._syncWithCursors()
 
 
+	def _getCursorCacheHits(self):
+		return self._cursorCacheHits
+
+
+	def _getCursorCacheMisses(self):
+		return self._cursorCacheMisses
+
+
 	def _getLastSQL(self):
 		try:
 			v = self._CurrentCursor.LastSQL
@@ -2945,6 +3411,16 @@ afterDelete() which is only called after a delete().""")
 		self._linkField = u"%s" % val
 
 
+	def _getMaxCachedCursors(self):
+		return self._maxCachedCursors
+
+	def _setMaxCachedCursors(self, val):
+		self._maxCachedCursors = val or None
+		for child in self._children:
+			child.MaxCachedCursors = val
+		self._trimCursors()
+
+
 	def _getNewChildOnNew(self):
 		try:
 			return self._newChildOnNew
@@ -2975,6 +3451,20 @@ afterDelete() which is only called after a delete().""")
 		self._syncWithCursors()
 
 
+	def _getPageNumber(self):
+		return self._pageNumber
+
+
+	def _getPageSize(self):
+		return self._pageSize
+
+	def _setPageSize(self, val):
+		val = int(val or 0)
+		if val != self._pageSize:
+			self._pageSize = val
+			self._pageSignature = None
+
+
 	def _getParent(self):
 		try:
 			return self._parent
@@ -2998,6 +3488,13 @@ afterDelete() which is only called after a delete().""")
 		self._parentLinkField = u"%s" % val
 
 
+	def _getPrefetchChildren(self):
+		return self._prefetchChildren
+
+	def _setPrefetchChildren(self, val):
+		self._prefetchChildren = bool(val)
+
+
 	def _getRecord(self):
 		try:
 			ret = self._cursorRecord
@@ -3186,6 +3683,14 @@ afterDelete() which is only called after a delete().""")
 	_CurrentCursorKey = property(_getCurrentCursorKey, None, None,
 			_("The currently selected cursor key value. (read only)"))
 
+	CursorCacheHits = property(_getCursorCacheHits, None, None,
+			_("""Number of times that moving to another parent record found the cursor
+			for it already in memory. (read-only) (int)"""))
+
+	CursorCacheMisses = property(_getCursorCacheMisses, None, None,
+			_("""Number of times that a cursor had to be created for a parent record.
+			(read-only) (int)"""))
+
 	DataSource = property(_getDataSource, _setDataSource, None,
 			_("The title of the cursor. Used in resolving DataSource references. (str)"))
 
@@ -3256,6 +3761,14 @@ afterDelete() which is only called after a delete().""")
 	LinkField = property(_getLinkField, _setLinkField, None,
 			_("Name of the field that is the foreign key back to the parent. (str)"))
 
+	MaxCachedCursors = property(_getMaxCachedCursors, _setMaxCachedCursors, None,
+			_("""Maximum number of cursors, one for each parent record, that this bizobj
+			keeps in memory. When there are more, the least recently used ones are
+			dropped, except for the current cursor and cursors with unsaved changes,
+			including changes in the child cursors that belong to them. Setting it
+			also sets it for the child bizobjs. None, the default, keeps all of
+			them.  (int)"""))
+
 	NewChildOnNew = property(_getNewChildOnNew, _setNewChildOnNew, None,
 			_("Should new child records be added when a new parent record is added? (bool)"))
 
@@ -3265,6 +3778,16 @@ afterDelete() which is only called after a delete().""")
 	NonUpdateFields = property(_getNonUpdateFields, _setNonUpdateFields, None,
 			_("Fields in the cursor to be ignored during updates"))
 
+	PageNumber = property(_getPageNumber, None, None,
+			_("""Number of the page held in the data set, starting at 0, or None if
+			the data set wasn't requeried by page.  (int)"""))
+
+	PageSize = property(_getPageSize, _setPageSize, None,
+			_("""Number of rows in a page of the data set. When set, requery() loads
+			only the first page, and requeryPage(), nextPage() and priorPage()
+			load the others. Requires SQL built with the SQL Builder methods.
+			Default is 0, which loads all rows.  (int)"""))
+
 	Parent = property(_getParent, _setParent, None,
 			_("Reference to the parent bizobj to this one. (dBizobj)"))
 
@@ -3273,6 +3796,12 @@ afterDelete() which is only called after a delete().""")
 			records. If empty, it is assumed that the parent's PK is used  (str)
 			"""))
 
+	PrefetchChildren = property(_getPrefetchChildren, _setPrefetchChildren, None,
+			_("""When True, scans that requery the children, and getDataSet() calls
+			with virtual fields that requery the children, first load the child
+			records for all of the rows with prefetchChildren(). Default=False  (bool)
+			"""))
+
 	Record = property(_getRecord, None, None,
 			_("""Represents a record in the data set. You can address individual
 			columns by referring to 'self.Record.fieldName' (read-only) (no type)
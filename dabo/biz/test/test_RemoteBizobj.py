@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+import gc
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+import dabo
+import dabo.db
+import dabo.biz
+from dabo.biz.RemoteBizobj import RemoteBizobj, getDataVersion
+from dabo.lib.RemoteConnector import RemoteConnector
+from dabo.lib.dataCodec import encodeDataSet, decodeDataSet
+
+SQL = "select * from parent order by pk"
+
+
+class ParentBizobj(RemoteBizobj):
+	dbPath = None
+
+	def defineConnection(self):
+		self.setConnection(dabo.db.dConnection(DbType="SQLite", Database=self.dbPath))
+
+
+class PooledBizobj(RemoteBizobj):
+	def defineConnection(self):
+		self.setConnectionParams(dbType="SQLite", database=ParentBizobj.dbPath)
+
+
+class Test_RemoteBizobj(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		ParentBizobj.dbPath = os.path.join(self.tempDir, "remote.db")
+		ParentBizobj.cacheDir = self.tempDir
+		# An empty file is an empty SQLite database.
+		open(ParentBizobj.dbPath, "w").close()
+		self.con = dabo.db.dConnection(DbType="SQLite", Database=ParentBizobj.dbPath)
+		self.crs = self.con.getDaboCursor()
+		self.crs.execute("create table parent (pk INTEGER PRIMARY KEY, cField CHAR)")
+		for num in range(10):
+			self.crs.execute("insert into parent (cField) values (?)", ("Name %s" % num, ))
+
+	def tearDown(self):
+		if ParentBizobj.cacheStore is not None:
+			ParentBizobj.cacheStore.close()
+		ParentBizobj.cacheStore = ParentBizobj.cacheDir = None
+		dabo.db.closePools()
+		self.crs = None
+		self.con.close()
+		shutil.rmtree(self.tempDir)
+
+	def serverRequery(self, clientVersion=None):
+		"""Handle a requery the way the server's controller would."""
+		biz = ParentBizobj.load("abc", "parent", self.tempDir)
+		biz.KeyField = "pk"
+		ret = biz.requeryForClient(SQL, clientVersion=clientVersion)
+		biz.storeToCache("abc")
+		return ret
+
+	def getClient(self):
+		"""Return a client-side bizobj holding the full data set."""
+		biz = dabo.biz.dBizobj(dabo.db.dConnection(DbType="SQLite", Database=":memory:"))
+		biz.KeyField = "pk"
+		status, version, body = self.serverRequery()
+		RemoteConnector(biz)._storeEncodedDataSet(body)
+		return biz, version
+
+	def test_notModified(self):
+		status, version, body = self.serverRequery()
+		self.assertEqual(status, 200)
+		self.assertEqual(len(decodeDataSet(body)[0]), 10)
+		self.assertEqual(self.serverRequery('"%s"' % version), (304, version, ""))
+
+	def test_delta(self):
+		biz, version = self.getClient()
+		self.crs.execute("update parent set cField = 'Changed' where pk = 2")
+		self.crs.execute("delete from parent where pk = 5")
+		self.crs.execute("insert into parent (pk, cField) values (20, 'New')")
+		status, newVersion, body = self.serverRequery(version)
+		self.assertEqual(status, 200)
+		changed, typs, stru, extra = decodeDataSet(body)
+		self.assertEqual([rec["pk"] for rec in changed], [2, 20])
+		self.assertEqual(extra, {"deleted": [5]})
+
+		RemoteConnector(biz)._mergeDelta(changed, extra["deleted"])
+		self.assertEqual(getDataVersion(biz.getDataSet()), newVersion)
+		self.assertEqual(biz.RowCount, 10)
+		self.assertFalse(biz.isChanged())
+
+	def test_deltaOrder(self):
+		biz, version = self.getClient()
+		self.crs.execute("insert into parent (pk, cField) values (0, 'First')")
+		status, newVersion, body = self.serverRequery(version)
+		changed, typs, stru, extra = decodeDataSet(body)
+		self.assertEqual(extra["order"], range(11))
+		RemoteConnector(biz)._mergeDelta(changed, extra["deleted"], extra["order"])
+		self.assertEqual(getDataVersion(biz.getDataSet()), newVersion)
+
+	def test_versionAfterDecoding(self):
+		rows = [{"pk": 5L, "cField": u"Name", "nField": 2.5}, {"pk": 6L, "cField": "x", "nField": None}]
+		decoded = decodeDataSet(encodeDataSet(rows))[0]
+		self.assertEqual(type(decoded[0]["pk"]), int)
+		self.assertEqual(getDataVersion(decoded), getDataVersion(rows))
+		self.assertNotEqual(getDataVersion(decoded), getDataVersion(rows[::-1]))
+
+	def test_fullAfterManyChanges(self):
+		biz, version = self.getClient()
+		self.crs.execute("update parent set cField = 'Changed' where pk > 3")
+		status, newVersion, body = self.serverRequery(version)
+		data, typs, stru, extra = decodeDataSet(body)
+		self.assertEqual((len(data), extra), (10, {}))
+
+	def test_unknownVersion(self):
+		self.serverRequery()
+		status, version, body = self.serverRequery("some other version")
+		self.assertEqual(status, 200)
+		self.assertEqual(len(decodeDataSet(body)[0]), 10)
+
+	def test_cache(self):
+		self.serverRequery()
+		biz = ParentBizobj.load("abc", "parent", self.tempDir)
+		self.assertEqual(biz.KeyField, "pk")
+		self.assertEqual(biz.RowCount, 10)
+		self.assertEqual(biz.getDataTypes()["cField"], unicode)
+
+	def test_cursorsStoredSeparately(self):
+		biz = ParentBizobj.load("abc", "parent", self.tempDir)
+		biz.KeyField = "pk"
+		biz.requery()
+		biz._CurrentCursor = 42
+		biz._CurrentCursor._storeData([{"pk": 1, "cField": u"Child"}], {})
+		biz.storeToCache("abc")
+		store = ParentBizobj.cacheStore
+		self.assertEqual(store.Count, 2)
+
+		biz = ParentBizobj.load("abc", "parent", self.tempDir)
+		self.assertEqual(biz.RowCount, 10)
+		self.assertEqual(len(biz._cursorDictReference()), 1)
+		hits = store.Hits
+		biz._CurrentCursor = 42
+		self.assertEqual(biz.Record.cField, u"Child")
+		self.assertEqual(store.Hits, hits + 1)
+
+	def test_pooledConnectionReleased(self):
+		biz = PooledBizobj()
+		pool = biz._connection._pool
+		pool.Timeout = 1
+		biz.releaseConnection()
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (0, 1))
+		# The primary bizobj of a save releases its connection itself.
+		biz = PooledBizobj()
+		biz.applyDiffAndSave({}, primary=True)
+		self.assertEqual(pool.InUseCount, 0)
+		self.assertEqual(biz._connection, None)
+
+	def test_pooledConnectionCollected(self):
+		warnings = []
+		class Handler(logging.Handler):
+			def emit(self, record):
+				warnings.append(record)
+		handler = Handler(logging.WARNING)
+		dabo.log.addHandler(handler)
+		try:
+			biz = PooledBizobj()
+			pool = biz._connection._pool
+			# Bizobjs that are never released give their connection back when
+			# they are collected, so the pool doesn't run out.
+			del biz
+			gc.collect()
+		finally:
+			dabo.log.removeHandler(handler)
+		self.assertEqual(pool.InUseCount, 0)
+		self.assertEqual(len(warnings), 1)
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_RemoteBizobj)
+	unittest.TextTestRunner(verbosity=2).run(suite)
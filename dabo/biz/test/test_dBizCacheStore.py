@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import dabo
+from dabo.biz import dSQLiteBizCacheStore
+
+
+class Test_dSQLiteBizCacheStore(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.store = self.openStore()
+
+	def tearDown(self):
+		self.store.close()
+		shutil.rmtree(self.tempDir)
+
+	def openStore(self, **kwargs):
+		return dSQLiteBizCacheStore(os.path.join(self.tempDir, "bizcache.db"), **kwargs)
+
+	def test_getSet(self):
+		store = self.store
+		store.set("abc", None, "parent")
+		store.set("abc", 42, "child")
+		self.assertEqual(store.get("abc", None), "parent")
+		self.assertEqual(store.get("abc", 42), "child")
+		self.assertEqual(store.get("abc", 43), None)
+		self.assertEqual((store.Hits, store.Misses), (2, 1))
+		self.assertEqual((store.Count, store.Size), (2, 11))
+
+	def test_persistent(self):
+		self.store.set("abc", (1, "a"), "data")
+		other = self.openStore()
+		self.assertEqual(other.get("abc", (1, "a")), "data")
+		other.close()
+
+	def test_memory(self):
+		store = self.store
+		store.set("abc", None, "data")
+		reads = []
+		def read(*key):
+			reads.append(key)
+			return store.__class__._read(store, *key)
+		store._read = read
+		self.assertEqual(store.get("abc", None), "data")
+		self.assertEqual(reads, [])
+		# The backing store was changed, so the value in memory isn't used.
+		store._write("abc", repr(None), "changed", time.time() + 1)
+		self.assertEqual(store.get("abc", None), "changed")
+		self.assertEqual(len(reads), 1)
+
+	def test_sharedStore(self):
+		store = self.store
+		other = self.openStore()
+		store.set("abc", None, "data")
+		self.assertEqual(other.get("abc", None), "data")
+		store.set("abc", None, "changed")
+		self.assertEqual(other.get("abc", None), "changed")
+		store.delete("abc")
+		self.assertEqual(other.get("abc", None), None)
+		other.close()
+
+	def test_timeToLive(self):
+		store = self.store
+		store.set("abc", None, "old")
+		store._write("def", repr(None), "expired", time.time() - 10)
+		store.TimeToLive = 5
+		self.assertEqual(store.get("abc", None), "old")
+		self.assertEqual(store.get("def", None), None)
+		store.evict()
+		self.assertEqual((store.Count, store.Evictions), (1, 1))
+
+	def test_maxSize(self):
+		store = self.store
+		store.MaxSize = 25
+		for num in range(5):
+			store._write("abc", repr(num), "0123456789", time.time() + num)
+		store.evict()
+		self.assertEqual((store.Count, store.Size, store.Evictions), (2, 20, 3))
+		self.assertEqual(store.get("abc", 4), "0123456789")
+		self.assertEqual(store.get("abc", 0), None)
+
+	def test_automaticEviction(self):
+		store = self.openStore(MaxSize=100)
+		store.evictionCheckInterval = 10
+		for num in range(25):
+			store.set("abc", num, "0123456789")
+		self.assertTrue(store.Size <= 150)
+		self.assertTrue(store.Evictions >= 10)
+		store.close()
+
+	def test_delete(self):
+		store = self.store
+		store.set("abc", None, "parent")
+		store.set("abc", 42, "child")
+		store.set("def", None, "other")
+		store.delete("abc")
+		self.assertEqual(store.get("abc", 42), None)
+		self.assertEqual(store.Count, 1)
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_dSQLiteBizCacheStore)
+	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -246,6 +246,22 @@ insert into %s (cField, iField, nField) values (NULL, NULL, NULL)
 		self.assertEqual(biz.RowNumber, 0)
 
 
+	def testDeleteAllOverriddenDelete(self):
+		class SoftDeleteBizobj(dabo.biz.dBizobj):
+			def delete(self, startTransaction=True, inLoop=False):
+				self.Record.iField = -1
+				self.save(startTransaction=startTransaction)
+				self._CurrentCursor._removeRow(self.RowNumber)
+		biz = SoftDeleteBizobj(self.con, KeyField="pk", DataSource=self.temp_table_name)
+		biz.requery()
+		self.assertFalse(biz._canBatchDelete())
+		biz.deleteAll()
+		self.assertEqual(biz.RowCount, 0)
+		biz.requery()
+		self.assertEqual([rec["iField"] for rec in biz.getDataSet()], [-1, -1, -1])
+		self.biz.onDeleteLastRecord = lambda: None
+		self.assertFalse(self.biz._canBatchDelete())
+
 	def testDeleteChildThenDeleteParent(self):
 		"""See ticket #1312"""
 		bizMain = self.biz
@@ -588,6 +604,70 @@ insert into %s (cField, iField, nField) values (NULL, NULL, NULL)
 		self.assertEqual(bizChild.isAnyChanged(), True)
 
 
+	def testPaging(self):
+		biz = self.biz
+		def pks():
+			return [rec["pk"] for rec in biz.getDataSet(flds=("pk",))]
+		biz.PageSize = 2
+		biz.requery()
+		self.assertEqual(biz.PageNumber, 0)
+		self.assertEqual(pks(), [1, 2])
+		biz.Record.cField = "Changed"
+		self.assertTrue(biz.nextPage())
+		self.assertEqual(biz.PageNumber, 1)
+		self.assertEqual(biz.RowNumber, 0)
+		# The changed record is carried over after the rows of the page.
+		self.assertEqual(pks(), [3, 1])
+		self.assertEqual(biz.getFieldVal("cField", 1), "Changed")
+		self.assertTrue(biz.isAnyChanged())
+		self.assertFalse(biz.nextPage())
+		self.assertTrue(biz.priorPage())
+		self.assertEqual(biz.PageNumber, 0)
+		self.assertEqual(biz.RowNumber, 1)
+		self.assertEqual(pks(), [1, 2])
+		self.assertEqual(biz.getFieldVal("cField", 0), "Changed")
+		self.assertFalse(biz.priorPage())
+		biz.saveAll()
+		biz.requery()
+		self.assertEqual(biz.Record.cField, "Changed")
+		self.assertFalse(biz.isAnyChanged())
+		# Pages follow the sort order; pages not visited yet are reached by offset.
+		biz.sort("iField", "DESC")
+		biz.requeryPage(1)
+		self.assertEqual(pks(), [1])
+		biz.requery()
+		self.assertEqual(pks(), [3, 2])
+		biz.nextPage()
+		self.assertEqual(pks(), [1])
+		biz.PageSize = 0
+		biz.requery()
+		self.assertEqual(biz.RowCount, 3)
+		self.assertEqual(biz.PageNumber, None)
+
+	def testPagingNullsAndAliases(self):
+		biz = self.biz
+		self.createNullRecord()
+		self.createNullRecord()
+		def allPages():
+			biz.requery()
+			ret = [rec["pk"] for rec in biz.getDataSet(flds=("pk",))]
+			while biz.nextPage():
+				ret += [rec["pk"] for rec in biz.getDataSet(flds=("pk",))]
+			return ret
+		biz.PageSize = 2
+		# SQLite sorts NULLs first.
+		biz.sort("iField", "ASC")
+		self.assertEqual(allPages(), [4, 5, 1, 2, 3])
+		biz.sort("iField", "DESC")
+		self.assertEqual(allPages(), [3, 2, 1, 5, 4])
+		# The sort column is an alias for an expression.
+		biz.setFieldClause("pk, cField, iField, iField * 2 as doubled")
+		biz.requery()
+		biz.sort("doubled", "DESC")
+		self.assertEqual(allPages(), [3, 2, 1, 5, 4])
+		self.assertEqual(biz._CurrentCursor._getFieldExpression("doubled"), "iField * 2")
+		self.assertEqual(biz._CurrentCursor._getFieldExpression("iField"), None)
+
 	def testNullRecord(self):
 		biz = self.biz
 		self.createNullRecord()
@@ -690,6 +770,135 @@ insert into %s (cField, iField, nField) values (NULL, NULL, NULL)
 		"""Do the same test as for save, but with cancelAll()."""
 		self.testChangesToTwoChildRecords("cancel")
 
+	def testPrefetchChildren(self):
+		"""A scan with PrefetchChildren loads each child with a single query."""
+		bizMain = self.biz
+		bizChild = dabo.biz.dBizobj(self.con)
+		bizChild.KeyField = "pk"
+		bizChild.DataSource = self.temp_child_table_name
+		bizChild.LinkField = "parent_fk"
+		bizMain.addChild(bizChild)
+		bizMain.requery()
+		bizMain.PrefetchChildren = True
+		queries = []
+		# Each cursor has its own class, so count the queries in the mixin.
+		cursorClass = dabo.db.dCursorMixin
+		origExecute = cursorClass.execute
+		def execute(crs, sql, *args, **kwargs):
+			queries.append(sql)
+			return origExecute(crs, sql, *args, **kwargs)
+		cursorClass.execute = execute
+		try:
+			counts = []
+			bizMain.scan(lambda: counts.append((bizMain.Record.pk,
+					[rec["cInvNum"] for rec in bizChild.getDataSet()])))
+		finally:
+			cursorClass.execute = origExecute
+		self.assertEqual(counts, [(1, ["IN00023", "IN00455"]), (2, []), (3, ["IN00024"])])
+		self.assertEqual(len(queries), 1)
+		# Once used, the prefetched records are requeried as usual.
+		bizMain.RowNumber = 2
+		bizMain.RowNumber = 0
+		self.assertEqual(bizChild.RowCount, 2)
+
+	def testPrefetchChildrenLinkTypes(self):
+		"""Prefetched records are matched to parent values of another type."""
+		bizMain = self.biz
+		for pk in (1, 2, 3):
+			bizMain._CurrentCursor.execute("update %s set cField = '%s' where pk = %s"
+					% (self.temp_table_name, pk, pk))
+		bizChild = dabo.biz.dBizobj(self.con)
+		bizChild.KeyField = "pk"
+		bizChild.DataSource = self.temp_child_table_name
+		bizChild.LinkField = "parent_fk"
+		bizChild.ParentLinkField = "cField"
+		bizMain.addChild(bizChild)
+		bizMain.requery()
+		bizMain.prefetchChildren()
+		bizMain.RowNumber = 2
+		self.assertEqual(bizChild.RowCount, 1)
+		self.assertEqual(bizChild.Record.cInvNum, "IN00024")
+
+	def testPrefetchChildrenWithoutLinkField(self):
+		"""Children that don't select their LinkField are requeried per parent."""
+		bizMain = self.biz
+		bizChild = dabo.biz.dBizobj(self.con)
+		bizChild.KeyField = "pk"
+		bizChild.DataSource = self.temp_child_table_name
+		bizChild.LinkField = "parent_fk"
+		bizChild.setFieldClause("pk, cInvNum")
+		bizMain.addChild(bizChild)
+		bizMain.requery()
+		bizMain.prefetchChildren()
+		counts = []
+		bizMain.scan(lambda: counts.append((bizMain.Record.pk,
+				[rec["cInvNum"] for rec in bizChild.getDataSet()])))
+		self.assertEqual(counts, [(1, ["IN00023", "IN00455"]), (2, []), (3, ["IN00024"])])
+
+	def testMaxCachedCursors(self):
+		"""Child cursors are dropped least recently used first, unless changed."""
+		bizMain = self.biz
+		bizChild = dabo.biz.dBizobj(self.con)
+		bizChild.KeyField = "pk"
+		bizChild.DataSource = self.temp_child_table_name
+		bizChild.LinkField = "parent_fk"
+		bizMain.addChild(bizChild)
+		bizMain.requery()
+		bizMain.MaxCachedCursors = 3
+		self.assertEqual(bizChild.MaxCachedCursors, 3)
+		for row in (1, 2, 1):
+			bizMain.RowNumber = row
+		cursors = bizChild._cursorDictReference()
+		self.assertEqual(sorted(cursors), [1, 2, 3])
+		self.assertEqual(bizChild.CursorCacheHits, 1)
+		self.assertEqual(bizChild.CursorCacheMisses, 3)
+		# Neither the current nor a changed cursor is dropped.
+		bizMain.RowNumber = 2
+		bizChild.Record.cInvNum = "changed"
+		bizMain.MaxCachedCursors = 1
+		self.assertEqual(sorted(cursors), [3])
+		bizMain.RowNumber = 0
+		self.assertEqual(sorted(cursors), [1, 3])
+		self.assertEqual(bizChild.RowCount, 2)
+		bizMain.RowNumber = 2
+		self.assertEqual(bizChild.Record.cInvNum, "changed")
+		self.assertEqual(bizChild.CursorCacheHits, 3)
+
+	def testSaveAllBatched(self):
+		biz = self.biz
+		crs = biz._CurrentCursor
+		calls = []
+		def save(*args, **kwargs):
+			calls.append(kwargs.get("allRows", False))
+			return crs.__class__.save(crs, *args, **kwargs)
+		crs.save = save
+		biz.Record.cField = "pkm"
+		for num in range(3):
+			biz.new()
+			biz.Record.cField = "New %s" % num
+		biz.saveAll()
+		self.assertEqual(calls, [True])
+		self.assertFalse(biz.isAnyChanged())
+		biz.requery()
+		self.assertEqual([biz.getFieldVal("cField", row) for row in range(biz.RowCount)],
+				["pkm", "Edward Leafe", "Carl Karsten", "New 0", "New 1", "New 2"])
+
+	def testSaveAllRowHooks(self):
+		validated = []
+		class ValidatingBizobj(dabo.biz.dBizobj):
+			def validateRecord(self):
+				validated.append(self.Record.cField)
+		biz = ValidatingBizobj(self.con, KeyField="pk", DataSource=self.temp_table_name)
+		biz.requery()
+		biz.Record.cField = "pkm"
+		biz.RowNumber = 2
+		biz.Record.cField = "ck"
+		biz.saveAll()
+		self.assertEqual(sorted(validated), ["ck", "pkm"])
+		# Hooks set on the instance count as well.
+		self.biz.afterSave = lambda: None
+		self.assertFalse(self.biz._canBatchSave())
+
 if __name__ == "__main__":
 	suite = unittest.TestLoader().loadTestsFromTestCase(Test_dBizobj)
 	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -331,9 +331,89 @@ class Test_Many_To_Many(unittest.TestCase):
 		pbiz.addMMBizobj(rbiz, "rest_alloc", "person_id", "restricted_id")
 		self.assertRaises(dException.DBQueryException, pbiz.mmAssociateValue,
 				rbiz, "regular", "test")
+		self.assertRaises(dException.DBQueryException, pbiz.mmAssociateValues,
+				rbiz, "regular", ["test", "more"])
 		pbiz.removeMMBizobj(rbiz)
 
 
+	def test_full_associate_keeps_existing(self):
+		"""mmSetFullAssociation() only adds and removes the differences."""
+		pbiz = self.person_biz
+		fbiz = self.fan_club_biz
+		pbiz.seek("Leafe", "last_name")
+		leafe_pk = pbiz.getPK()
+		pbiz.mmAssociateValues(fbiz, "performer", ["Ramones", "Green Day", "Ramones"])
+		self.assertEqual(self.reccount("membership"), 2)
+		self.crs.execute("select max(pkid) as pkid from membership")
+		kept = self.crs.Record.pkid
+		pbiz.mmSetFullAssociation(fbiz, "performer", ["The Clash", "Wire", "Green Day"])
+		self.crs.execute("""select performer, membership.pkid as pkid from membership
+				join fan_club on fan_club.pkid = fan_club_id where person_id = %s
+				order by performer""" % leafe_pk)
+		recs = self.crs.getDataSet()
+		self.assertEqual([rec["performer"] for rec in recs], ["Green Day", "The Clash", "Wire"])
+		self.assertTrue(kept in [rec["pkid"] for rec in recs])
+		self.assertEqual(self.reccount("fan_club", "performer = 'Wire'"), 1)
+
+
+	def test_dissociate_values(self):
+		"""mmDissociateValues() doesn't add unknown values to the other table."""
+		pbiz = self.person_biz
+		fbiz = self.fan_club_biz
+		pbiz.seek("Leafe", "last_name")
+		club_count = self.reccount("fan_club")
+		pbiz.mmAssociateValues(fbiz, "performer", ["Ramones", "Green Day"])
+		pbiz.mmDissociateValues(fbiz, "performer", ["Ramones", "Nobody"])
+		self.assertEqual(self.reccount("membership"), 1)
+		self.assertEqual(self.reccount("fan_club"), club_count)
+		pbiz.mmDissociateValue(fbiz, "performer", "Green Day")
+		self.assertEqual(self.reccount("membership"), 0)
+
+
+	def test_statement_count(self):
+		"""Associating many values doesn't cost statements per value."""
+		pbiz = self.person_biz
+		fbiz = self.fan_club_biz
+		pbiz.seek("Leafe", "last_name")
+		values = ["Band %s" % num for num in range(200)]
+		calls = []
+		execute = dabo.db.dCursorMixin.execute
+		executemany = dabo.db.dCursorMixin.executemany
+		def countExecute(crs, sql, *args, **kwargs):
+			calls.append(sql)
+			return execute(crs, sql, *args, **kwargs)
+		def countExecutemany(crs, sql, *args, **kwargs):
+			calls.append(sql)
+			return executemany(crs, sql, *args, **kwargs)
+		dabo.db.dCursorMixin.execute = countExecute
+		dabo.db.dCursorMixin.executemany = countExecutemany
+		try:
+			pbiz.mmSetFullAssociation(fbiz, "performer", values)
+		finally:
+			dabo.db.dCursorMixin.execute = execute
+			dabo.db.dCursorMixin.executemany = executemany
+		self.assertEqual(self.reccount("membership"), 200)
+		self.assertTrue(len(calls) < 10, calls)
+
+
+	def test_database_matching(self):
+		"""Values are matched the way the database compares them."""
+		pbiz = self.person_biz
+		self.crs.execute("create table band (pkid INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT COLLATE NOCASE);")
+		self.crs.execute("create table band_fan (pkid INTEGER PRIMARY KEY AUTOINCREMENT, person_id INT, band_id INT);")
+		self.crs.execute("insert into band (name) values ('Green Day')")
+		bbiz = dabo.biz.dBizobj(self.conn)
+		bbiz.KeyField = "pkid"
+		bbiz.DataSource = "band"
+		pbiz.addMMBizobj(bbiz, "band_fan", "person_id", "band_id")
+		pbiz.seek("Leafe", "last_name")
+		pbiz.mmAssociateValues(bbiz, "name", ["GREEN DAY", "Ramones"])
+		self.assertEqual(self.reccount("band"), 2)
+		self.assertEqual(self.reccount("band_fan"), 2)
+		pbiz.mmDissociateValues(bbiz, "name", ["green day"])
+		self.assertEqual(self.reccount("band_fan"), 1)
+
+
 
 if __name__ == "__main__":
 	suite = unittest.TestLoader().loadTestsFromTestCase(Test_Many_To_Many)
@@ -24,7 +24,7 @@ from dabo.dLocalize import _
 from dabo.lib import connParser
 from dabo.lib.SimpleCrypt import SimpleCrypt
 from dabo.dObject import dObject
-from dabo.dPref import dPref
+from dabo.dPref import dPref, flushPendingPrefs
 from dabo import dUserSettingProvider
 from dSecurityManager import dSecurityManager
 from dabo.lib.utils import ustr
@@ -410,6 +410,7 @@ try again when it is running.
 		"""
 		self.uiApp.exit()
 		self._persistMRU()
+		flushPendingPrefs()
 		self.uiApp.finish()
 		self.closeConnections()
 		self._tempFileHolder.release()
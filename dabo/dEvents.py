@@ -12,10 +12,18 @@ class dEvent(object):
 
 	User code can define custom events by simply subclassing Event and then
 	using self.bindEvent() and self.raiseEvent() in your objects.
+
+	Subclasses defined here declare empty __slots__ so that high-frequency
+	events don't carry an instance dict; subclasses that need to store extra
+	attributes can simply omit __slots__.
 	"""
+	__slots__ = ("_eventObject", "_uiEvent", "_args", "_kwargs", "_continue",
+			"_eventData", "_extraEventData", "_timestamp")
+
 	def __init__(self, eventObject, uiEvent=None, eventData=None, *args, **kwargs):
 		# Event objects get instantiated with every single event, so try
-		# to keep code to a minimum here.
+		# to keep code to a minimum here. In particular, EventData isn't
+		# built until something asks for it.
 		#super(dEvent, self).__init__(*args, **kwargs)
 
 		self._eventObject = eventObject
@@ -23,11 +31,9 @@ class dEvent(object):
 		self._args = args
 		self._kwargs = kwargs
 		self._continue = True
-		self._baseClass = dEvent
-
-		self._insertEventData()
-		if eventData:
-			self._eventData.update(eventData)
+		self._eventData = None
+		self._extraEventData = eventData
+		self._timestamp = time.time()
 
 		if dabo.eventLogging:
 			self._logEvent()
@@ -52,25 +58,35 @@ class dEvent(object):
 
 	def _insertEventData(self):
 		""" Place ui-specific stuff into the ui-agnostic EventData dictionary."""
-		eventData = {}
-		nativeEvent = self._uiEvent
-		kwargs = self._kwargs
-
-		eventData["timestamp"] = time.localtime()
+		eventData = {"timestamp": time.localtime(self._timestamp)}
 
 		# Add any keyword args passed:
-		for key in kwargs:
-			eventData[key] = kwargs[key]
+		eventData.update(self._kwargs)
 
 		# Add native event data:
+		nativeEvent = self._uiEvent
 		if nativeEvent is not None:
 			# Each UI lib should implement getEventData()
-			uiEventData = dabo.ui.getEventData(nativeEvent)
+			eventData.update(dabo.ui.getEventData(nativeEvent))
 
-			for key in uiEventData:
-				eventData[key] = uiEventData[key]
+		# Add the data passed explicitly to raiseEvent():
+		if self._extraEventData:
+			eventData.update(self._extraEventData)
 
 		self._eventData = eventData
+		return eventData
+
+
+	def _releaseUIEvent(self):
+		"""
+		Called when the handlers are done with the event. The native event is
+		only valid until then, so EventData is built from it now, in case a
+		handler kept the event to read it later, such as with callAfter().
+		"""
+		if self._uiEvent is not None:
+			if self._eventData is None:
+				self._insertEventData()
+			self._uiEvent = None
 
 
 	def _logEvent(self):
@@ -101,8 +117,11 @@ class dEvent(object):
 
 
 	def __getattr__(self, att):
+		if att in dEvent.__slots__:
+			# Not yet initialized; don't recurse into EventData.
+			raise AttributeError(att)
 		try:
-			return self._eventData[att]
+			return self._getEventData()[att]
 		except KeyError:
 			raise AttributeError("%s.%s object has no attribute %s." % (
 					self.__class__.__module__, self.__class__.__name__, att))
@@ -123,12 +142,19 @@ class dEvent(object):
 
 
 	def _getEventData(self):
-		return self._eventData
+		eventData = self._eventData
+		if eventData is None:
+			eventData = self._insertEventData()
+		return eventData
 
 	def _setEventData(self, dict):
 		self._eventData = dict
 
 
+	def _getTimestamp(self):
+		return self._timestamp
+
+
 	Continue = property(_getContinue, _setContinue, None,
 			_("""Specifies whether the event is allowed to continue
 			on to the next handler.  (bool)"""))
@@ -138,30 +164,39 @@ class dEvent(object):
 
 	EventData = property(_getEventData, _setEventData, None,
 			_("""Dictionary of data name/value pairs associated
-			with the event.  (dict)"""))
+			with the event. It is built from the native UI event the first
+			time it is read, or when the handlers are done with the event if
+			none of them read it.  (dict)"""))
+
+	Timestamp = property(_getTimestamp, None, None,
+			_("""Time the event was raised, in seconds since the epoch.  (float)"""))
 
 # Eventually deprecate Event
 Event=dEvent
 
 class DataEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.biz.dBizobj)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class EditorEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dEditor)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class GridEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dGrid)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class KeyEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		from dabo.dApp import dApp
 		return issubclass(objectClass, (dabo.ui.dPemMixin, dApp))
@@ -169,12 +204,14 @@ class KeyEvent(dEvent):
 
 
 class ListControlEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dListControl, ))
 	appliesToClass = classmethod(appliesToClass)
 
 
 class MenuEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dMenu, dabo.ui.dMenuItem,
 				dabo.ui.dMenuBar))
@@ -182,42 +219,49 @@ class MenuEvent(dEvent):
 
 
 class MouseEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class ControlNavigationEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dPage, dabo.ui.dForm))
 	appliesToClass = classmethod(appliesToClass)
 
 
 class SashEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dSplitter)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class CalendarEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dCalendar)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class TreeEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dTreeView)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class SpinnerEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dSpinner)
 	appliesToClass = classmethod(appliesToClass)
 
 
 class ReportEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		try:
 			return issubclass(objectClass, dabo.dReportWriter.dReportWriter)
@@ -228,12 +272,14 @@ class ReportEvent(dEvent):
 
 
 class ScrollEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dScrollPanel, dabo.ui.dGrid))
 	appliesToClass = classmethod(appliesToClass)
 
 
 class MediaEvent(dEvent):
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dMediaControl)
 	appliesToClass = classmethod(appliesToClass)
@@ -241,6 +287,7 @@ class MediaEvent(dEvent):
 
 class Activate(dEvent):
 	"""Occurs when the form or application becomes active."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		from dabo.dApp import dApp
 		return issubclass(objectClass, (dApp, dabo.ui.dForm,
@@ -250,6 +297,7 @@ class Activate(dEvent):
 
 class Close(dEvent):
 	"""Occurs when the user closes the form."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dForm, dabo.ui.dFormMain,
 				dabo.ui.dDialog))
@@ -258,6 +306,7 @@ class Close(dEvent):
 
 class Create(dEvent):
 	"""Occurs after the control or form is created."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -265,6 +314,7 @@ class Create(dEvent):
 
 class ChildBorn(dEvent):
 	"""Occurs when a child control is created."""
+	__slots__ = ("Child",)
 	def __init__(self, *args, **kwargs):
 		try:
 			self.Child = kwargs["child"]
@@ -282,11 +332,12 @@ class ContextMenu(dEvent):
 	"""Occurs when the user requests a context menu (right-click on Win,
 	control-click on Mac, etc.
 	"""
-	pass
+	__slots__ = ()
 
 
 class Deactivate(dEvent):
 	"""Occurs when another form becomes active."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		from dabo.dApp import dApp
 		return issubclass(objectClass, (dApp, dabo.ui.dForm,
@@ -296,6 +347,7 @@ class Deactivate(dEvent):
 
 class Destroy(dEvent):
 	"""Occurs when the control or form is destroyed."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -303,6 +355,7 @@ class Destroy(dEvent):
 
 class FontPropertiesChanged(dEvent):
 	"""Occurs when the properties of a dFont have changed."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -312,6 +365,7 @@ class Hit(dEvent):
 	"""Occurs with the control's default event (button click,
 	listbox pick, checkbox, etc.)
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dBitmapButton, dabo.ui.dButton,
 				dabo.ui.dCheckBox, dabo.ui.dComboBox, dabo.ui.dDropdownList,
@@ -328,6 +382,7 @@ class Idle(dEvent):
 	will only run when the application is otherwise not busy doing other (more
 	important) things.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -335,6 +390,7 @@ class Idle(dEvent):
 
 class GotFocus(dEvent):
 	"""Occurs when the control gets the focus."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -344,21 +400,22 @@ class KeyChar(KeyEvent):
 	"""Occurs when a key is depressed and released on the
 	focused control or form.
 	"""
-	pass
+	__slots__ = ()
 
 
 class KeyDown(KeyEvent):
 	"""Occurs when any key is depressed on the focused control or form."""
-	pass
+	__slots__ = ()
 
 
 class KeyUp(KeyEvent):
 	"""Occurs when any key is released on the focused control or form."""
-	pass
+	__slots__ = ()
 
 
 class LostFocus(dEvent):
 	"""Occurs when the control loses the focus."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -366,11 +423,12 @@ class LostFocus(dEvent):
 
 class MenuHighlight(MenuEvent):
 	"""Occurs when a menu item is highlighted."""
-	pass
+	__slots__ = ()
 
 
 class MenuOpen(MenuEvent):
 	"""Occurs when a menu is about to be opened."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -378,6 +436,7 @@ class MenuOpen(MenuEvent):
 
 class MenuClose(MenuEvent):
 	"""Occurs when a menu has just been closed."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -385,6 +444,7 @@ class MenuClose(MenuEvent):
 
 class Move(dEvent):
 	"""Occurs when the control's position changes."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -392,94 +452,95 @@ class Move(dEvent):
 
 class MouseEnter(MouseEvent):
 	"""Occurs when the mouse pointer enters the form or control."""
-	pass
+	__slots__ = ()
 
 
 class MouseLeave(MouseEvent):
 	"""Occurs when the mouse pointer leaves the form or control."""
-	pass
+	__slots__ = ()
 
 
 class MouseMove(MouseEvent):
 	"""Occurs when the mouse moves in the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseWheel(MouseEvent):
 	"""Occurs when the user scrolls the mouse wheel."""
-	pass
+	__slots__ = ()
 
 
 class MouseLeftDown(MouseEvent):
 	"""Occurs when the mouse's left button is depressed on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseLeftUp(MouseEvent):
 	"""Occurs when the mouse's left button is released on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseLeftClick(MouseEvent):
 	"""Occurs when the mouse's left button is depressed
 	and released on the control.
 	"""
-	pass
+	__slots__ = ()
 
 
 class MouseLeftDoubleClick(MouseEvent):
 	"""Occurs when the mouse's left button is double-clicked on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseRightDown(MouseEvent):
 	"""Occurs when the mouse's right button is depressed on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseRightUp(MouseEvent):
 	"""Occurs when the mouse's right button is released on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseRightClick(MouseEvent):
 	"""Occurs when the mouse mouse's right button is depressed
 	and released on the control.
 	"""
-	pass
+	__slots__ = ()
 
 
 class MouseRightDoubleClick(MouseEvent):
 	"""Occurs when the mouse's right button is double-clicked on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseMiddleDown(MouseEvent):
 	"""Occurs when the mouse's middle button is depressed on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseMiddleUp(MouseEvent):
 	"""Occurs when the mouse's middle button is released on the control."""
-	pass
+	__slots__ = ()
 
 
 class MouseMiddleClick(MouseEvent):
 	"""Occurs when the mouse mouse's middle button is depressed
 	and released on the control.
 	"""
-	pass
+	__slots__ = ()
 
 
 class MouseMiddleDoubleClick(MouseEvent):
 	"""Occurs when the mouse's middle button is double-clicked
 	on the control.
 	"""
-	pass
+	__slots__ = ()
 
 
 class Paint(dEvent):
 	"""Occurs when it is time to paint the control."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -487,6 +548,7 @@ class Paint(dEvent):
 
 class BackgroundErased(dEvent):
 	"""Occurs when a window background has been erased and needs repainting."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -494,6 +556,7 @@ class BackgroundErased(dEvent):
 
 class PageChanged(dEvent):
 	"""Occurs when a page in a pageframe-like control changes"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		try:
 			return issubclass(objectClass, (dabo.ui.dPageFrame, dabo.ui.dPageList,
@@ -506,6 +569,7 @@ class PageChanged(dEvent):
 
 class PageChanging(dEvent):
 	"""Occurs when the current page in a pageframe-like control is about to change"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		try:
 			return issubclass(objectClass, (dabo.ui.dPageFrame, dabo.ui.dPageList,
@@ -518,6 +582,7 @@ class PageChanging(dEvent):
 
 class PageClosed(dEvent):
 	"""Occurs when a page in a dPageStyled control is closed"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPageStyled)
 	appliesToClass = classmethod(appliesToClass)
@@ -525,6 +590,7 @@ class PageClosed(dEvent):
 
 class PageClosing(dEvent):
 	"""Occurs when a page in a dPageStyled control is about to close"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPageStyled)
 	appliesToClass = classmethod(appliesToClass)
@@ -532,6 +598,7 @@ class PageClosing(dEvent):
 
 class PageContextMenu(dEvent):
 	"""Occurs when the user requests a context event for a dPage"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPage)
 	appliesToClass = classmethod(appliesToClass)
@@ -539,6 +606,7 @@ class PageContextMenu(dEvent):
 
 class PageEnter(dEvent):
 	"""Occurs when the page becomes the active page."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPage)
 	appliesToClass = classmethod(appliesToClass)
@@ -546,6 +614,7 @@ class PageEnter(dEvent):
 
 class PageLeave(dEvent):
 	"""Occurs when a different page becomes active."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPage)
 	appliesToClass = classmethod(appliesToClass)
@@ -553,6 +622,7 @@ class PageLeave(dEvent):
 
 class Resize(dEvent):
 	"""Occurs when the control or form is resized."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -560,6 +630,7 @@ class Resize(dEvent):
 
 class SearchButtonClicked(dEvent):
 	"""Occurs when the user clicks the search button in a dSearchBox."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dSearchBox,))
 	appliesToClass = classmethod(appliesToClass)
@@ -567,6 +638,7 @@ class SearchButtonClicked(dEvent):
 
 class SearchCancelButtonClicked(dEvent):
 	"""Occurs when the user clicks the cancel button in a dSearchBox."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dSearchBox,))
 	appliesToClass = classmethod(appliesToClass)
@@ -574,6 +646,7 @@ class SearchCancelButtonClicked(dEvent):
 
 class SlidePanelChange(dEvent):
 	"""Occurs when a panel in a dSlidePanelControl control is hidden or shown."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dSlidePanelControl, dabo.ui.dSlidePanel))
 	appliesToClass = classmethod(appliesToClass)
@@ -581,6 +654,7 @@ class SlidePanelChange(dEvent):
 
 class SlidePanelCaptionClick(dEvent):
 	"""Occurs when the caption bar of a dSlidePanel is clicked."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, (dabo.ui.dFoldPanelBar, dabo.ui.dSlidePanel))
 	appliesToClass = classmethod(appliesToClass)
@@ -588,7 +662,7 @@ class SlidePanelCaptionClick(dEvent):
 
 class RowNumChanged(DataEvent):
 	"""Occurs when the RowNumber of the PrimaryBizobj of the dForm has changed."""
-	pass
+	__slots__ = ()
 
 class RowNavigation(DataEvent):
 	"""Occurs when the PrimaryBizobj of the dForm is being navigated.
@@ -601,216 +675,216 @@ class RowNavigation(DataEvent):
 	See also RowNumChanged, which only occurs after the user has settled on a
 	record and has stopped navigating.
 	"""
-	pass
+	__slots__ = ()
 
 class SashDoubleClick(SashEvent):
 	"""Occurs when a user double-clicks on the sash of a splitter window."""
-	pass
+	__slots__ = ()
 
 
 class SashPositionChanged(SashEvent):
 	"""Occurs when a user moves the sash of a splitter window."""
-	pass
+	__slots__ = ()
 
 
 class CalendarDateChanged(CalendarEvent):
 	"""Occurs when the date on a calendar is changed."""
-	pass
+	__slots__ = ()
 
 
 class CalendarDayChanged(CalendarEvent):
 	"""Occurs when the day of the month on a calendar is changed."""
-	pass
+	__slots__ = ()
 
 
 class CalendarMonthChanged(CalendarEvent):
 	"""Occurs when the month on a calendar is changed."""
-	pass
+	__slots__ = ()
 
 
 class CalendarYearChanged(CalendarEvent):
 	"""Occurs when the year on a calendar is changed."""
-	pass
+	__slots__ = ()
 
 
 class CalendarDayHeaderClicked(CalendarEvent):
 	"""Occurs when the day of week header is clicked."""
-	pass
+	__slots__ = ()
 
 
 class ListSelection(ListControlEvent):
 	""" Occurs when an item is highlighted in a list control."""
-	pass
+	__slots__ = ()
 
 
 class ListDeselection(ListControlEvent):
 	""" Occurs when a selected item is deselected in a list control."""
-	pass
+	__slots__ = ()
 
 
 class TreeSelection(TreeEvent):
 	""" Occurs when the selected item in a tree control changes."""
-	pass
+	__slots__ = ()
 
 
 class TreeItemCollapse(TreeEvent):
 	""" Occurs when an expanded item in a tree collapses."""
-	pass
+	__slots__ = ()
 
 
 class TreeItemExpand(TreeEvent):
 	""" Occurs when a collapsed item in a tree expands."""
-	pass
+	__slots__ = ()
 
 
 class TreeItemContextMenu(TreeEvent):
 	""" Occurs when a tree item receives a context menu event."""
-	pass
+	__slots__ = ()
 
 
 class TreeBeginDrag(MouseEvent):
 	""" Occurs when a drag operation begins in a tree."""
-	pass
+	__slots__ = ()
 
 
 class TreeEndDrag(MouseEvent):
 	""" Occurs when a drag operation ends in a tree."""
-	pass
+	__slots__ = ()
 
 
 class GridContextMenu(GridEvent, MenuEvent):
 	"""Occurs when the context menu is requested in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderContextMenu(GridEvent, MenuEvent):
 	"""Occurs when the context menu is requested in the grid header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderIdle(GridEvent):
 	"""Occurs when an idle cycle happens in the grid header."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseEnter(GridEvent, MouseEvent):
 	"""Occurs when the mouse pointer enters the grid's header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseLeave(GridEvent, MouseEvent):
 	"""Occurs when the mouse pointer leaves the grid's header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseLeftClick(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button is clicked in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseLeftDoubleClick(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button is double-clicked in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseLeftDown(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes down in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseLeftUp(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes up in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseRightClick(GridEvent, MouseEvent):
 	"""Occurs when the right mouse button is clicked in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseRightDown(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes down in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseRightUp(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes up in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridHeaderMouseMove(GridEvent, MouseEvent):
 	"""Occurs when the mouse moves in the grid header region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseLeftClick(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button is clicked in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseLeftDoubleClick(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button is double-clicked in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseLeftDown(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes down in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseLeftUp(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button goes up in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseRightClick(GridEvent, MouseEvent):
 	"""Occurs when the right mouse button is clicked in the header region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseRightDown(GridEvent, MouseEvent):
 	"""Occurs when the right mouse button goes down in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseRightUp(GridEvent, MouseEvent):
 	"""Occurs when the right mouse button goes up in the grid region."""
-	pass
+	__slots__ = ()
 
 
 class GridMouseMove(GridEvent, MouseEvent):
 	"""Occurs when the mouse moves in the grid region (not the headers)."""
-	pass
+	__slots__ = ()
 
 
 class GridRowSize(GridEvent):
 	"""Occurs when the grid's rows are resized."""
-	pass
+	__slots__ = ()
 
 
 class GridCellSelected(GridEvent):
 	"""Occurs when the a new cell is selected in the grid."""
-	pass
+	__slots__ = ()
 
 
 class GridRangeSelected(GridEvent):
 	"""Occurs when the a new cell is selected in the grid."""
-	pass
+	__slots__ = ()
 
 
 class GridCellEditBegin(GridEvent):
 	"""Occurs when the editor for a grid cell is shown, allowing the user to edit."""
-	pass
+	__slots__ = ()
 
 
 class GridCellEditEnd(GridEvent):
 	"""Occurs when the editor for a grid cell is hidden."""
-	pass
+	__slots__ = ()
 
 
 class GridCellEdited(GridEvent):
 	"""Occurs when the user edits the content of a grid cell."""
-	pass
+	__slots__ = ()
 
 
 class GridCellEditorHit(GridEvent):
@@ -819,37 +893,37 @@ class GridCellEditorHit(GridEvent):
 	For a checkbox, this occurs when the user toggles the checkmark.
 	This event is not implemented for other grid cell editors, yet.
 	"""
-	pass
+	__slots__ = ()
 
 
 class GridColSize(GridEvent):
 	"""Occurs when the grid's columns are resized."""
-	pass
+	__slots__ = ()
 
 
 class GridBeforeSort(GridEvent):
 	"""Occurs before the grid is sorted"""
-	pass
+	__slots__ = ()
 
 
 class GridAfterSort(GridEvent):
 	"""Occurs after the grid is sorted"""
-	pass
+	__slots__ = ()
 
 
 class ListHeaderMouseLeftClick(GridEvent, MouseEvent):
 	"""Occurs when the left mouse button is clicked in the header region of dListControl."""
-	pass
+	__slots__ = ()
 
 
 class ListHeaderMouseRightClick(GridEvent, MouseEvent):
 	"""Occurs when the right mouse button is clicked in the header region of dListControl."""
-	pass
+	__slots__ = ()
 
 
 class ListColumnResize(GridEvent, MouseEvent):
 	"""Occurs when the user manually resizes a column of dListControl."""
-	pass
+	__slots__ = ()
 
 
 class DocumentationHint(EditorEvent):
@@ -866,34 +940,36 @@ class DocumentationHint(EditorEvent):
 			the listener wants to format additional information about
 			the object.
 	"""
-	pass
+	__slots__ = ()
 
 
 class TitleChanged(EditorEvent):
 	"""Occurs when the editor's title changes."""
-	pass
+	__slots__ = ()
 
 
 class ContentChanged(EditorEvent):
 	"""Occurs when the contents of the Editor are modified."""
-	pass
+	__slots__ = ()
 
 
 class EditorStyleNeeded(EditorEvent):
 	"""Occurs when the underlying editor control requires restyling."""
-	pass
+	__slots__ = ()
 
 
 class ValueChanged(dEvent):
 	"""Occurs when the control's value has changed, whether
 	programmatically or interactively.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dDataControlMixin)
 	appliesToClass = classmethod(appliesToClass)
 
 class InteractiveChange(dEvent):
 	"""Occurs when the user interactively changes the control's value."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dDataControlMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -903,6 +979,7 @@ class Update(dEvent):
 	"""Occurs when a container wants its controls to update
 	their properties.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dPemMixin)
 	appliesToClass = classmethod(appliesToClass)
@@ -910,6 +987,7 @@ class Update(dEvent):
 
 class HtmlLinkClicked(dEvent):
 	"""Occurs when a link in a dHtmlBox control is clicked."""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dHtmlBox)
 	appliesToClass = classmethod(appliesToClass)
@@ -919,6 +997,7 @@ class SpinUp(SpinnerEvent):
 	"""Occurs when the spinner is incremented, either by clicking
 	the spinner 'up' button or by using the keyboard up arrow.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dSpinner)
 	appliesToClass = classmethod(appliesToClass)
@@ -928,6 +1007,7 @@ class SpinDown(SpinnerEvent):
 	"""Occurs when the spinner is decremented, either by clicking
 	the spinner 'down' button or by using the keyboard down arrow.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dSpinner)
 	appliesToClass = classmethod(appliesToClass)
@@ -937,6 +1017,7 @@ class Spinner(SpinnerEvent):
 	"""Occurs when the spinner is changed, either by clicking
 	one of the spinner buttons or by using the keyboard arrows.
 	"""
+	__slots__ = ()
 	def appliesToClass(eventClass, objectClass):
 		return issubclass(objectClass, dabo.ui.dSpinner)
 	appliesToClass = classmethod(appliesToClass)
@@ -944,93 +1025,93 @@ class Spinner(SpinnerEvent):
 
 class ReportCancel(ReportEvent):
 	"""Occurs when the user cancels the report."""
-	pass
+	__slots__ = ()
 
 class ReportBegin(ReportEvent):
 	"""Occurs at the beginning of the report."""
-	pass
+	__slots__ = ()
 
 
 class ReportEnd(ReportEvent):
 	"""Occurs at the end of the report."""
-	pass
+	__slots__ = ()
 
 
 class ReportIteration(ReportEvent):
 	"""Occurs when the RecordNumber changes at report runtime."""
-	pass
+	__slots__ = ()
 
 
 class ScrollTop(ScrollEvent):
 	"""Occurs when a scrollable window reaches the top or left."""
-	pass
+	__slots__ = ()
 
 
 class ScrollBottom(ScrollEvent):
 	"""Occurs when a scrollable window reaches the bottom or right."""
-	pass
+	__slots__ = ()
 
 
 class ScrollLineUp(ScrollEvent):
 	"""Occurs when a scrollable window is scrolled a line up or left."""
-	pass
+	__slots__ = ()
 
 
 class ScrollLineDown(ScrollEvent):
 	"""Occurs when a scrollable window is scrolled a line down or right."""
-	pass
+	__slots__ = ()
 
 
 class ScrollPageUp(ScrollEvent):
 	"""Occurs when a scrollable window is scrolled up or left by a full page."""
-	pass
+	__slots__ = ()
 
 
 class ScrollPageDown(ScrollEvent):
 	"""Occurs when a scrollable window is scrolled down or right by a full page."""
-	pass
+	__slots__ = ()
 
 
 class ScrollThumbDrag(ScrollEvent):
 	"""Occurs when the 'thumb' control of a scrollable window's scrollbars is moved."""
-	pass
+	__slots__ = ()
 
 
 class ScrollThumbRelease(ScrollEvent):
 	"""Occurs when the 'thumb' control of a scrollable window's scrollbars is released."""
-	pass
+	__slots__ = ()
 
 
 class MediaFinished(MediaEvent):
 	"""Occurs when the media has finished playing."""
-	pass
+	__slots__ = ()
 
 
 class MediaLoaded(MediaEvent):
 	"""Occurs when the media has been successfully loaded."""
-	pass
+	__slots__ = ()
 
 
 class MediaPause(MediaEvent):
 	"""Occurs when playback has been paused."""
-	pass
+	__slots__ = ()
 
 
 class MediaPlay(MediaEvent):
 	"""Occurs when playback has begun."""
-	pass
+	__slots__ = ()
 
 
 class MediaStop(MediaEvent):
 	"""Occurs when playback has been stopped."""
-	pass
+	__slots__ = ()
 
 
 class MediaStateChanged(MediaEvent):
 	"""Occurs when the playback status has changed from one state to another."""
-	pass
+	__slots__ = ()
 
 
 class ShellCommandRun(dEvent):
 	"""Occurs when the dShell interpreter executes a command."""
-	pass
+	__slots__ = ()
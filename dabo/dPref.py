@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import atexit
 import warnings
 import datetime
 from decimal import Decimal
@@ -8,6 +9,7 @@ from dabo.dLocalize import _
 import dabo.lib.utils as utils
 from dabo.lib.utils import ustr
 import dabo.db
+import dabo.dException as dException
 
 
 # We don't want to deal with these as preferences.
@@ -15,7 +17,69 @@ regularAtts = ("AutoPersist", "__base__", "__bases__", "__basicsize__", "__call_
 		"__cmp__", "_deletionCache", "__dictoffset__", "__flags__", "__itemsize__",
 		"__members__", "__methods__", "__mro__", "__name__", "__subclasses__",
 		"__weakrefoffset__", "_autoPersist", "_cache", "_cursor", "_cxn", "get",
-		"_getAttributeNames", "_key", "_noneType", "_parent", "_persistAll", "_typeDict", "mro")
+		"_getAttributeNames", "_key", "_noneType", "_parent", "_persistAll", "_prefetched",
+		"_typeDict", "_writeBuffer", "mro")
+
+# Milliseconds of idle time after a preference assignment before the buffered
+# writes are saved, when there is a UI event loop to do it.
+FLUSH_INTERVAL = 500
+
+# The write buffers that have unsaved preferences.
+_pendingBuffers = set()
+
+
+def flushPendingPrefs():
+	"""Save all buffered preference assignments to their databases."""
+	for buf in list(_pendingBuffers):
+		buf.flush()
+
+atexit.register(flushPendingPrefs)
+
+
+def _escapeLike(val):
+	"""Escape the LIKE wildcards in val, for a pattern with "escape '\\'"."""
+	return val.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+
+class _PrefWriteBuffer(object):
+	"""Collects the preference writes for one preference database, so that they
+	can be saved together in a single transaction. Repeated writes to the same
+	key only save the last value.
+	"""
+	def __init__(self, crs):
+		self._cursor = crs
+		self._pending = {}
+
+
+	def add(self, key, typ, val):
+		self._pending[key] = (typ, val)
+		_pendingBuffers.add(self)
+
+
+	def scheduleFlush(self):
+		"""Flush when the UI is idle, or right away if there is no UI."""
+		if not self._pending:
+			return
+		ui = getattr(dabo, "ui", None)
+		if ui and ui.getUIType():
+			ui.callAfterInterval(FLUSH_INTERVAL, self.flush)
+		else:
+			self.flush()
+
+
+	def flush(self, commit=True):
+		"""Write the pending values to the database."""
+		_pendingBuffers.discard(self)
+		pending, self._pending = self._pending, {}
+		if not pending:
+			return
+		crs = self._cursor
+		sql = "insert or replace into daboprefs (ckey, ctype, cvalue) values (?, ?, ?)"
+		for key, (typ, val) in pending.items():
+			crs.execute(sql, (key, typ, val))
+		if commit:
+			crs.commitTransaction()
 
 
 class dPref(object):
@@ -37,6 +101,11 @@ class dPref(object):
 	When that is False, you must call the persist() method manually, or your settings
 	will not be saved. Calling 'persist()' will write any values of that object and all of its
 	child objects to the database.
+
+	When a UI is running, automatic writes are buffered and saved in a single
+	transaction once the UI is idle. They are also saved before any preference
+	query, by persist(), and at application exit. Call prefetch() to read a
+	whole subtree of preferences with one query.
 	"""
 	def __init__(self, key=None, crs=None, cxn=None, appName="Dabo", prefDb=None):
 		if key is None:
@@ -50,6 +119,8 @@ class dPref(object):
 		# be changed by framework tools designed to access the
 		# the preference database.
 		self._persistAll = False
+		# Set when all of this key's subtree has been read by prefetch()
+		self._prefetched = False
 		super(dPref, self).__init__()
 		self._parent = None
 		self._noneType = type(None)
@@ -81,9 +152,37 @@ class dPref(object):
 			if not  "daboprefs" in self._cursor.getTables():
 				self._cursor.execute("create table daboprefs (ckey text not null, ctype text not null, cvalue text not null)")
 				self._cursor.commitTransaction()
+			self._createKeyIndex()
 		else:
 			self._cursor = crs
 			self._cxn = cxn
+		self._writeBuffer = _PrefWriteBuffer(self._cursor)
+
+
+	def _createKeyIndex(self):
+		"""Make sure that there is a unique index on ckey, which is needed for
+		fast lookups as well as for saving with 'insert or replace'.
+		"""
+		crs = self._cursor
+		sql = "create unique index if not exists daboprefs_ckey on daboprefs (ckey)"
+		try:
+			crs.execute(sql)
+		except dException.DBQueryException:
+			# Older preference databases can contain duplicate keys. Keep the
+			# most recent row for each key.
+			crs.execute("""delete from daboprefs where rowid not in
+					(select max(rowid) from daboprefs group by ckey)""")
+			crs.execute(sql)
+		crs.commitTransaction()
+
+
+	def _createChild(self, att):
+		"""Return a new dPref object for the sub key 'att'."""
+		ret = dPref(crs=self._cursor, cxn=self._cxn)
+		ret._parent = self
+		ret._key = att
+		ret._writeBuffer = self._writeBuffer
+		return ret
 
 
 	def __getattr__(self, att):
@@ -98,12 +197,14 @@ class dPref(object):
 			try:
 				ret = self._cache[att]
 			except KeyError:
-				# See if it's in the database
+				# See if it's in the database. This is done even below a
+				# prefetched key, as it may have been written since.
 				key = self._getKey()
 				if key:
 					param = "%s.%s" % (key, att)
 				else:
 					param = att
+				flushPendingPrefs()
 				crs = self._cursor
 				try:
 					crs.execute("select ctype, cvalue from daboprefs where ckey = ? ", (param, ))
@@ -114,9 +215,7 @@ class dPref(object):
 				if rec:
 					ret = self._decodeType(rec)
 				else:
-					ret = dPref(crs=self._cursor, cxn = self._cxn)
-					ret._parent = self
-					ret._key = att
+					ret = self._createChild(att)
 				self._cache[att] = ret
 		return ret
 
@@ -137,6 +236,7 @@ class dPref(object):
 			persist = (curr != val) and self.AutoPersist
 		if persist:
 			self._persist(att, val)
+			self._writeBuffer.scheduleFlush()
 		self._cache[att] = val
 
 
@@ -206,7 +306,7 @@ class dPref(object):
 
 
 	def _persist(self, att, val):
-		"""Writes the value of the particular att to the database with the proper key."""
+		"""Adds the value of the particular att to the write buffer with the proper key."""
 		# Make sure that we have a valid key
 		baseKey = self._getKey()
 		if not baseKey:
@@ -225,32 +325,66 @@ class dPref(object):
 			typ = "?"
 		# Convert it to a string that can be properly converted back
 		val = self._encodeType(val, typ)
-
-		sql = "update daboprefs set ctype = ?, cvalue = ? where ckey = ? "
-		prm = (typ, val, key)
-		crs.execute(sql, prm)
-		# Use the dbapi-level 'rowcount' attribute to get the number
-		# of affected rows.
-		if not crs.rowcount:
-			sql = "insert into daboprefs (ckey, ctype, cvalue) values (?, ?, ?)"
-			prm = (key, typ, val)
-			crs.execute(sql, prm)
-		self._cursor.commitTransaction()
+		self._writeBuffer.add(key, typ, val)
 
 
 	def persist(self):
 		"""Manually save preferences to the database."""
+		deletions = []
+		self._bufferTree(deletions)
+		self._writeBuffer.flush(commit=False)
+		# Handle the cached deletions
+		for key in deletions:
+			self._cursor.execute("delete from daboprefs where ckey like ? ", (key, ))
+		self._cursor.commitTransaction()
+
+
+	def _bufferTree(self, deletions):
+		"""Add the values of this object and all of its child objects to the
+		write buffer, and collect their cached deletions.
+		"""
 		for key, val in self._cache.items():
 			if isinstance(val, dPref):
-				# Child pref; tell it to persist itself
-				val.persist()
+				val._bufferTree(deletions)
 			else:
 				self._persist(key, val)
-		# Handle the cached deletions
-		for key in self._deletionCache:
-			self._cursor.execute("delete from daboprefs where ckey like ? ", (key, ))
+		deletions.extend(self._deletionCache)
 		self._deletionCache = {}
-		self._cursor.commitTransaction()
+
+
+	def prefetch(self):
+		"""Read all the preferences below this key with a single query, so that
+		reading them later doesn't require any more queries. Keys that weren't
+		found are still looked up once, since they may have been written since.
+		"""
+		flushPendingPrefs()
+		key = self._getKey()
+		if key:
+			param = "%s.%%" % _escapeLike(key)
+			keylen = len(key) + 1
+		else:
+			param = "%"
+			keylen = 0
+		crs = self._cursor
+		crs.execute("select ckey, ctype, cvalue from daboprefs where ckey like ? escape '\\' ",
+				(param, ))
+		self._prefetched = True
+		for rec in crs.getDataSet():
+			node = self
+			path = rec["ckey"][keylen:].split(".")
+			for part in path[:-1]:
+				child = node._cache.get(part)
+				if child is None:
+					child = node._cache[part] = node._createChild(part)
+				elif not isinstance(child, dPref):
+					# A value can't have sub keys.
+					node = None
+					break
+				child._prefetched = True
+				node = child
+			if node is not None and path[-1] not in node._cache:
+				# Don't replace values that haven't been saved yet.
+				node._cache[path[-1]] = self._decodeType(rec)
 
 
 	def deletePref(self, att, nested=False):
@@ -258,6 +392,7 @@ class dPref(object):
 		and the cache. If 'nested' is True, and the att is a node containing
 		sub-prefs, that node and all its children will be deleted.
 		"""
+		flushPendingPrefs()
 		basekey = self._getKey()
 		if basekey:
 			key = "%s.%s" % (basekey, att)
@@ -282,6 +417,7 @@ class dPref(object):
 
 	def deleteAllPrefs(self):
 		"""Deletes all preferences for this object, and all sub-prefs as well."""
+		flushPendingPrefs()
 		basekey = self._getKey()
 		if not basekey:
 			return
@@ -306,6 +442,7 @@ class dPref(object):
 		"""Removes any preferences at or below this object whose value
 		matches the passed value.
 		"""
+		flushPendingPrefs()
 		crs = self._cursor
 		sql = """delete from daboprefs
 				where ckey like ?
@@ -317,6 +454,7 @@ class dPref(object):
 
 	def flushCache(self):
 		"""Clear the cache, forcing fresh reads from the database."""
+		self._prefetched = False
 		for key, val in self._cache.items():
 			if isinstance(val, dPref):
 				val.flushCache()
@@ -329,6 +467,7 @@ class dPref(object):
 		"""Returns all the preferences set for this object. If returnNested is True,
 		returns any sub-preferences too.
 		"""
+		flushPendingPrefs()
 		crs = self._cursor
 		if key is None:
 			key = self._getKey()
@@ -355,6 +494,7 @@ class dPref(object):
 
 	def getPrefKeys(self, spec=None):
 		"""Return a list of all preference keys for this key."""
+		flushPendingPrefs()
 		crs = self._cursor
 		key = self._getKey()
 		if spec is not None:
@@ -381,6 +521,7 @@ class dPref(object):
 
 	def getSubPrefKeys(self, spec=None):
 		"""Return a list of all 'child' keys for this key."""
+		flushPendingPrefs()
 		crs = self._cursor
 		key = self._getKey()
 		if spec is not None:
@@ -410,8 +551,9 @@ class dPref(object):
 
 	def addKey(self, key, typ, val):
 		"""Adds a new key to the base key."""
+		flushPendingPrefs()
 		newTyp = self._typeDict[typ]
-		sql = "insert into daboprefs (ckey, ctype, cvalue) values (?, ?, ?)"
+		sql = "insert or replace into daboprefs (ckey, ctype, cvalue) values (?, ?, ?)"
 		prm = (key, newTyp, val)
 		self._cursor.execute(sql, prm)
 		self._cursor.commitTransaction()
@@ -424,6 +566,7 @@ class dPref(object):
 
 	def getPrefTree(self, spec=None):
 		"""Returns a tree-like series of nested preference keys."""
+		flushPendingPrefs()
 		crs = self._cursor
 		key = self._getKey()
 		if spec is not None:
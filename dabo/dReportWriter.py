@@ -47,7 +47,7 @@ class dReportWriter(dObject, ReportWriter):
 		win = self.ProgressControl
 		if win:
 			win.Caption = "Processing %s..." % self.ReportForm.getProp("Title")
-			win.updateProgress(0, len(self.Cursor))
+			win.updateProgress(0, self._getProgressRange())
 			win.show()
 			win.Form.fitToSizer()
 
@@ -55,9 +55,16 @@ class dReportWriter(dObject, ReportWriter):
 		if force or self.RecordNumber % 10 == 0:
 			win = self.ProgressControl
 			if win:
-				win.updateProgress(self.RecordNumber, len(self.Cursor))
+				win.updateProgress(self.RecordNumber, self._getProgressRange())
 				dabo.ui.yieldUI(_safe=True)
 
+	def _getProgressRange(self):
+		recCount = self.RecordCount
+		if recCount is None:
+			# Streaming cursor of unknown length: keep the gauge just short of full.
+			recCount = self.RecordNumber + 1
+		return recCount
+
 	def _hideProgress(self):
 		win = self.ProgressControl
 		if win:
@@ -30,11 +30,7 @@ class dUserSettingProvider(dObject):
 		Return the value of the user settings table that
 		corresponds to the preference key passed.
 		"""
-		prf = self.PreferenceManager
-		parsedItem = item.lower().split(".")
-		while len(parsedItem) > 1:
-			prf = prf.__getattr__(parsedItem.pop(0))
-		key = parsedItem[0]
+		prf, key = self._getPrefNode(item)
 		ret = prf.getValue(key)
 		if ret is None:
 			# No such pref key. Return the default
@@ -44,11 +40,7 @@ class dUserSettingProvider(dObject):
 
 	def setUserSetting(self, item, val):
 		"""Persist a value to the user settings file."""
-		prf = self.PreferenceManager
-		parsedItem = item.lower().split(".")
-		while len(parsedItem) > 1:
-			prf = prf.__getattr__(parsedItem.pop(0))
-		key = parsedItem[0]
+		prf, key = self._getPrefNode(item)
 		prf.setValue(key, val)
 
 
@@ -58,6 +50,23 @@ class dUserSettingProvider(dObject):
 			self.setUserSetting(nm, val)
 
 
+	def _getPrefNode(self, item):
+		"""
+		Return a tuple of the dPref object that holds the passed setting,
+		and the name of the setting within it.
+
+		All the user settings are read with a single query the first time,
+		instead of one query for each level of the dotted name.
+		"""
+		prf = self.PreferenceManager
+		if not prf._prefetched:
+			prf.prefetch()
+		parsedItem = item.lower().split(".")
+		while len(parsedItem) > 1:
+			prf = prf.__getattr__(parsedItem.pop(0))
+		return prf, parsedItem[0]
+
+
 	def deleteUserSetting(self, item):
 		"""Removes the specified item from the settings file."""
 		self.PreferenceManager.deletePref(item.lower(), False)
@@ -33,8 +33,9 @@ from decimal import Decimal
 from dConnection import dConnection
 from dCursorMixin import dCursorMixin
 from dConnectInfo import dConnectInfo
+from dConnectionPool import dConnectionPool, getPool, closePools
 from dTable import dTable
-from dDataSet import dDataSet
+from dDataSet import dDataSet, dRecordList
 import dabo
 from dabo.dException import FieldNotFoundException
 
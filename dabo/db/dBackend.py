@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 import sys
+import atexit
 import time
 import re
 import datetime
+import heapq
 import threading
+import weakref
 import decimal
 import dabo
 from dabo.dLocalize import _
@@ -12,9 +15,132 @@ from dabo.dObject import dObject
 from dabo.db import dTable
 from dNoEscQuoteStr import dNoEscQuoteStr
 from dabo.lib.utils import ustr
+from dabo.lib.lruCache import LRUCache
 from dCursorMixin import dCursorMixin
 
 
+
+class _KeepAliveScheduler(threading.Thread):
+	"""
+	Single daemon thread that sends the keep-alive query for every backend
+	with a KeepAliveInterval. Backends are held by weak references in a heap
+	ordered by the time their next check is due, so the thread sleeps until
+	exactly that moment instead of polling.
+	"""
+	def __init__(self):
+		threading.Thread.__init__(self, name="DaboKeepAlive")
+		self.setDaemon(True)
+		self._condition = threading.Condition()
+		# Heap of (due time, token, weakref to backend)
+		self._heap = []
+		self._tokens = {}
+		self._nextToken = 0
+		self._stopped = False
+
+
+	def schedule(self, backend, due):
+		"""Add or move the backend's next keep-alive check to 'due'."""
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._nextToken += 1
+			token = self._nextToken
+			ref = weakref.ref(backend, self._forget)
+			# Any older heap entry for this backend is now stale.
+			self._tokens[ref] = token
+			heapq.heappush(self._heap, (due, token, ref))
+			cond.notify()
+		finally:
+			cond.release()
+
+
+	def unschedule(self, backend):
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._tokens.pop(weakref.ref(backend), None)
+		finally:
+			cond.release()
+
+
+	def stop(self):
+		"""Make the thread exit, and give it a moment to do so."""
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._stopped = True
+			cond.notify()
+		finally:
+			cond.release()
+		self.join(1)
+
+
+	def _forget(self, ref):
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._tokens.pop(ref, None)
+		finally:
+			cond.release()
+
+
+	def run(self):
+		cond = self._condition
+		while True:
+			cond.acquire()
+			try:
+				backend = None
+				while backend is None:
+					if self._stopped:
+						return
+					heap = self._heap
+					while heap and self._tokens.get(heap[0][2]) != heap[0][1]:
+						# Unscheduled, rescheduled or garbage-collected
+						heapq.heappop(heap)
+					if not heap:
+						cond.wait()
+						continue
+					wait = heap[0][0] - time.time()
+					if wait > 0:
+						cond.wait(wait)
+						continue
+					due, token, ref = heapq.heappop(heap)
+					self._tokens.pop(ref, None)
+					backend = ref()
+			finally:
+				cond.release()
+			try:
+				backend._keepAlive()
+			except StandardError, e:
+				dabo.log.error(_("Keep-alive failed: %s") % ustr(e))
+			backend = None
+
+
+_keepAliveScheduler = None
+_keepAliveLock = threading.Lock()
+
+def _getKeepAliveScheduler():
+	global _keepAliveScheduler
+	_keepAliveLock.acquire()
+	try:
+		if _keepAliveScheduler is None:
+			_keepAliveScheduler = _KeepAliveScheduler()
+			_keepAliveScheduler.start()
+	finally:
+		_keepAliveLock.release()
+	return _keepAliveScheduler
+
+
+def _stopKeepAliveScheduler():
+	# A daemon thread still waiting when the interpreter shuts down can
+	# raise errors, as the modules it uses are torn down under it.
+	if _keepAliveScheduler is not None:
+		_keepAliveScheduler.stop()
+
+atexit.register(_stopKeepAliveScheduler)
+
+
+
 class dBackend(dObject):
 	"""Abstract class inherited by the specific Dabo database connectors."""
 	# Pattern for determining if a function is present in a string
@@ -24,6 +150,18 @@ class dBackend(dObject):
 	nameEnclosureChar = '"'
 	# The character used in sql to represent parameters to be substituted
 	paramPlaceholder = "%s"
+	# Can getLastInsertIDs() return the PKs generated by a multi-row insert?
+	batchInsertIDs = False
+	# Does the cursor's rowcount report the number of deleted records?
+	reliableRowCount = False
+	# Do NULLs come before all other values in ascending order?
+	nullsSortFirst = True
+	# Query used to keep idle connections alive, and to check pooled ones
+	keepAliveSQL = "select 1"
+	# Can a connection opened in one thread be used by another one?
+	poolAcrossThreads = True
+	# Number of processed SQL statements the cursors keep for reuse
+	statementCacheSize = 256
 
 	def __init__(self):
 		self._baseClass = dBackend
@@ -33,6 +171,19 @@ class dBackend(dObject):
 		# Reference to the cursor that is using this object
 		self._cursor = None
 		self.lastExecuteTime = time.time() # For keep alive interval
+		self._lastPingLatency = None
+		# (connectInfo, kwargs) of the last getConnection() call, for reconnect()
+		self._connectArgs = None
+		# Weak reference to the dConnection that opened the connection
+		self._connectionOwner = None
+		# Held by the cursors while they use the connection; see _beginUse()
+		self._useLock = threading.RLock()
+		# The Dabo cursors created on the connection
+		self._cursors = weakref.WeakSet()
+		# Set when a keep-alive check found the connection dead while cursors used it
+		self._connectionLost = False
+		# Processed statements, keyed by their original text; see dCursorMixin._prepareSQL()
+		self._statementCache = LRUCache(self.statementCacheSize)
 
 
 	def isValidModule(self):
@@ -171,6 +322,52 @@ class dBackend(dObject):
 			return None
 
 
+	def getLastInsertIDs(self, cursor, rowCount):
+		"""
+		Return a list of the PKs generated by the last insert statement, which
+		inserted 'rowCount' rows, in the order of the rows. This is only called
+		for backends whose batchInsertIDs attribute is True; for the others,
+		rows that need their generated PK are inserted one at a time.
+		"""
+		return None
+
+
+	def getInsertReturning(self, cursor):
+		"""
+		Return a clause to append to insert statements so that they return the
+		generated PK values, for backends that support it. The default is an
+		empty string.
+		"""
+		return ""
+
+
+	def getInsertBatchSize(self, columnCount):
+		"""
+		Return the maximum number of rows that one multi-row insert statement
+		('insert ... values (...), (...)') with the passed number of columns can
+		hold. The default of 1 is for backends that don't support them; inserts
+		are then batched with executemany() instead.
+		"""
+		return 1
+
+
+	def getDeleteBatchSize(self, keyCount):
+		"""
+		Return the maximum number of records that one delete statement can match
+		by PK, for a PK made up of 'keyCount' fields. Each record takes one
+		parameter per key field.
+		"""
+		return max(1, 500 // max(keyCount, 1))
+
+
+	def getInListBatchSize(self, paramCount=0):
+		"""
+		Return the maximum number of values in the IN list of a statement that
+		has 'paramCount' other parameters. Each value takes one parameter.
+		"""
+		return max(1, 500 - paramCount)
+
+
 	def getTables(self, cursor, includeSystemTables=False):
 		"""
 		Return a tuple of the tables in the current database.
@@ -365,6 +562,23 @@ class dBackend(dObject):
 		return "limit"
 
 
+	def getLimitPosition(self):
+		"""
+		Return the position of the limit clause in the SQL: 'top' if it comes
+		before the field clause, or 'bottom' (default) if it comes at the end.
+		"""
+		return "bottom"
+
+
+	def getOffsetLimitClause(self, limit, offset):
+		"""
+		Return the limit clause, without the limit word, for 'limit' rows that
+		follow the first 'offset' rows. Return None for backends that can't
+		skip rows.
+		"""
+		return "%s offset %s" % (limit, offset)
+
+
 	def formSQL(self, fieldClause, fromClause, joinClause,
 				whereClause, groupByClause, orderByClause, limitClause):
 		"""
@@ -616,43 +830,114 @@ class dBackend(dObject):
 		return clause
 	###########################################
 
-	def _applyKeepAlive(self):
-		"""Start a thread to keep the connection alive."""
-
-		class WorkerThread(threading.Thread):
-			def __init__(self, backendObj):
-				threading.Thread.__init__(self)
-				self._toStop = False
-				self.backendObj = backendObj
-
-			def run(self):
-				kal = self.backendObj.KeepAliveInterval
-				app = self.backendObj.Application
-
-				while self.backendObj._connection is None:
-				    time.sleep(5)
-
-				con = self.backendObj._connection
-				cur = con.cursor()
+	def ping(self):
+		"""
+		Send the keep-alive query over the connection. Returns True if it
+		succeeded, and stores the round-trip time in LastPingLatency.
+		"""
+		start = time.time()
+		try:
+			crs = self._connection.cursor()
+			crs.execute(self.keepAliveSQL)
+			crs.fetchall()
+			crs.close()
+		except StandardError:
+			return False
+		self.lastExecuteTime = now = time.time()
+		self._lastPingLatency = now - start
+		return True
 
-				while True:
-					time.sleep(5)
 
-					if kal is None or not app or getattr(app, "_finished", False):
-						self._toStop = True
-					if self._toStop:
-						return
+	def reconnect(self):
+		"""
+		Replace the connection with a new one opened with the same settings. The
+		dConnection that opened it is updated too; cursors created on the old
+		connection aren't.
+		"""
+		if self._connectArgs is None:
+			raise dException.ConnectionLostException(
+					_("The connection settings are unknown; can't reconnect."))
+		connectInfo, kwargs = self._connectArgs
+		old = self._connection
+		try:
+			old.close()
+		except StandardError:
+			pass
+		conn = self.getConnection(connectInfo, **kwargs)
+		owner = self._connectionOwner and self._connectionOwner()
+		if owner is not None and owner._connection is old:
+			owner._connection = conn
+		self._connectionLost = False
+		self.lastExecuteTime = time.time()
+		return conn
+
+
+	def _beginUse(self):
+		"""
+		Called by the cursors before they use the connection, so that the
+		keep-alive checks leave it alone until _endUse() is called. Raises
+		ConnectionLostException if a keep-alive check found the connection dead.
+		"""
+		if self._connectionLost:
+			raise dException.ConnectionLostException(
+					_("The connection to the database server was lost."))
+		self._useLock.acquire()
+
+
+	def _endUse(self):
+		"""Called by the cursors when they are done with the connection."""
+		self.lastExecuteTime = time.time()
+		self._useLock.release()
+
+
+	def _keepAlive(self):
+		"""Called by the keep-alive scheduler when this backend's check is due."""
+		kal = self.KeepAliveInterval
+		if kal is None:
+			return
+		app = self.Application
+		if app is not None and getattr(app, "_finished", False):
+			return
+		if (self._connection is not None and not self._connectionLost
+				and time.time() - self.lastExecuteTime >= kal
+				and self._useLock.acquire(False)):
+			# The connection has been idle for the whole interval, and no
+			# cursor is using it right now.
+			try:
+				if self.ping():
+					pass
+				elif len(self._cursors):
+					# Replacing the connection would leave the cursors on a
+					# closed one; let them raise ConnectionLostException instead.
+					dabo.log.info(_("Keep-alive query failed; the connection is lost."))
+					self._connectionLost = True
+				else:
+					dabo.log.info(_("Keep-alive query failed; reconnecting."))
+					try:
+						self.reconnect()
+					except StandardError, e:
+						dabo.log.error(_("Reconnect failed: %s") % ustr(e))
+			finally:
+				self._useLock.release()
+		kal = self.KeepAliveInterval
+		if kal is not None:
+			# Not turned off in the meantime
+			now = time.time()
+			due = self.lastExecuteTime + kal
+			if due <= now:
+				# Reconnecting failed; try again after another interval.
+				due = now + kal
+			_getKeepAliveScheduler().schedule(self, due)
 
-					if time.time() - self.backendObj.lastExecuteTime > kal:
-						cur.execute("select 1")
-						self.backendObj.lastExecuteTime = time.time()
 
-		existingThread = getattr(self, "_keepAliveThread", None)
-		if existingThread:
-			existingThread._toStop = True
-		if self.KeepAliveInterval is not None:
-			wt = self._keepAliveThread = WorkerThread(self)
-			wt.start()
+	def _applyKeepAlive(self):
+		"""Schedule (or cancel) the keep-alive checks for this backend."""
+		kal = self.KeepAliveInterval
+		if kal is None:
+			if _keepAliveScheduler is not None:
+				_keepAliveScheduler.unschedule(self)
+		else:
+			_getKeepAliveScheduler().schedule(self, time.time() + kal)
 
 	def _getEncoding(self):
 		"""Get backend encoding."""
@@ -682,6 +967,10 @@ class dBackend(dObject):
 		self._applyKeepAlive()
 
 
+	def _getLastPingLatency(self):
+		return self._lastPingLatency
+
+
 	Encoding = property(_getEncoding, _setEncoding, None,
 			_("Backend encoding  (str)"))
 
@@ -691,3 +980,7 @@ class dBackend(dObject):
 			Defaults to None, meaning we never send a KeepAlive query. The interval
 			is expressed in seconds.
 			"""))
+
+	LastPingLatency = property(_getLastPingLatency, None, None,
+			_("""Seconds the last keep-alive query took, or None if none has been
+			sent yet.  (float)"""))
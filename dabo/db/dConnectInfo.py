@@ -76,7 +76,10 @@ class dConnectInfo(dObject):
 
 	def getConnection(self, **kwargs):
 		kwargs.update(self.CustomParameters)
-		return self._backendObject.getConnection(self, **kwargs)
+		bo = self._backendObject
+		# Remembered so that the backend can reconnect by itself.
+		bo._connectArgs = (self, kwargs)
+		return bo.getConnection(self, **kwargs)
 
 
 	def getDictCursorClass(self):
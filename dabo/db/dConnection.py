@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import weakref
 from dabo.dLocalize import _
 from dabo.dObject import dObject
 from dConnectInfo import dConnectInfo
@@ -10,6 +11,8 @@ class dConnection(dObject):
 	def __init__(self, connectInfo=None, parent=None, forceCreate=False, **kwargs):
 		self._baseClass = dConnection
 		self._forceCreate = forceCreate
+		# The dConnectionPool this connection was acquired from, if any
+		self._pool = None
 		super(dConnection, self).__init__()
 		# Store a reference to the parent object (bizobj maybe; app
 		# object connection collection most likely)
@@ -40,6 +43,18 @@ class dConnection(dObject):
 		self._connection.close()
 
 
+	def release(self):
+		"""
+		Give a connection that was acquired from a dConnectionPool back to
+		its pool. Connections that don't belong to a pool are closed.
+		"""
+		pool = self._pool
+		if pool is None:
+			self.close()
+		else:
+			pool.release(self)
+
+
 	def getDictCursorClass(self):
 		return self._connectInfo.getDictCursorClass()
 
@@ -81,7 +96,9 @@ class dConnection(dObject):
 
 	def _openConnection(self, **kwargs):
 		"""Open a connection to the database and store it for future use."""
-		self.getBackendObject().KeepAliveInterval = self._connectInfo.KeepAliveInterval
+		bo = self.getBackendObject()
+		bo._connectionOwner = weakref.ref(self)
+		bo.KeepAliveInterval = self._connectInfo.KeepAliveInterval
 		return self._connectInfo.getConnection(forceCreate=self._forceCreate, **kwargs)
 
 
@@ -105,6 +122,14 @@ class dConnection(dObject):
 		return self._connectInfo
 
 
+	def _getIsPooled(self):
+		return self._pool is not None
+
+
+	def _getLastPingLatency(self):
+		return self.getBackendObject().LastPingLatency
+
+
 	def _getName(self):
 		try:
 			return self.ConnectInfo.Name
@@ -115,6 +140,13 @@ class dConnection(dObject):
 	ConnectInfo = property(_getConnInfo, None, None,
 			_("The connectInfo for the connection.  (dConnectInfo)"))
 
+	IsPooled = property(_getIsPooled, None, None,
+			_("Is this connection managed by a dConnectionPool?  (bool)"))
+
+	LastPingLatency = property(_getLastPingLatency, None, None,
+			_("""Seconds the last keep-alive query over this connection took, or None
+			if none has been sent yet.  (float)"""))
+
 	Name = property(_getName, None, None,
 			_("The name of the connection.  (str)"))
 
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import thread
+import threading
+import time
+import dabo
+import dabo.dException as dException
+from dabo.dLocalize import _
+from dabo.dObject import dObject
+from dConnectInfo import dConnectInfo
+from dConnection import dConnection
+
+
+# The pools created by getPool(), keyed by their connection settings.
+_pools = {}
+_poolsLock = threading.Lock()
+# Default of acquire()'s timeout, standing for the Timeout property
+_useTimeout = object()
+
+
+def _getPoolKey(connectInfo):
+	"""Return a hashable key identifying the database connectInfo points to."""
+	custom = connectInfo.CustomParameters.items()
+	custom.sort()
+	key = ((connectInfo.DbType or "").lower(), connectInfo.Host, connectInfo.Port,
+			connectInfo.Database, connectInfo.User, connectInfo.Password,
+			connectInfo.RemoteHost, tuple(custom))
+	bo = connectInfo.getBackendObject()
+	if bo is not None and not bo.poolAcrossThreads:
+		# The connections can only be used by the thread that opened them.
+		key += (thread.get_ident(), )
+	return key
+
+
+def getPool(connectInfo, **kwargs):
+	"""
+	Return the shared connection pool for the database described by
+	connectInfo, which can be a dConnectInfo object or a dict of connection
+	settings. The pool is created on first use; any keyword arguments are
+	used as its properties then, and ignored afterwards.
+	"""
+	if not isinstance(connectInfo, dConnectInfo):
+		connectInfo = dConnectInfo(connInfo=connectInfo)
+	key = _getPoolKey(connectInfo)
+	_poolsLock.acquire()
+	try:
+		try:
+			pool = _pools[key]
+		except KeyError:
+			pool = _pools[key] = dConnectionPool(connectInfo, **kwargs)
+	finally:
+		_poolsLock.release()
+	return pool
+
+
+def closePools():
+	"""Close all the idle connections in all the shared pools, and forget the pools."""
+	_poolsLock.acquire()
+	try:
+		pools = _pools.values()
+		_pools.clear()
+	finally:
+		_poolsLock.release()
+	for pool in pools:
+		pool.close()
+
+
+
+class dConnectionPool(dObject):
+	"""
+	Hands out dConnection objects for one database, and keeps them open
+	when they are released so that they can be reused.
+
+	Each pooled dConnection has its own copy of the connectInfo, and so its
+	own backend object, which makes it safe to use one pooled connection
+	per thread. Idle connections that haven't been used for HealthCheckInterval
+	seconds are checked with the backend's keep-alive query before they are
+	handed out again, and replaced if that fails.
+
+	Normally you get a pool from dabo.db.getPool() rather than creating one::
+
+		conn = dabo.db.getPool(ci, MaxSize=20).acquire()
+		try:
+			...
+		finally:
+			conn.release()
+	"""
+	def __init__(self, connectInfo, *args, **kwargs):
+		self._baseClass = dConnectionPool
+		self._connectInfo = connectInfo
+		self._minSize = 0
+		self._maxSize = 10
+		self._timeout = 30
+		self._healthCheckInterval = 30
+		self._condition = threading.Condition()
+		# List of (dConnection, release time) tuples, most recently released last.
+		self._idle = []
+		self._inUse = set()
+		self._closed = False
+		super(dConnectionPool, self).__init__(*args, **kwargs)
+		for num in range(self.MinSize):
+			self._idle.append((self._openConnection(), time.time()))
+
+
+	def acquire(self, timeout=_useTimeout):
+		"""
+		Return an open dConnection from the pool, opening a new one if none is
+		idle and MaxSize hasn't been reached. Otherwise wait up to 'timeout'
+		seconds (the Timeout property if not passed; None waits indefinitely)
+		for one to be released.
+		"""
+		if timeout is _useTimeout:
+			timeout = self.Timeout
+		cond = self._condition
+		cond.acquire()
+		try:
+			if self._closed:
+				raise dException.DatabaseException(_("The connection pool is closed."))
+			if timeout is not None:
+				endTime = time.time() + timeout
+			while not self._idle and len(self._inUse) >= self.MaxSize:
+				if timeout is None:
+					cond.wait()
+				else:
+					remaining = endTime - time.time()
+					if remaining <= 0:
+						raise dException.DatabaseException(
+								_("Timed out waiting for a pooled connection."))
+					cond.wait(remaining)
+			if self._idle:
+				conn, released = self._idle.pop()
+			else:
+				conn = released = None
+			# Reserve the slot until we have a connection to put in it.
+			placeholder = object()
+			self._inUse.add(placeholder)
+		finally:
+			cond.release()
+
+		# Opening and checking connections happens outside of the lock, so
+		# that a slow server doesn't hold up other threads.
+		try:
+			if conn is not None and (time.time() - released) >= self.HealthCheckInterval:
+				if not self._isHealthy(conn):
+					self._closeConnection(conn)
+					conn = None
+			if conn is None:
+				conn = self._openConnection()
+		finally:
+			cond.acquire()
+			try:
+				self._inUse.discard(placeholder)
+				if conn is not None:
+					self._inUse.add(conn)
+				else:
+					cond.notify()
+			finally:
+				cond.release()
+		return conn
+
+
+	def release(self, conn):
+		"""
+		Give a connection obtained from acquire() back to the pool. Any open
+		transaction is rolled back; if that fails, the connection is closed
+		instead of being reused.
+		"""
+		if conn not in self._inUse:
+			# Not handed out by this pool, or already released.
+			return
+		reuse = not self._closed
+		if reuse:
+			try:
+				conn.getConnection().rollback()
+			except StandardError:
+				reuse = False
+		if reuse:
+			conn.getBackendObject().lastExecuteTime = time.time()
+			self._releaseSlot(conn, reuse=True)
+		else:
+			self._closeConnection(conn)
+			self._releaseSlot(conn)
+
+
+	def close(self):
+		"""
+		Close the idle connections. Connections that are in use are closed
+		when they are released. acquire() fails once the pool is closed.
+		"""
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._closed = True
+			idle = self._idle
+			self._idle = []
+			cond.notifyAll()
+		finally:
+			cond.release()
+		for conn, released in idle:
+			self._closeConnection(conn)
+
+
+	def _releaseSlot(self, conn, reuse=False):
+		cond = self._condition
+		cond.acquire()
+		try:
+			self._inUse.discard(conn)
+			if reuse:
+				self._idle.append((conn, time.time()))
+			cond.notify()
+		finally:
+			cond.release()
+
+
+	def _openConnection(self):
+		ci = self._connectInfo
+		# Each connection needs its own backend object, since that is where
+		# the DB-API connection is stored. All of the settable properties are
+		# copied; DbType first, since setting it creates the backend object.
+		newCi = dConnectInfo(connInfo=ci.CustomParameters)
+		newCi.DbType = ci.DbType
+		for name, prop in dConnectInfo.__dict__.items():
+			if isinstance(prop, property) and prop.fget and prop.fset and name != "DbType":
+				setattr(newCi, name, getattr(ci, name))
+		conn = dConnection(newCi)
+		conn._pool = self
+		return conn
+
+
+	def _isHealthy(self, conn):
+		"""Run the backend's keep-alive query to see if the connection still works."""
+		return conn.getBackendObject().ping()
+
+
+	def _closeConnection(self, conn):
+		conn._pool = None
+		try:
+			conn.close()
+		except StandardError, e:
+			dabo.log.info(_("Error closing pooled connection: %s") % e)
+
+
+	def _getConnectInfo(self):
+		return self._connectInfo
+
+
+	def _getHealthCheckInterval(self):
+		return self._healthCheckInterval
+
+	def _setHealthCheckInterval(self, val):
+		self._healthCheckInterval = val
+
+
+	def _getIdleCount(self):
+		return len(self._idle)
+
+
+	def _getInUseCount(self):
+		return len(self._inUse)
+
+
+	def _getMaxSize(self):
+		return self._maxSize
+
+	def _setMaxSize(self, val):
+		self._maxSize = val
+
+
+	def _getMinSize(self):
+		return self._minSize
+
+	def _setMinSize(self, val):
+		self._minSize = val
+
+
+	def _getTimeout(self):
+		return self._timeout
+
+	def _setTimeout(self, val):
+		self._timeout = val
+
+
+	ConnectInfo = property(_getConnectInfo, None, None,
+			_("The connection settings the pooled connections are opened with.  (dConnectInfo)"))
+
+	HealthCheckInterval = property(_getHealthCheckInterval, _setHealthCheckInterval, None,
+			_("""Connections that have been idle for at least this many seconds are
+			checked with the keep-alive query before being reused. Default=30  (int)"""))
+
+	IdleCount = property(_getIdleCount, None, None,
+			_("Number of open connections waiting in the pool.  (int)"))
+
+	InUseCount = property(_getInUseCount, None, None,
+			_("Number of connections currently handed out by the pool.  (int)"))
+
+	MaxSize = property(_getMaxSize, _setMaxSize, None,
+			_("""Maximum number of connections handed out at the same time. Further
+			calls to acquire() wait for a connection to be released. Default=10  (int)"""))
+
+	MinSize = property(_getMinSize, _setMinSize, None,
+			_("""Number of connections opened when the pool is created. Default=0  (int)"""))
+
+	Timeout = property(_getTimeout, _setTimeout, None,
+			_("""Seconds acquire() waits for a connection when MaxSize are in use,
+			or None to wait indefinitely. Default=30  (int)"""))
@@ -4,6 +4,7 @@
 import datetime
 import time
 import re
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
 import functools
 import dabo
@@ -12,7 +13,7 @@ from dabo.dLocalize import _
 import dabo.dException as dException
 from dabo.dObject import dObject
 from dNoEscQuoteStr import dNoEscQuoteStr
-from dabo.db.dDataSet import dDataSet
+from dabo.db.dDataSet import dDataSet, dRecordList
 from dabo.lib import dates
 from dabo.lib.utils import noneSortKey, caseInsensitiveSortKey
 from dabo.lib.utils import ustr
@@ -76,12 +77,12 @@ class dCursorMixin(dObject):
 		self._lastSQL = ""
 		# Hold the time that this cursor was last requeried.
 		self.clearLastRequeryTime()
-		# These are used to determine if the field list of successive select statements
+		# Used to determine if the field list of successive select statements
 		# are identical.
-		self.__lastExecute = ""
 		self.__lastFieldList = ""
 		self._whitespacePat = re.compile(r"(\s+)")
 		self._selectStatementPat = re.compile(r"\bselect\b(.+)\bfrom\b", re.I | re.M | re.S)
+		self._fieldAliasPat = re.compile(r"\s*(.+?)\s+as\s+(\S+)\s*$", re.I | re.S)
 		# Holds the keys in the original, unsorted order for unsorting the dataset
 		self.__unsortedRows = []
 		# Holds the name of fields to be skipped when updating the backend, such
@@ -96,7 +97,7 @@ class dCursorMixin(dObject):
 		# it will be a separate object.
 		self.sqlManager = self
 		# Attribute that holds the data of the cursor
-		self._records = dDataSet()
+		self._records = dRecordList()
 		# Attribute that holds the current row number
 		self.__rownumber = -1
 		# Data structure info
@@ -136,6 +137,27 @@ class dCursorMixin(dObject):
 		# mementos and new records, keyed on record object ids:
 		self._mementos = {}
 		self._newRecords = {}
+		# Index mapping PK values to row numbers. It is bound to the rows it
+		# was built from (see _recordsStamp()), and is rebuilt lazily when
+		# they change.
+		self._pkIndex = None
+		self._pkIndexStamp = None
+		self._pkIndexHasDups = False
+		# Sorted column indexes used by seek(), keyed on (fields, caseSensitive).
+		self._seekIndexes = {}
+		self._seekIndexStamp = None
+		# Decimal scales from the DataStructure, keyed on field name. Built
+		# when first needed for each result set.
+		self._fieldScales = None
+		self._bulkTypeCorrection = False
+		# Number of rows fetched at a time; 0 fetches the whole result set.
+		self._fetchSize = 0
+		# Set while a chunked result set still has rows on the server. The
+		# statement is kept so that its total row count can be queried.
+		self._fetchPending = False
+		self._fetchSQL = None
+		self._fetchParams = None
+		self._fetchTotal = None
 
 		# Flag preference cursors so that they don't fill up the logs
 		self._isPrefCursor = False
@@ -214,12 +236,63 @@ class dCursorMixin(dObject):
 
 	def _correctFieldTypesIfNeeded(self, rec):
 		if not rec.get(kons.CURSOR_FIELD_TYPES_CORRECTED, False):
-			_correctFieldType = self._correctFieldType
-			for fld_name in (i for i in rec if i not in cursor_flags):
-				rec[fld_name] = _correctFieldType(rec[fld_name], fld_name)
+			types = self._types
+			getDataType = dabo.db.getDataType
+			convert = self._convertFieldValue
+			changed = False
+			for fld_name, field_val in rec.items():
+				if field_val is None or fld_name in cursor_flags:
+					continue
+				pythonType = types.get(fld_name) or getDataType(type(field_val))
+				if not isinstance(field_val, pythonType):
+					rec[fld_name] = convert(field_val, fld_name, pythonType)
+					changed = True
+			rec[kons.CURSOR_FIELD_TYPES_CORRECTED] = True
+			if changed:
+				self._records.markChanged(rec)
+
+
+	def _correctFieldTypesInBulk(self, records):
+		"""
+		Correct the field types of all the passed records, one column at a time,
+		so that the type of each column is only looked up once.
+		"""
+		if not records:
+			return
+		types = self._types
+		getDataType = dabo.db.getDataType
+		convert = self._convertFieldValue
+		for fld_name in records[0]:
+			if fld_name in cursor_flags:
+				continue
+			pythonType = types.get(fld_name)
+			if pythonType:
+				for rec in records:
+					field_val = rec[fld_name]
+					if field_val is not None and not isinstance(field_val, pythonType):
+						rec[fld_name] = convert(field_val, fld_name, pythonType)
+			else:
+				# The type depends on the value.
+				for rec in records:
+					field_val = rec[fld_name]
+					if field_val is not None:
+						valType = getDataType(type(field_val))
+						if not isinstance(field_val, valType):
+							rec[fld_name] = convert(field_val, fld_name, valType)
+		for rec in records:
 			rec[kons.CURSOR_FIELD_TYPES_CORRECTED] = True
 
 
+	def _getFieldScale(self, field_name):
+		"""Return the scale of the passed field in the DataStructure, or None."""
+		scales = self._fieldScales
+		if scales is None:
+			scales = self._fieldScales = {}
+			for field in self.DataStructure:
+				scales.setdefault(field[0], field[5])
+		return scales.get(field_name)
+
+
 	def _correctFieldType(self, field_val, field_name):
 		"""
 		Correct the type of the passed field_val, based on self.DataStructure.
@@ -232,15 +305,18 @@ class dCursorMixin(dObject):
 		if field_val is None:
 			return field_val
 
-		pythonType = self._types.get(field_name, dabo.db.getDataType(type(field_val)))
+		pythonType = self._types.get(field_name)
 		if not pythonType:
 			pythonType = dabo.db.getDataType(type(field_val))
 
-
 		if isinstance(field_val, pythonType):
 			# No conversion needed.
 			return field_val
+		return self._convertFieldValue(field_val, field_name, pythonType)
+
 
+	def _convertFieldValue(self, field_val, field_name, pythonType):
+		"""Convert the passed non-None field_val, which isn't a pythonType instance."""
 		def tryToCorrect(func, field_val, field_name):
 			try:
 				return func(field_val)
@@ -257,17 +333,12 @@ class dCursorMixin(dObject):
 		elif pythonType in (datetime.date,) and isinstance(field_val, basestring):
 			return tryToCorrect(dates.getDateFromString, field_val, field_name)
 		elif pythonType in (Decimal,):
-			ds = self.DataStructure
 			_field_val = field_val
 			if type(field_val) in (float,):
 				# Can't convert to decimal directly from float
 				_field_val = ustr(_field_val)
 			# Need to convert to the correct scale:
-			try:
-				scale = [s[5] for s in ds
-						if s[0] == field_name][0]
-			except IndexError:
-				scale = None
+			scale = self._getFieldScale(field_name)
 			if scale is None:
 				try:
 					scale = len(_field_val.split(".")[1])
@@ -337,16 +408,22 @@ class dCursorMixin(dObject):
 
 	def execute(self, sql, params=None, errorClass=None, convertQMarks=False):
 		"""Execute the sql, and populate the DataSet if it is a select statement."""
+		bo = self.BackendObject
+		bo._beginUse()
+		try:
+			return self._execute(sql, params, errorClass, convertQMarks)
+		finally:
+			bo._endUse()
+
+
+	def _execute(self, sql, params, errorClass, convertQMarks):
 		# The idea here is to let the super class do the actual work in
 		# retrieving the data. However, many cursor classes can only return
 		# row information as a list, not as a dictionary. This method will
 		# detect that, and convert the results to a dictionary.
-		if isinstance(sql, unicode):
-			sql = sql.encode(self.Encoding)
-		if convertQMarks:
-			sql = self._qMarkToParamPlaceholder(sql)
-		# Some backends, notably Firebird, require that fields be specially marked.
-		sql = self.processFields(sql)
+		# Any rows still pending from a chunked fetch are abandoned.
+		self._fetchPending = False
+		fetchSQL, sql, fldlist, isSelect = self._prepareSQL(sql, convertQMarks)
 		try:
 			if params:
 				res = self.superCursor.execute(self, sql, params)
@@ -357,49 +434,98 @@ class dCursorMixin(dObject):
 				if not self.IsPrefCursor:
 					self._dblogExecute("execute()", sql)
 		except Exception, e:
-			# There can be cases where errors are expected. In those cases, the
-			# calling routine will pass the class of the expected error, and will
-			# handle it appropriately.
-			if errorClass is not None and isinstance(e, errorClass):
-				raise e
-			self._dblogExecute("execute() FAILED", sql, params)
-
-			# Database errors need to be decoded from database encoding.
-			try:
-				errMsg = unicode(str(e), self.Encoding)
-			except UnicodeError:
-				errMsg = ustr(e)
-			# If this is due to a broken connection, let the user know.
-			# Different backends have different messages, but they
-			# should all contain the string 'connect' in them.
-			if "connect" in errMsg.lower():
-				raise dException.ConnectionLostException(errMsg)
-			elif "access" in errMsg.lower():
-				raise dException.DBNoAccessException(errMsg)
-			else:
-				errMsg = _("DBQueryException encountered in execute(): %s") % errMsg
-				self._dblogExecute(errMsg, sql)
-				raise dException.DBQueryException(errMsg)
-
-		# Set the last execute time in case there is a Keep Alive Interval
-		self.BackendObject.lastExecuteTime = time.time()
+			self._raiseExecuteError(e, "execute()", sql, params, errorClass)
 
 		# Some backend programs do odd things to the description
 		# This allows each backend to handle these quirks individually.
 		self.BackendObject.massageDescription(self)
 
-		if self._newStructure(sql):
+		if self._newStructure(fldlist):
 			self._storeFieldTypes()
 
-		if sql.split(None, 1)[0].lower() not in ("select", "pragma"):
+		if not isSelect:
 			# No need to massage the data for DML commands
-			self._records = dDataSet(tuple())
+			self._records = dRecordList()
 			return res
 
+		fetchSize = self._fetchSize
+		_records = self._fetchRows(fetchSize)
+		self._records = dRecordList(_records)
+		if fetchSize and len(_records) == fetchSize:
+			# There may be more rows; they are fetched when they are needed.
+			self._fetchPending = True
+			self._fetchSQL = fetchSQL
+			self._fetchParams = params
+			self._fetchTotal = None
+		self._fieldScales = None
+		if self._bulkTypeCorrection:
+			self._correctFieldTypesInBulk(self._records)
+		# This will handle bounds issues
+		self.RowNumber = self.RowNumber
+		return res
+
+
+	def executemany(self, sql, paramsList, errorClass=None):
+		"""
+		Execute the sql once for each params tuple in paramsList. This is meant
+		for statements that don't return records, such as inserts and updates.
+		"""
+		sql = self._prepareSQL(sql)[1]
+		paramsList = list(paramsList)
+		bo = self.BackendObject
+		bo._beginUse()
+		try:
+			try:
+				res = self.superCursor.executemany(self, sql, paramsList)
+				if not self.IsPrefCursor:
+					self._dblogExecute("executemany() %s rows" % len(paramsList), sql)
+			except Exception, e:
+				self._raiseExecuteError(e, "executemany()", sql, None, errorClass)
+		finally:
+			bo._endUse()
+		self._records = dRecordList()
+		return res
+
+
+	def _raiseExecuteError(self, e, caller, sql, params, errorClass):
+		"""Log the failed statement, and raise the matching Dabo exception."""
+		# There can be cases where errors are expected. In those cases, the
+		# calling routine will pass the class of the expected error, and will
+		# handle it appropriately.
+		if errorClass is not None and isinstance(e, errorClass):
+			raise e
+		self._dblogExecute("%s FAILED" % caller, sql, params)
+
+		# Database errors need to be decoded from database encoding.
+		try:
+			errMsg = unicode(str(e), self.Encoding)
+		except UnicodeError:
+			errMsg = ustr(e)
+		# If this is due to a broken connection, let the user know.
+		# Different backends have different messages, but they
+		# should all contain the string 'connect' in them.
+		if "connect" in errMsg.lower():
+			raise dException.ConnectionLostException(errMsg)
+		elif "access" in errMsg.lower():
+			raise dException.DBNoAccessException(errMsg)
+		else:
+			errMsg = _("DBQueryException encountered in %(caller)s: %(errMsg)s") % locals()
+			self._dblogExecute(errMsg, sql)
+			raise dException.DBQueryException(errMsg)
+
+
+	def _fetchRows(self, size=0):
+		"""
+		Fetch the rows of the last select statement as a list of dicts: the
+		next 'size' rows, or all remaining rows if size is 0.
+		"""
 		try:
-			_records = self.fetchall()
+			if size:
+				rows = self.fetchmany(size)
+			else:
+				rows = self.fetchall()
 		except Exception, e:
-			_records = dabo.db.dDataSet()
+			rows = []
 			# Database errors need to be decoded from database encoding.
 			try:
 				errMsg = ustr(e).decode(self.Encoding)
@@ -407,21 +533,61 @@ class dCursorMixin(dObject):
 				errMsg = ustr(e)
 			dabo.log.error("Error fetching records: (%s, %s)" % (type(e), errMsg))
 
-		if _records and isinstance(_records[0], (tuple, list)):
+		if rows and isinstance(rows[0], (tuple, list)):
 			# Need to convert each row to a Dict, since the backend didn't do it.
-			tmpRows = []
 			fldNames = [f[0] for f in self.FieldDescription]
-			for row in _records:
-				dic = {}
-				for idx, fldName in enumerate(fldNames):
-					dic[fldName] = row[idx]
-				tmpRows.append(dic)
-			_records = tmpRows
-
-		self._records = dDataSet(_records)
-		# This will handle bounds issues
-		self.RowNumber = self.RowNumber
-		return res
+			rows = [dict(zip(fldNames, row)) for row in rows]
+		return rows
+
+
+	def _fetchMore(self, row=None):
+		"""
+		When the result set was fetched in chunks, fetch enough of the rows still
+		on the server to include the passed row number, or all of them if row
+		is None.
+		"""
+		records = self._records
+		fetchSize = self._fetchSize
+		while self._fetchPending and (row is None or row >= len(records)):
+			bo = self.BackendObject
+			bo._beginUse()
+			try:
+				if row is None:
+					rows = self._fetchRows()
+				else:
+					rows = self._fetchRows(fetchSize)
+			finally:
+				bo._endUse()
+			if self._bulkTypeCorrection:
+				self._correctFieldTypesInBulk(rows)
+			records.extend(rows)
+			if row is None or len(rows) < fetchSize:
+				self._fetchPending = False
+
+
+	def _fetchRemaining(self):
+		"""Fetch any rows of a chunked result set that are still on the server."""
+		if self._fetchPending:
+			self._fetchMore()
+
+
+	def _getPendingRowCount(self):
+		"""
+		Return the total number of rows in a partially fetched result set. This
+		is queried once; if the backend can't count the statement, the rest of
+		the rows are fetched instead.
+		"""
+		if self._fetchTotal is None:
+			sql = "select count(*) as dabo_cnt from (%s) dabo_fetch" % self._fetchSQL
+			try:
+				ac = self.AuxCursor
+				ac.execute(sql, self._fetchParams)
+				self._fetchTotal = int(ac.getFieldVal("dabo_cnt"))
+			except Exception, e:
+				dabo.log.info(_("Couldn't count the rows of the result set: %s") % ustr(e))
+				self._fetchRemaining()
+				return len(self._records)
+		return max(self._fetchTotal, len(self._records))
 
 
 	def executeSafe(self, sql, params=None):
@@ -433,25 +599,48 @@ class dCursorMixin(dObject):
 		ac = self.AuxCursor
 		self._syncAuxProperties()
 		ac.execute(sql, params)
-		self.BackendObject.lastExecuteTime = time.time()
 		return ac
 
 
-	def _newStructure(self, sql):
+	def _prepareSQL(self, sql, convertQMarks=False):
 		"""
-		Attempts to parse the SQL to determine if the fields being selected will require
-		a new call to set the structure. Non-select statements likewise will return False.
+		Return a (fetchSQL, sql, fieldList, isSelect) tuple for the passed statement:
+		the statement encoded and with its placeholders converted, the same after
+		the backend's field processing, the normalized field list if it is a select
+		statement (or None), and whether it returns records. The results are cached
+		by the backend object, since the same statements are run over and over.
 		"""
-		if self._isAuxiliary:
-			return False
-		if sql == self.__lastExecute:
-			return False
-		# See if it's a select statement
+		bo = self.BackendObject
+		key = (sql, convertQMarks, self.Encoding)
+		ret = bo._statementCache.get(key)
+		if ret is not None:
+			return ret
+		if isinstance(sql, unicode):
+			sql = sql.encode(self.Encoding)
+		if convertQMarks:
+			sql = self._qMarkToParamPlaceholder(sql)
+		fetchSQL = sql
+		# Some backends, notably Firebird, require that fields be specially marked.
+		sql = self.processFields(sql)
+		fldlist = None
 		mtch = self._selectStatementPat.search(sql)
-		if not mtch:
+		if mtch:
+			# Normalize white space
+			fldlist = self._whitespacePat.sub(" ", mtch.groups()[0]).strip()
+		words = sql.split(None, 1)
+		isSelect = bool(words) and words[0].lower() in ("select", "pragma")
+		ret = bo._statementCache[key] = (fetchSQL, sql, fldlist, isSelect)
+		return ret
+
+
+	def _newStructure(self, fldlist):
+		"""
+		Determines from the field list of the last statement, as returned by
+		_prepareSQL(), if the fields being selected will require a new call to
+		set the structure. Non-select statements likewise will return False.
+		"""
+		if self._isAuxiliary or fldlist is None:
 			return False
-		# Normalize white space
-		fldlist = self._whitespacePat.sub(" ", mtch.groups()[0]).strip()
 		if self.__lastFieldList == fldlist:
 			return False
 		else:
@@ -481,14 +670,21 @@ class dCursorMixin(dObject):
 		ac._assocPKColOther = self._assocPKColOther
 
 
-	def requery(self, params=None, convertQMarks=False):
+	def requery(self, params=None, convertQMarks=False, sql=None):
+		"""
+		Run the CurrentSQL and store the results as the data set. If 'sql' is
+		passed, it is run instead; this is used for queries that are variations
+		of the CurrentSQL, such as the pages created by getPageSQL(). Such a
+		query must return its rows in the current sort order, as they aren't
+		sorted again.
+		"""
 		currSQL = self.CurrentSQL
 		newQuery = (self._lastSQL != currSQL)
 		self._lastSQL = currSQL
 		self.lastParams = params
 		self._savedStructureDescription = []
 
-		self.execute(currSQL, params, convertQMarks=convertQMarks)
+		self.execute(sql or currSQL, params, convertQMarks=convertQMarks)
 
 		# clear mementos and new record flags:
 		self._mementos = {}
@@ -503,7 +699,7 @@ class dCursorMixin(dObject):
 
 		# Clear the unsorted list, and then apply the current sort
 		self.__unsortedRows = []
-		if self.sortColumn:
+		if self.sortColumn and sql is None:
 			try:
 				self.sort(self.sortColumn, self.sortOrder)
 			except dException.NoRecordsException:
@@ -522,6 +718,7 @@ class dCursorMixin(dObject):
 		if target is None:
 			target = self
 		target._types = {}
+		target._fieldScales = None
 		for field in self.DataStructure:
 			field_alias, field_type = field[0], field[1]
 			target._types[field_alias] = dabo.db.getPythonType(field_type)
@@ -604,6 +801,7 @@ class dCursorMixin(dObject):
 		kf = self.KeyField
 		if not kf or not self.RowCount:
 			return
+		self._fetchRemaining()
 
 		if not self.__unsortedRows:
 			# Record the PK values
@@ -629,13 +827,18 @@ class dCursorMixin(dObject):
 		# Create the list to hold the rows for sorting
 		sortList = []
 		if not ordr:
-			# Restore the rows to their unsorted order
+			# Restore the rows to their unsorted order. Rows added since the
+			# original order was recorded go to the end.
+			unsortedPos = {}
+			for pos, key in enumerate(self.__unsortedRows):
+				unsortedPos.setdefault(key, pos)
+			endPos = len(unsortedPos)
 			for row in self._records:
 				if self._compoundKey:
 					key = tuple([row[k] for k in kf])
-					sortList.append([self.__unsortedRows.index(key), row])
 				else:
-					sortList.append([self.__unsortedRows.index(row[kf]), row])
+					key = row[kf]
+				sortList.append([unsortedPos.get(key, endPos), row])
 		else:
 			for row, rec in enumerate(self._records):
 				sortList.append([self.getFieldVal(col, row), rec])
@@ -651,9 +854,8 @@ class dCursorMixin(dObject):
 			sortKey = noneSortKey
 		sortList.sort(key=sortKey, reverse=(ordr == "DESC"))
 
-		# Extract the rows into a new list, then convert them back to the _records tuple
-		newRows = [elem[1] for elem in sortList]
-		self._records = dDataSet(newRows)
+		# Put the rows back in their new order
+		self._records[:] = [elem[1] for elem in sortList]
 
 		# restore the RowNumber
 		self.moveToPK(currRowKey)
@@ -823,11 +1025,21 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		# are assigned to the same child, we need to use sqlManager
 		# for temporary key creation.
 		tmpPK = self.sqlManager._genTempPKVal(pkVal)
+		try:
+			oldKey = self._recordKey(rec, kf)
+		except KeyError:
+			oldKey = None
 		if isinstance(kf, tuple):
 			for key in kf:
 				rec[key] = tmpPK
+			newKey = tuple([tmpPK for key in kf])
 		else:
 			rec[kf] = tmpPK
+			newKey = tmpPK
+		self._records.markChanged(rec)
+		self._updatePKIndex(self.RowNumber, oldKey, newKey)
+		for key in (kf if isinstance(kf, tuple) else (kf,)):
+			self._dropSeekIndexes(key)
 		rec[kons.CURSOR_TMPKEY_FIELD] = tmpPK
 		return tmpPK
 
@@ -882,6 +1094,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 					_("No records in dataset '%s'.") % self.Table)
 		if row is None:
 			row = self._getRowNumber()
+		elif self._fetchPending:
+			self._fetchMore(row)
 		try:
 			rec = _records[row]
 		except IndexError:
@@ -974,6 +1188,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			row, rec = self._getRecordByPk(pk)
 		elif row is None:
 			row = self.RowNumber
+		elif self._fetchPending:
+			self._fetchMore(row)
 
 		if not rec:
 			try:
@@ -1069,6 +1285,7 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 					else:
 						old_key = old_val
 						keyFieldValue = val
+					self._updatePKIndex(row, old_key, keyFieldValue)
 					if old_key in self._mementos:
 						self._mementos[keyFieldValue] = self._mementos.pop(old_key)
 					if old_key in self._newRecords:
@@ -1104,6 +1321,9 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 			# Finally, save the new value to the field and signify that the field was changed:
 			rec[fld] = val
+			self._records.markChanged(rec)
+			if self._seekIndexes:
+				self._dropSeekIndexes(fld)
 			return True
 
 
@@ -1149,10 +1369,14 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 
 	def mmAssociateValues(self, otherField, listOfValues):
-		keyField = self.KeyField
-		pk = self.getPK()
-		for val in listOfValues:
-			self.mmAddToBoth(keyField, pk, otherField, val)
+		"""
+		Adds association records so that the current record is associated with
+		every item in listOfValues. Other existing relationships are unaffected.
+		"""
+		thisPK = self.getPK()
+		otherPKs = self._mmLookupPKs(otherField, listOfValues)
+		existing = self._mmAssociatedPKs(thisPK)
+		self._mmAddAssociations(thisPK, [pk for pk in otherPKs if pk not in existing])
 
 
 	def mmDissociateValue(self, otherField, otherVal):
@@ -1170,28 +1394,9 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		in the 'other' table of a M-M relationship. If no such association exists,
 		nothing happens.
 		"""
-		thisTable = self.Table
-		otherTable = self._mmOtherTable
 		thisPK = self.getPK()
-		for otherVal in listOfValues:
-			otherPK = self.lookupPKWithAdd(otherField, otherVal, otherTable, self._mmOtherPKCol)
-			aux = self.AuxCursor
-			sql = self._qMarkToParamPlaceholder("delete from %s where %s = ? and %s = ?"
-					% (self._assocTable, self._assocPKColThis, self._assocPKColOther))
-			try:
-				dabo.dbActivityLog.info("mmDissociateValues() SQL: %s, PARAMS: %s" % (
-						sql.decode(self.Encoding).replace("\n", " "), str((self._assocTable,
-					self._assocPKColThis, self._assocPKColOther))))
-			except StandardError:
-				# A problem with writing to the log, most likely due to encoding issues
-				try:
-					dabo.dbActivityLog.info("mmDissociateValues() SQL (failed to log PARAMS): %r" % sql)
-				except StandardError:
-					dabo.dbActivityLog.info("mmDissociateValues() (failed to log SQL and PARAMS)")
-			try:
-				aux.execute(sql, (thisPK, otherPK))
-			except dException.NoRecordsException:
-				pass
+		otherPKs = self._mmLookupPKs(otherField, listOfValues, addMissing=False)
+		self._mmRemoveAssociations(thisPK, otherPKs)
 
 
 	def mmDissociateAll(self):
@@ -1218,8 +1423,12 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		Adds and/or removes association records so that the current record
 		is associated with every item in listOfValues, and none other.
 		"""
-		self.mmDissociateAll()
-		self.mmAssociateValues(otherField, listOfValues)
+		thisPK = self.getPK()
+		otherPKs = self._mmLookupPKs(otherField, listOfValues)
+		existing = self._mmAssociatedPKs(thisPK)
+		wanted = set(otherPKs)
+		self._mmRemoveAssociations(thisPK, [pk for pk in existing if pk not in wanted])
+		self._mmAddAssociations(thisPK, [pk for pk in otherPKs if pk not in existing])
 
 
 	def mmAddToBoth(self, thisField, thisVal, otherField, otherVal):
@@ -1252,6 +1461,144 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			aux.execute(sql, (thisPK, otherPK))
 
 
+	def _mmLookupPKs(self, otherField, listOfValues, addMissing=True):
+		"""
+		Returns the PKs of the records in the 'other' table of a M-M relationship
+		whose 'otherField' column holds the values in listOfValues, in the order
+		of the values and without duplicates. If addMissing is True, values that
+		aren't in the other table yet are inserted in one executemany() call;
+		otherwise they are skipped.
+		"""
+		values = []
+		seen = set()
+		for val in listOfValues:
+			if val not in seen:
+				seen.add(val)
+				values.append(val)
+		pkMap = self._mmSelectPKs(otherField, values)
+		missing = [val for val in values if val not in pkMap]
+		if missing and addMissing:
+			sql = "insert into %s (%s) values (%s)" % (self._mmOtherTable, otherField,
+					self.ParamPlaceholder)
+			params = [(val,) for val in missing]
+			self._mmLogStatement("_mmLookupPKs", sql, params)
+			self.AuxCursor.executemany(sql, params)
+			pkMap.update(self._mmSelectPKs(otherField, missing))
+		ret = []
+		for val in values:
+			try:
+				pk = pkMap[val]
+			except KeyError:
+				continue
+			if pk not in ret:
+				ret.append(pk)
+		return ret
+
+
+	def _mmSelectPKs(self, otherField, values):
+		"""
+		Returns a dict mapping values of 'otherField' in the 'other' table of a
+		M-M relationship to the PKs of their records, using IN queries.
+
+		The database may match a value to a record holding it in another form,
+		such as in another case or with padding, which then isn't found among
+		the values returned. So the values not found are queried again, and if
+		the database matches any of them, those are looked up one at a time.
+		"""
+		aux = self.AuxCursor
+		pkCol = self._mmOtherPKCol
+		ret = {}
+		notFound = []
+		for chunk, found in self._mmSelectChunks(otherField, values):
+			for val in chunk:
+				if val in found:
+					ret[val] = found[val]
+				else:
+					notFound.append(val)
+		sql = "select %s from %s where %s = %s" % (pkCol, self._mmOtherTable,
+				otherField, self.ParamPlaceholder)
+		for chunk, found in self._mmSelectChunks(otherField, notFound):
+			if not found:
+				# None of these values are in the table.
+				continue
+			for val in chunk:
+				self._mmLogStatement("_mmSelectPKs", sql, (val,))
+				aux.execute(sql, (val,))
+				if aux.RowCount:
+					ret[val] = aux.getFieldVal(pkCol)
+		return ret
+
+
+	def _mmSelectChunks(self, otherField, values):
+		"""
+		Generates a (values, found) tuple for each IN query needed to select
+		the passed values of 'otherField' in the 'other' table of a M-M
+		relationship. 'found' maps the values returned to their PKs.
+		"""
+		aux = self.AuxCursor
+		ph = self.ParamPlaceholder
+		pkCol = self._mmOtherPKCol
+		batchSize = self.BackendObject.getInListBatchSize()
+		for pos in xrange(0, len(values), batchSize):
+			chunk = values[pos:pos + batchSize]
+			sql = "select %s, %s from %s where %s in (%s)" % (pkCol, otherField,
+					self._mmOtherTable, otherField, ", ".join(len(chunk) * [ph]))
+			self._mmLogStatement("_mmSelectPKs", sql, chunk)
+			aux.execute(sql, tuple(chunk))
+			yield chunk, dict([(rec[otherField], rec[pkCol]) for rec in aux.getDataSet()])
+
+
+	def _mmAssociatedPKs(self, thisPK):
+		"""
+		Returns the set of 'other' PKs associated with thisPK in the association
+		table of a M-M relationship.
+		"""
+		aux = self.AuxCursor
+		col = self._assocPKColOther
+		sql = "select %s from %s where %s = %s" % (col, self._assocTable,
+				self._assocPKColThis, self.ParamPlaceholder)
+		self._mmLogStatement("_mmAssociatedPKs", sql, (thisPK,))
+		aux.execute(sql, (thisPK,))
+		return set([rec[col] for rec in aux.getDataSet()])
+
+
+	def _mmAddAssociations(self, thisPK, otherPKs):
+		"""Inserts an association record for thisPK and each of the otherPKs."""
+		if not otherPKs:
+			return
+		ph = self.ParamPlaceholder
+		sql = "insert into %s (%s, %s) values (%s, %s)" % (self._assocTable,
+				self._assocPKColThis, self._assocPKColOther, ph, ph)
+		params = [(thisPK, pk) for pk in otherPKs]
+		self._mmLogStatement("_mmAddAssociations", sql, params)
+		self.AuxCursor.executemany(sql, params)
+
+
+	def _mmRemoveAssociations(self, thisPK, otherPKs):
+		"""Deletes the association records for thisPK and each of the otherPKs."""
+		if not otherPKs:
+			return
+		ph = self.ParamPlaceholder
+		sql = "delete from %s where %s = %s and %s = %s" % (self._assocTable,
+				self._assocPKColThis, ph, self._assocPKColOther, ph)
+		params = [(thisPK, pk) for pk in otherPKs]
+		self._mmLogStatement("_mmRemoveAssociations", sql, params)
+		self.AuxCursor.executemany(sql, params)
+
+
+	def _mmLogStatement(self, methodName, sql, params):
+		"""Writes a M-M statement and its params to the dbActivityLog."""
+		try:
+			dabo.dbActivityLog.info("%s() SQL: %s, PARAMS: %s" % (methodName,
+					sql.decode(self.Encoding).replace("\n", " "), str(params)))
+		except StandardError:
+			# A problem with writing to the log, most likely due to encoding issues
+			try:
+				dabo.dbActivityLog.info("%s() SQL (failed to log PARAMS): %r" % (methodName, sql))
+			except StandardError:
+				dabo.dbActivityLog.info("%s() (failed to log SQL and PARAMS)" % methodName)
+
+
 	def mmGetAssociatedValues(self, listOfFields):
 		"""
 		Returns a dataset containing the values for the specified fields
@@ -1286,11 +1633,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		"""
 		ret = {}
 		if pk is not None:
-			recs = [r for r in self._records
-					if r[self._keyField] == pk]
-			try:
-				rec = recs[0]
-			except IndexError:
+			row, rec = self._getRecordByPk(pk, raiseRowNotFound=False)
+			if rec is None:
 				return ret
 		else:
 			if row is None:
@@ -1318,11 +1662,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		"""
 		ret = {}
 		if pk is not None:
-			recs = [r for r in self._records
-					if r[self._keyField] == pk]
-			try:
-				rec = recs[0]
-			except IndexError:
+			row, rec = self._getRecordByPk(pk, raiseRowNotFound=False)
+			if rec is None:
 				return ret
 		else:
 			if row is None:
@@ -1330,9 +1671,10 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			rec = self._records[row]
 			pk = self.pkExpression(rec)
 
+		table = self.Table
+		tableFields = set([f[0] for f in self.DataStructure if f[3] == table])
 		for k, v in rec.items():
-			if k not in cursor_flags and \
-					self.Table in [f[3] for f in self.DataStructure if f[0]==k]:
+			if k not in cursor_flags and k in tableFields:
 				ret[k] = (None, v)
 		return ret
 
@@ -1357,7 +1699,10 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		and this is really intended for one-off read-only cursors.
 		"""
 		if not ds:
-			ds = dDataSet()
+			ds = dRecordList()
+		elif not isinstance(ds, dRecordList):
+			ds = dRecordList(ds)
+		self._fetchPending = False
 		self._records = ds
 
 
@@ -1370,6 +1715,10 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		to only include the specified fields. rowStart specifies the starting row
 		to include, and rows is the number of rows to return.
 		"""
+		if rows is None:
+			self._fetchRemaining()
+		elif self._fetchPending:
+			self._fetchMore(rowStart + rows - 1)
 		_currentRow = self.RowNumber
 		rowCount = self.RowCount
 		if rows is None:
@@ -1464,8 +1813,12 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		if data is None:
 			return
 		# Store the values
+		if not isinstance(data, dRecordList):
+			data = dRecordList(data)
+		self._fetchPending = False
 		self._records = data
 		self._types = typs
+		self._fieldScales = None
 		# Clear the unsorted list, and then apply the current sort
 		self.__unsortedRows = []
 		if self.sortColumn:
@@ -1478,11 +1831,13 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def filter(self, fld, expr, op="="):
 		"""Apply a filter to the current records."""
+		self._fetchRemaining()
 		self._records = self._records.filter(fld=fld, expr=expr, op=op)
 
 
 	def filterByExpression(self, expr):
 		"""Allows you to filter by any valid Python expression."""
+		self._fetchRemaining()
 		self._records = self._records.filterByExpression(expr)
 
 
@@ -1514,10 +1869,13 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		   be used in any programming.
 
 		"""
+		self._fetchRemaining()
 		# Make sure that the data set object has any necessary references
 		self._records.Cursor = self
 		self._records.Bizobj = self._bizobj
 		self._records.replace(field, valOrExpr, scope=scope)
+		self._invalidatePKIndex()
+		self._dropSeekIndexes()
 
 
 	def first(self):
@@ -1572,9 +1930,13 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		# Make sure that there is a PK
 		self.checkPK()
 
-		def saverow(row):
+		def saverows(rows):
 			try:
-				self.__saverow(row)
+				if len(rows) > 1:
+					self._saveRows(rows)
+				else:
+					for row in rows:
+						self.__saverow(row)
 			except dException.DBQueryException, e:
 				# Error was encountered. Raise an exception so that the
 				# calling bizobj can rollback the transaction if necessary
@@ -1599,9 +1961,9 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		self._syncAuxProperties()
 
 		if allRows:
-			# This branch doesn't happen when called from dBizobj (not sure if
-			# we really need the allRows arg at all).
-			rows = self.getChangedRows(includeNewUnchanged=includeNewUnchanged)
+			# dBizobj.saveAll() uses this branch when there is nothing to run
+			# between the rows. Save them in row order.
+			rows = sorted(self.getChangedRows(includeNewUnchanged=includeNewUnchanged))
 		else:
 			# This branch results in redundant isChanged() call when called from
 			# dBizobj.saveAll(), but it needs to be here because dBizobj.save()
@@ -1609,14 +1971,128 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			rows = []
 			if self.isChanged(allRows=False, includeNewUnchanged=includeNewUnchanged):
 				rows = [self.RowNumber]
-		for row in rows:
-			saverow(row)
+		saverows(rows)
 
 
 	def __saverow(self, row):
 		rec = self._records[row]
 		recKey = self.pkExpression(rec)
 		newrec = kons.CURSOR_TMPKEY_FIELD in rec
+		stmt = self._getSaveStatement(row, self._getFieldTypeCodes())
+		if stmt is None:
+			return
+		sql, params, newPKVal = stmt
+		getID = newrec and self.AutoPopulatePK and not self._compoundKey \
+				and (newPKVal is None)
+		self._executeSave(row, recKey, newrec, sql, params, getID)
+
+
+	def _saveRows(self, rows):
+		"""
+		Save the passed rows, in the order passed. Consecutive rows whose
+		statements are alike are sent to the backend together: inserts as
+		multi-row inserts where the backend supports them, and everything else
+		with executemany(). New rows whose generated PKs can't be retrieved for
+		a whole batch are saved one at a time.
+		"""
+		bo = self.BackendObject
+		fieldTypes = self._getFieldTypeCodes()
+		needIDs = self.AutoPopulatePK and not self._compoundKey
+		batchKey = None
+		batch = []
+		for row in rows:
+			rec = self._records[row]
+			recKey = self.pkExpression(rec)
+			newrec = kons.CURSOR_TMPKEY_FIELD in rec
+			stmt = self._getSaveStatement(row, fieldTypes)
+			if stmt is None:
+				continue
+			sql, params, newPKVal = stmt
+			getID = newrec and needIDs and (newPKVal is None)
+			if getID and not (params and bo.batchInsertIDs):
+				self._saveBatch(batchKey, batch)
+				batchKey, batch = None, []
+				self._executeSave(row, recKey, newrec, sql, params, getID)
+				continue
+			key = (sql, newrec, getID)
+			if key != batchKey:
+				self._saveBatch(batchKey, batch)
+				batchKey, batch = key, []
+			batch.append((row, recKey, params))
+		self._saveBatch(batchKey, batch)
+
+
+	def _saveBatch(self, key, entries):
+		"""
+		Send the rows in 'entries' together. 'key' holds the statement they
+		share, whether they are new, and whether their generated PKs are needed.
+		"""
+		if not entries:
+			return
+		sql, newrec, getID = key
+		if newrec and entries[0][2]:
+			self._insertRows(sql, entries, getID)
+			return
+		res = self.AuxCursor.executemany(sql, [params for row, recKey, params in entries])
+		for row, recKey, params in entries:
+			self._finishSavedRow(row, recKey, newrec, res)
+
+
+	def _insertRows(self, sql, entries, getID):
+		"""
+		Insert the rows in 'entries', which share the insert statement 'sql', with
+		as few multi-row insert statements as the backend allows. If 'getID' is
+		True, the generated PKs are stored in the rows.
+		"""
+		bo = self.BackendObject
+		aux = self.AuxCursor
+		colCount = len(entries[0][2])
+		batchSize = bo.getInsertBatchSize(colCount)
+		if batchSize < 2:
+			if getID:
+				for row, recKey, params in entries:
+					self._executeSave(row, recKey, True, sql, params, getID)
+			else:
+				res = aux.executemany(sql, [params for row, recKey, params in entries])
+				for row, recKey, params in entries:
+					self._finishSavedRow(row, recKey, True, res)
+			return
+
+		rowValues = "(%s)" % ",".join(colCount * [self.ParamPlaceholder])
+		head = sql[:-len(" values %s " % rowValues)]
+		returning = ""
+		if getID:
+			returning = bo.getInsertReturning(aux)
+		for pos in xrange(0, len(entries), batchSize):
+			chunk = entries[pos:pos + batchSize]
+			params = []
+			for row, recKey, rowParams in chunk:
+				params.extend(rowParams)
+			chunkSQL = "%s values %s%s" % (head, ", ".join(len(chunk) * [rowValues]),
+					returning)
+			res = aux.execute(chunkSQL, tuple(params))
+			if getID:
+				newPKs = bo.getLastInsertIDs(aux, len(chunk))
+				for (row, recKey, rowParams), newPKVal in zip(chunk, newPKs):
+					self.setFieldVal(self.KeyField, newPKVal, row)
+			for row, recKey, rowParams in chunk:
+				self._finishSavedRow(row, recKey, True, res)
+
+
+	def _getFieldTypeCodes(self):
+		"""Return a dict mapping each field in the DataStructure to its type code."""
+		return dict([(ds[0], ds[1]) for ds in self.DataStructure])
+
+
+	def _getSaveStatement(self, row, fieldTypes):
+		"""
+		Return a 3-tuple of the SQL and params that save the passed row, and the
+		PK value generated for it beforehand, if any; or None if the row has
+		nothing to save. 'fieldTypes' maps the field names to their type codes.
+		Rows that change the same fields get the same SQL.
+		"""
+		rec = self._records[row]
+		newrec = kons.CURSOR_TMPKEY_FIELD in rec
 
 		newPKVal = None
 		if newrec and self.AutoPopulatePK:
@@ -1633,107 +2109,116 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			diff = self._getNewRecordDiff(row)
 		else:
 			diff = self.getRecordStatus(row)
+		if not diff:
+			return None
+		bo = self.BackendObject
 		aq = self.AutoQuoteNames
-		if diff:
-			if newrec:
-				flds = ""
-				vals = []
-				kf = self.KeyField
-				for kk, vv in diff.items():
-					if self.AutoPopulatePK:
-						if self._compoundKey:
-							skipIt = (kk in kf)
-						else:
-							# Skip the key field, unless we pre-generated its value above.
-							skipIt = (kk == self.KeyField) and not newPKVal
-						if skipIt:
-							# we don't want to include the PK in the insert
-							continue
-					if kk in self.getNonUpdateFields():
-						# Skip it.
-						continue
-					if self._nullDefaults and vv == (None, None):
-						# Skip these, too
+		nms = bo.encloseNames(self.Table, aq)
+		if newrec:
+			flds = []
+			vals = []
+			kf = self.KeyField
+			nonup = self.getNonUpdateFields()
+			for kk, vv in sorted(diff.items()):
+				if self.AutoPopulatePK:
+					if self._compoundKey:
+						skipIt = (kk in kf)
+					else:
+						# Skip the key field, unless we pre-generated its value above.
+						skipIt = (kk == kf) and not newPKVal
+					if skipIt:
+						# we don't want to include the PK in the insert
 						continue
-					# Append the field and its value.
-					flds += ", " + self.BackendObject.encloseNames(kk, aq)
-					# add value to expression
-					fieldType = [ds[1] for ds in self.DataStructure if ds[0] == kk][0]
-					val = vv[1]
-					if fieldType == "L" or (isinstance(val, basestring) and "\0" in val):
-						val = self.formatBLOB(val)
-					#elif fieldType in ("D", "T"):
-					#	val = self.formatDateTime(val)
-					vals.append(val)
-
-				# Trim leading comma-space from the 'flds' string
-				flds = flds[2:]
-				if not flds:
-					# Some backends (sqlite) require non-empty field clauses. We already
-					# know that we are expecting the backend to generate the PK, so send
-					# NULL as the PK Value:
-					flds = self.KeyField
-					vals = "NULL"
-				nms = self.BackendObject.encloseNames(self.Table, aq)
+				if kk in nonup:
+					# Skip it.
+					continue
+				if self._nullDefaults and vv == (None, None):
+					# Skip these, too
+					continue
+				# Append the field and its value.
+				flds.append(bo.encloseNames(kk, aq))
+				# add value to expression
+				val = vv[1]
+				if fieldTypes.get(kk) == "L" or (isinstance(val, basestring) and "\0" in val):
+					val = self.formatBLOB(val)
+				vals.append(val)
+
+			if flds:
 				placeHolders = len(vals) * [self.ParamPlaceholder]
-				sql = "insert into %s (%s) values (%s) " % (nms, flds, ",".join(placeHolders))
-				params = tuple(vals)
+				sql = "insert into %s (%s) values (%s) " % (nms, ", ".join(flds),
+						",".join(placeHolders))
 			else:
-				pkWhere = self.makePkWhere(row)
-				updClause, params = self.makeUpdClause(diff)
-				sql = "update %s set %s where %s" % (self.BackendObject.encloseNames(self.Table, aq),
-						updClause, pkWhere)
-			#run the update
-			aux = self.AuxCursor
-			res = aux.execute(sql, params)
+				# Some backends (sqlite) require non-empty field clauses. We already
+				# know that we are expecting the backend to generate the PK, so send
+				# NULL as the PK Value:
+				sql = "insert into %s (%s) values (NULL) " % (nms, kf)
+			params = tuple(vals)
+		else:
+			updClause, params = self.makeUpdClause(diff, fieldTypes)
+			pkWhere, pkParams = self._makePkWhereParams(row)
+			sql = "update %s set %s where %s" % (nms, updClause, pkWhere)
+			params += pkParams
+		return (sql, params, newPKVal)
 
-			if newrec and self.AutoPopulatePK and (newPKVal is None):
-				# Call the database backend-specific code to retrieve the
-				# most recently generated PK value.
-				newPKVal = aux.getLastInsertID()
-				if newPKVal and not self._compoundKey:
-					self.setFieldVal(self.KeyField, newPKVal, row)
 
-			if newrec and self._nullDefaults:
-				# We need to retrieve any new default values
-				aux = self.AuxCursor
-				if not isinstance(self.KeyField, tuple):
-					keyFields = [self.KeyField]
-				else:
-					keyFields = self.KeyField
-				wheres = []
-				for kf in keyFields:
-					fld = self.BackendObject.encloseNames(kf, self.AutoQuoteNames)
-					val = self.getFieldVal(kf)
-					if isinstance(val, basestring):
-						val = "'" + val.encode(self.Encoding) + "' "
-					elif isinstance(val, (datetime.date, datetime.datetime)):
-						val = self.formatDateTime(val)
-					else:
-						val = ustr(val)
-					wheres.append("%s = %s" % (fld, val))
-				where = " and ".join(wheres)
-				aux.execute("select * from %s where %s" % (self.Table, where))
-				try:
-					data = aux.getDataSet()[0]
-					for fld, val in data.items():
-						try:
-							self.setFieldVal(fld, val)
-						except dException.FieldNotFoundException:
-							# Field is not in the dataset
-							pass
-				except IndexError:
-					# For some reason we could not retrieve the matching PK record
-					pass
+	def _executeSave(self, row, recKey, newrec, sql, params, getID):
+		"""
+		Run the statement that saves the row. If 'getID' is True, the PK that the
+		backend generated for the new row is retrieved and stored.
+		"""
+		aux = self.AuxCursor
+		res = aux.execute(sql, params)
+		if getID:
+			# Call the database backend-specific code to retrieve the
+			# most recently generated PK value.
+			newPKVal = aux.getLastInsertID()
+			if newPKVal:
+				self.setFieldVal(self.KeyField, newPKVal, row)
+		self._finishSavedRow(row, recKey, newrec, res)
 
-			self._clearMemento(row)
-			if newrec:
-				self._clearNewRecord(row=row, pkVal=recKey)
+
+	def _finishSavedRow(self, row, recKey, newrec, res):
+		"""Update the row's state once it has been saved."""
+		if newrec and self._nullDefaults:
+			# We need to retrieve any new default values
+			aux = self.AuxCursor
+			if not isinstance(self.KeyField, tuple):
+				keyFields = [self.KeyField]
 			else:
-				if not res:
-					# Different backends may cause res to be None
-					# even if the save is successful.
-					self.BackendObject.noResultsOnSave()
+				keyFields = self.KeyField
+			wheres = []
+			for kf in keyFields:
+				fld = self.BackendObject.encloseNames(kf, self.AutoQuoteNames)
+				val = self.getFieldVal(kf, row)
+				if isinstance(val, basestring):
+					val = "'" + val.encode(self.Encoding) + "' "
+				elif isinstance(val, (datetime.date, datetime.datetime)):
+					val = self.formatDateTime(val)
+				else:
+					val = ustr(val)
+				wheres.append("%s = %s" % (fld, val))
+			where = " and ".join(wheres)
+			aux.execute("select * from %s where %s" % (self.Table, where))
+			try:
+				data = aux.getDataSet()[0]
+				for fld, val in data.items():
+					try:
+						self.setFieldVal(fld, val, row)
+					except dException.FieldNotFoundException:
+						# Field is not in the dataset
+						pass
+			except IndexError:
+				# For some reason we could not retrieve the matching PK record
+				pass
+
+		self._clearMemento(row)
+		if newrec:
+			self._clearNewRecord(row=row, pkVal=recKey)
+		else:
+			if not res:
+				# Different backends may cause res to be None
+				# even if the save is successful.
+				self.BackendObject.noResultsOnSave()
 
 
 	def _clearMemento(self, row=None):
@@ -1825,8 +2310,24 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def new(self):
 		"""Add a new record to the data set."""
+		self._fetchRemaining()
 		blank = self._getBlankRecord()
-		self._records = dDataSet(self._records + (blank,))
+		keepIndex = self._pkIndex is not None and self._pkIndexStamp == self._recordsStamp()
+		self._records.append(blank)
+		for src in self._filterSources():
+			src.append(blank)
+		if keepIndex:
+			# Add the new row to the index.
+			self._pkIndexStamp = self._recordsStamp()
+			try:
+				key = self._recordKey(blank)
+			except KeyError:
+				self._pkIndex = None
+			else:
+				if key in self._pkIndex:
+					self._pkIndexHasDups = True
+				else:
+					self._pkIndex[key] = len(self._records) - 1
 		# Adjust the RowCount and position
 		self.RowNumber = self.RowCount - 1
 
@@ -1844,34 +2345,31 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 		# Faster to deal with 2 specific cases: all rows or just current row
 		if allRows:
-			try:
-				recs = self._records.UnfilteredDataSet
-			except AttributeError:
-				# Not a dDataSet
-				recs = self._records
-
 			if self._newRecords:
-				recs = list(recs)
-				delrecs_idx = []
+				# Canceling new records removes any filters.
+				self._records = self._records.UnfilteredDataSet
+				newRecs = set()
 				for rec_id in self._newRecords:
 					# Remove any memento associated with the canceled new record, and
-					# append to the list of indexes to delete.
+					# note the record to delete.
 					row, rec = self._getRecordByPk(rec_id)
 					self._clearMemento(row)
-					delrecs_idx.append(self._records._index(rec))
-				delrecs_idx.sort(reverse=True)
-				for idx in delrecs_idx:
-					del recs[idx]
+					newRecs.add(id(rec))
+				self._records[:] = [rec for rec in self._records
+						if id(rec) not in newRecs]
 				self._newRecords = {}
-				self._records = dDataSet(recs)
 				if self.RowNumber >= self.RowCount:
 					self.RowNumber = self.RowCount - 1
 
 			for rec_pk, mem in self._mementos.items():
 				row, rec = self._getRecordByPk(rec_pk)
 				for fld, val in mem.items():
-					self._records[row][fld] = val
+					rec[fld] = val
+				self._records.markChanged(rec)
 			self._mementos = {}
+			# Restored values may include changed PKs.
+			self._invalidatePKIndex()
+			self._dropSeekIndexes()
 
 		else:
 			row = self.RowNumber
@@ -1881,17 +2379,16 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 				# We simply need to remove the row, and clear the memento and newrec flag.
 				self._clearMemento(row)
 				self._clearNewRecord(row)
-				recs = list(self._records)
-				del recs[recs.index(rec)]
-				self._records = dDataSet(recs)
-				if self.RowNumber >= self.RowCount:
-					self.RowNumber = self.RowCount - 1
+				self._removeRow(row)
 				return
 
 			# Not a new record: need to manually replace the old values:
 			for fld, val in self._mementos.get(recKey, {}).items():
-				self._records[row][fld] = val
+				rec[fld] = val
+			self._records.markChanged(rec)
 			self._clearMemento(row)
+			self._invalidatePKIndex()
+			self._dropSeekIndexes()
 
 
 	def delete(self, delRowNum=None):
@@ -1902,43 +2399,150 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		if delRowNum is None:
 			# assume that it is the current row that is to be deleted
 			delRowNum = self.RowNumber
+		self.deleteRows([delRowNum])
 
-		rec = self._records[delRowNum]
-		pk = self.pkExpression(rec)
-		if pk in self._newRecords:
-			res = True
-			del self._newRecords[pk]
+
+	def deleteRows(self, rows=None):
+		"""
+		Delete the passed rows, or all of the rows if 'rows' is None. The records
+		are deleted with as few 'delete ... where pk in (...)' statements as the
+		backend allows, and then removed from the data set in a single pass.
+		"""
+		if self.RowNumber < 0 or self.RowCount == 0:
+			# No query has been run yet
+			raise dException.NoRecordsException(_("No record to delete"))
+		self._fetchRemaining()
+		if rows is None:
+			rows = xrange(self.RowCount)
+		rows = set(rows)
+		if self._compoundKey:
+			keyFields = self.KeyField
 		else:
-			pkWhere = self.makePkWhere()
-			# some backends(PostgreSQL) don't return information about number of deleted rows
-			# try to fetch it before
-			sql = "select count(*) as cnt from %s where %s" % (self.Table, pkWhere)
-			aux = self.AuxCursor
-			aux.execute(sql)
-			res = aux.getFieldVal('cnt')
-			if res:
-				sql = "delete from %s where %s" % (self.Table, pkWhere)
-				aux.execute(sql)
-
-		if not res:
-			# Nothing was deleted
+			keyFields = (self.KeyField,)
+
+		keys = []
+		seen = set()
+		for row in rows:
+			rec = self._records[row]
+			pk = self.pkExpression(rec)
+			if pk in self._newRecords:
+				# Never saved, so there is nothing to delete in the database.
+				del self._newRecords[pk]
+				continue
+			mem = self._mementos.get(pk, {})
+			key = tuple([mem.get(fld, rec[fld]) for fld in keyFields])
+			if key not in seen:
+				seen.add(key)
+				keys.append(key)
+		if keys and self._deleteKeys(keys) < len(keys):
+			# Some of the records weren't deleted
 			self.BackendObject.noResultsOnDelete()
-		# The 'res' could be empty in multiuser environment and there is no concurrency
-		# control, so we delete the record from the current data set unconditionally.
-		if pk in self._mementos:
-			del self._mementos[pk]
-		self._removeRow(delRowNum)
+
+		# Records could be missing in multiuser environment and there is no concurrency
+		# control, so we delete the records from the current data set unconditionally.
+		for row in rows:
+			self._mementos.pop(self.pkExpression(self._records[row]), None)
+		if len(rows) == 1:
+			self._removeRow(rows.pop())
+		else:
+			self._removeRows(rows)
+
+
+	def _deleteKeys(self, keys):
+		"""
+		Delete the records whose PK values are in 'keys', a list of distinct
+		tuples with one value for each key field. Return the number of deleted
+		records, which is less than the number of keys if any weren't found.
+		"""
+		bo = self.BackendObject
+		aux = self.AuxCursor
+		aq = self.AutoQuoteNames
+		ph = self.ParamPlaceholder
+		tblPrefix = bo.getWhereTablePrefix(self.Table, autoQuote=aq)
+		if self._compoundKey:
+			match = "(%s)" % " AND ".join(["%s%s = %s" % (tblPrefix,
+					bo.encloseNames(fld, aq), ph) for fld in self.KeyField])
+		else:
+			pkField = tblPrefix + bo.encloseNames(self.KeyField, aq)
+		batchSize = bo.getDeleteBatchSize(len(keys[0]))
+		deleted = 0
+		for pos in xrange(0, len(keys), batchSize):
+			chunk = keys[pos:pos + batchSize]
+			params = tuple([val for key in chunk for val in key])
+			if self._compoundKey:
+				where = " OR ".join(len(chunk) * [match])
+			else:
+				where = "%s in (%s)" % (pkField, ", ".join(len(chunk) * [ph]))
+			if not bo.reliableRowCount:
+				# Count the records first, since the cursor can't tell us
+				# how many records were deleted.
+				aux.execute("select count(*) as cnt from %s where %s" % (self.Table, where),
+						params)
+				count = aux.getFieldVal("cnt")
+				if not count:
+					continue
+			aux.execute("delete from %s where %s" % (self.Table, where), params)
+			if bo.reliableRowCount:
+				count = aux.rowcount
+			deleted += count
+		return deleted
 
 
 	def _removeRow(self, row):
-		## Since record sets are tuples and thus immutable, we need to do this
-		## little dance to remove a row.
-		lRec = list(self._records)
-		del lRec[row]
-		self._records = dDataSet(lRec)
+		self._fetchRemaining()
+		records = self._records
+		lastRow = (row == len(records) - 1)
+		keepIndex = lastRow and self._pkIndex is not None \
+				and self._pkIndexStamp == self._recordsStamp() and not self._pkIndexHasDups
+		rec = records[row]
+		del records[row]
+		self._removeFromFilterSources(set([id(rec)]))
+		if keepIndex:
+			# Nothing followed the removed row, so only its key needs to go.
+			# Otherwise, the index is rebuilt when it's next needed.
+			try:
+				del self._pkIndex[self._recordKey(rec)]
+			except KeyError:
+				pass
+			self._pkIndexStamp = self._recordsStamp()
 		self.RowNumber = min(self.RowNumber, self.RowCount - 1)
 
 
+	def _removeRows(self, rows):
+		"""Remove the rows in the passed set from the data set in a single pass."""
+		self._fetchRemaining()
+		records = self._records
+		rowNum = self.RowNumber
+		self._removeFromFilterSources(set([id(records[row]) for row in rows]))
+		records[:] = [rec for row, rec in enumerate(records) if row not in rows]
+		# Stay on the same record, or on the one that followed it.
+		rowNum -= len([row for row in rows if row < rowNum])
+		self.RowNumber = min(rowNum, self.RowCount - 1)
+
+
+	def _filterSources(self):
+		"""
+		Return the record sets that the current, filtered one was derived from,
+		so that rows can be added to or removed from them as well. If one of them
+		can't be changed, the filters are dropped instead.
+		"""
+		ret = []
+		src = getattr(self._records, "_sourceDataSet", None)
+		while src is not None:
+			if not isinstance(src, dRecordList):
+				self._records._sourceDataSet = None
+				return []
+			ret.append(src)
+			src = src._sourceDataSet
+		return ret
+
+
+	def _removeFromFilterSources(self, recIds):
+		"""Remove the records whose ids are passed from the filter sources."""
+		for src in self._filterSources():
+			src[:] = [rec for rec in src if id(rec) not in recIds]
+
+
 	def flush(self):
 		"""
 		Some backends need to be prompted to flush changes
@@ -2038,6 +2642,40 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		self.__setNonUpdateFields()
 
 
+	def _stashRecords(self, keys):
+		"""
+		Return the records with the passed PKs, along with their mementos and
+		new record flags, so that _restoreRecords() can carry them over into
+		a new data set.
+		"""
+		stash = []
+		for pk in keys:
+			row, rec = self._getRecordByPk(pk, raiseRowNotFound=False)
+			if rec is not None:
+				stash.append((pk, rec, self._mementos.get(pk), pk in self._newRecords))
+		return stash
+
+
+	def _restoreRecords(self, stash):
+		"""
+		Put records saved by _stashRecords() back into the data set. A record
+		that is also in the new data set replaces its fresh copy; the others are
+		appended at the end.
+		"""
+		rows = [self._getRecordByPk(pk, raiseRowNotFound=False)[0]
+				for pk, rec, mem, isNew in stash]
+		records = self._records
+		for row, (pk, rec, mem, isNew) in zip(rows, stash):
+			if row is None:
+				records.append(rec)
+			else:
+				records[row] = rec
+			if mem is not None:
+				self._mementos[pk] = mem
+			if isNew:
+				self._newRecords[pk] = None
+
+
 	def getChangedRows(self, includeNewUnchanged=False):
 		"""Returns a list of rows with changes."""
 		chKeys = set(self._mementos)
@@ -2047,14 +2685,113 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		return map(self._getRowByPk, chKeys)
 
 
+	def _recordKey(self, rec, kf=None):
+		"""
+		Return the PK value of the passed record. For compound keys this is a
+		tuple of the key field values. Only the key fields are type-corrected,
+		so that records that haven't been accessed yet stay untouched.
+		"""
+		if kf is None:
+			kf = self.KeyField
+		if rec.get(kons.CURSOR_FIELD_TYPES_CORRECTED, False):
+			if isinstance(kf, tuple):
+				return tuple([rec[k] for k in kf])
+			return rec[kf]
+		_correctFieldType = self._correctFieldType
+		if isinstance(kf, tuple):
+			return tuple([_correctFieldType(rec[k], k) for k in kf])
+		return _correctFieldType(rec[kf], kf)
+
+
+	def _buildPKIndex(self):
+		"""
+		Create the dict that maps each PK value to its row number. When a PK
+		value appears more than once, the first row wins, which is consistent
+		with what a sequential scan would find.
+		"""
+		self._fetchRemaining()
+		idx = {}
+		hasDups = False
+		kf = self.KeyField
+		records = self._records
+		if kf:
+			recordKey = self._recordKey
+			try:
+				for row, rec in enumerate(records):
+					key = recordKey(rec, kf)
+					if key in idx:
+						hasDups = True
+					else:
+						idx[key] = row
+			except KeyError:
+				# The KeyField isn't present in the data set.
+				idx = {}
+		self._pkIndex = idx
+		self._pkIndexStamp = self._recordsStamp()
+		self._pkIndexHasDups = hasDups
+		return idx
+
+
+	def _recordsStamp(self):
+		"""
+		Return a value that identifies the current rows of the record set: it
+		changes when the record set is replaced, or when rows are added,
+		removed or moved in it. It doesn't reference the record set, so that
+		a replaced one can be freed; as dRecordList versions are never reused,
+		a new record set with the same id still gets another stamp.
+		"""
+		records = self._records
+		return (id(records), getattr(records, "_version", 0))
+
+
+	def _getPKIndex(self):
+		"""Return the PK index, rebuilding it if the record set has changed."""
+		idx = self._pkIndex
+		if idx is None or self._pkIndexStamp != self._recordsStamp():
+			idx = self._buildPKIndex()
+		return idx
+
+
+	def _invalidatePKIndex(self):
+		"""Force the PK index to be rebuilt the next time it is needed."""
+		self._pkIndex = None
+
+
+	def _updatePKIndex(self, row, oldKey, newKey):
+		"""Reflect the change of the PK value of the record at 'row' in the index."""
+		idx = self._pkIndex
+		if idx is None or self._pkIndexStamp != self._recordsStamp():
+			# Not built yet, or already stale; it will be rebuilt when needed.
+			return
+		if self._pkIndexHasDups:
+			# Another row may share the old key; don't try to figure it out.
+			self._pkIndex = None
+			return
+		if idx.get(oldKey) == row:
+			del idx[oldKey]
+		if idx.get(newKey, row) < row:
+			self._pkIndexHasDups = True
+		else:
+			if newKey in idx:
+				self._pkIndexHasDups = True
+			idx[newKey] = row
+
+
 	def _getRecordByPk(self, pk, raiseRowNotFound=True):
 		"""Find the record with the passed primary key; return (row, record)."""
 		kf = self.KeyField
 		if kf:
-			for idx, rec in enumerate(self._records):
-				key = self.getFieldVal(kf, row=idx)
-				if key == pk:
-					return (idx, rec)
+			if isinstance(pk, list):
+				pk = tuple(pk)
+			row = self._getPKIndex().get(pk)
+			if row is not None:
+				rec = self._records[row]
+				if self._recordKey(rec, kf) == pk:
+					return (row, rec)
+				# The record's key was changed behind our back; start over.
+				row = self._buildPKIndex().get(pk)
+				if row is not None:
+					return (row, self._records[row])
 		if raiseRowNotFound:
 			tbl, rc = self.Table, self.RowCount
 			raise dException.RowNotFoundException(_("PK '%(pk)s' not found in table '%(tbl)s' (RowCount: %(rc)s)") % locals())
@@ -2069,8 +2806,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def hasPK(self, pk):
 		"""Return True if the passed pk is present in the dataset."""
-		kf = self.KeyField
-		return bool([v[kf] for v in self._records if v[kf] == pk])
+		row, rec = self._getRecordByPk(pk, raiseRowNotFound=False)
+		return row is not None
 
 
 	def moveToPK(self, pk):
@@ -2139,6 +2876,7 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		arguments.
 		"""
 		ret = -1
+		self._fetchRemaining()
 		if fld is None:
 			# Default to the current sort order field
 			fld = self.sortColumn
@@ -2167,19 +2905,11 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		if badflds:
 			raise dException.FieldNotFoundException(_("Non-existent field(s) '%s'") % ", ".join(badflds))
 
-		# Copy the specified field vals and their row numbers to a list, and
-		# add those lists to the sort list
-		sortList = []
-		for row in xrange(0, self.RowCount):
-			if simpleKey:
-				rowval = self.getFieldVal(fld, row=row)
-			else:
-				rowval = tuple([self.getFieldVal(f, row=row) for f in flds])
-			sortList.append([rowval, row])
-
 		if simpleKey:
 			# Determine if we are seeking string values
-			field_type = self._types.get(fld, type(sortList[0][0]))
+			field_type = self._types.get(fld)
+			if field_type is None:
+				field_type = type(self.getFieldVal(fld, row=0))
 			compString = issubclass(field_type, basestring)
 		else:
 			compString = False
@@ -2204,57 +2934,46 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 				except ValueError:
 					val = float(0)
 
-		if sort:
-			if compString and not caseSensitive:
-				sortList.sort(key=caseInsensitiveSortKey)
-			else:
-				sortList.sort()
-
-		if compString and not caseSensitive:
-			# Change all of the first elements to lower case
-			def safeLower(val):
-				try:
-					return val.lower()
-				except AttributeError:
-					return val
-			searchList = [safeLower(first) for first, second in sortList]
-			try:
-				matchVal = val.lower()
-			except AttributeError:
-				# this is a string colum, but seeking a null value.
-				matchVal = val
+		caseless = compString and not caseSensitive
+		if caseless and isinstance(val, basestring):
+			matchVal = val.lower()
+		elif caseless and val is None:
+			# Null values sort as empty strings in case-insensitive searches.
+			matchVal = ""
 		else:
 			matchVal = val
-			searchList = [first for first, second in sortList]
 
-		# See if we have an exact match before we look for 'near' values
-		try:
-			idx = searchList.index(matchVal)
-			ret = sortList[idx][1]
-		except ValueError:
-			if near:
-				if incremental:
+		if not sort:
+			ret = self._seekUnsorted(flds, caseless, matchVal, near, incremental)
+		else:
+			keys, rows = self._getSeekIndex(tuple(flds), caseless)
+			numKeys = len(keys)
+			pos = bisect_left(keys, matchVal)
+			if pos < numKeys and keys[pos] == matchVal:
+				ret = rows[pos]
+			elif near:
+				if incremental and isinstance(matchVal, basestring):
 					# Match the next string only taking into account the first characters
 					# up to the length of matchStr (so that seeking for 'AB' will bring up
-					# 'AB-PC' instead of 'FW-PC'.
-
-					ret = len(sortList) - 1
-					for idx, testVal in enumerate(searchList):
-						if isinstance(testVal, basestring) and isinstance(matchVal, basestring):
-							if len(testVal) >= len(matchVal) and testVal[:len(matchVal)] == matchVal:
-								ret = sortList[idx][1]
-								break
-						elif not isinstance(matchVal, basestring) and testVal > matchVal:
-							ret = idx
-							break
+					# 'AB-PC' instead of 'FW-PC'. Since the keys are sorted, any such
+					# match starts at the insertion point.
+					ret = numKeys - 1
+					testVal = keys[pos] if pos < numKeys else None
+					if isinstance(testVal, basestring) and testVal.startswith(matchVal):
+						ret = rows[pos]
+				elif incremental:
+					# Find the first row greater than the match value
+					pos = bisect_right(keys, matchVal)
+					try:
+						ret = rows[pos]
+					except IndexError:
+						ret = numKeys - 1
 				else:
 					# Find the first row greater than the match value
-					numSmaller = len([testVal for testVal in searchList
-							if testVal < matchVal])
 					try:
-						ret = sortList[numSmaller][1]
+						ret = rows[pos]
 					except IndexError:
-						ret = len(sortList) - 1
+						ret = numKeys - 1
 
 		if movePointer and ret > -1:
 			# Move the record pointer
@@ -2262,6 +2981,97 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		return ret
 
 
+	def _seekKeys(self, flds, caseless):
+		"""Return a list of the seek values for each row, in row order."""
+		virtual = [fld for fld in flds if fld not in self._records[0]]
+		if virtual:
+			getFieldVal = self.getFieldVal
+			if len(flds) == 1:
+				vals = [getFieldVal(flds[0], row=row) for row in xrange(self.RowCount)]
+			else:
+				vals = [tuple([getFieldVal(fld, row=row) for fld in flds])
+						for row in xrange(self.RowCount)]
+		else:
+			_correctFieldTypesIfNeeded = self._correctFieldTypesIfNeeded
+			vals = []
+			append = vals.append
+			if len(flds) == 1:
+				fld = flds[0]
+				for rec in self._records:
+					_correctFieldTypesIfNeeded(rec)
+					append(rec[fld])
+			else:
+				for rec in self._records:
+					_correctFieldTypesIfNeeded(rec)
+					append(tuple([rec[fld] for fld in flds]))
+		if caseless:
+			vals = [(val or "").lower() for val in vals]
+		return vals
+
+
+	def _getSeekIndex(self, flds, caseless):
+		"""
+		Return a 2-tuple of parallel lists: the seek values for the passed
+		fields in sorted order, and the row number each value came from. Ties
+		are ordered by row number, so the first match is the lowest row.
+
+		Indexes are cached until the record set changes or one of their fields
+		is modified. Indexes on virtual fields are never cached, since their
+		values can depend on anything.
+		"""
+		stamp = self._recordsStamp()
+		if self._seekIndexStamp != stamp:
+			self._seekIndexes = {}
+			self._seekIndexStamp = stamp
+		cacheKey = (flds, caseless)
+		try:
+			return self._seekIndexes[cacheKey]
+		except KeyError:
+			pass
+		vals = self._seekKeys(flds, caseless)
+		order = sorted(xrange(len(vals)), key=vals.__getitem__)
+		ret = ([vals[row] for row in order], order)
+		if not [fld for fld in flds if fld in self.VirtualFields]:
+			self._seekIndexes[cacheKey] = ret
+		return ret
+
+
+	def _dropSeekIndexes(self, fld=None):
+		"""Discard the seek indexes that use 'fld', or all of them if fld is None."""
+		if fld is None:
+			self._seekIndexes = {}
+		else:
+			for cacheKey in self._seekIndexes.keys():
+				if fld in cacheKey[0]:
+					del self._seekIndexes[cacheKey]
+
+
+	def _seekUnsorted(self, flds, caseless, matchVal, near, incremental):
+		"""Implements seek() when sorting has been turned off."""
+		searchList = self._seekKeys(flds, caseless)
+		try:
+			return searchList.index(matchVal)
+		except ValueError:
+			pass
+		ret = -1
+		if near:
+			ret = len(searchList) - 1
+			if incremental:
+				for idx, testVal in enumerate(searchList):
+					if isinstance(testVal, basestring) and isinstance(matchVal, basestring):
+						if testVal.startswith(matchVal):
+							ret = idx
+							break
+					elif not isinstance(matchVal, basestring) and testVal > matchVal:
+						ret = idx
+						break
+			else:
+				numSmaller = len([testVal for testVal in searchList
+						if testVal < matchVal])
+				ret = min(numSmaller, ret)
+		return ret
+
+
 	def checkPK(self):
 		"""Verify that the field(s) specified in the KeyField prop exist."""
 		# First, make sure that there is *something* in the field
@@ -2293,7 +3103,7 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		bo = self.BackendObject
 		tblPrefix = bo.getWhereTablePrefix(self.Table,
 					autoQuote=self.AutoQuoteNames)
-		if not row:
+		if row is None:
 			row = self.RowNumber
 		rec = self._records[row]
 
@@ -2325,11 +3135,36 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		return "".join(ret)
 
 
-	def makeUpdClause(self, diff):
+	def _makePkWhereParams(self, row):
+		"""
+		Like makePkWhere(), but with param placeholders for the PK values.
+		Return a 2-tuple of the WHERE clause and the params.
+		"""
+		bo = self.BackendObject
+		aq = self.AutoQuoteNames
+		tblPrefix = bo.getWhereTablePrefix(self.Table, autoQuote=aq)
+		rec = self._records[row]
+		if self._compoundKey:
+			keyFields = self.KeyField
+		else:
+			keyFields = (self.KeyField,)
+		mem = self._mementos.get(self.pkExpression(rec), {})
+		clauses = []
+		params = []
+		for fld in keyFields:
+			clauses.append("%s%s = %s" % (tblPrefix, bo.encloseNames(fld, aq),
+					self.ParamPlaceholder))
+			params.append(mem.get(fld, rec[fld]))
+		return (" AND ".join(clauses), tuple(params))
+
+
+	def makeUpdClause(self, diff, fieldTypes=None):
 		"""
 		Create the 'set field=val' section of the Update statement. Return a 2-tuple
 		containing the sql portion as the first element, and the parameters for the
-		values as the second.
+		values as the second. The fields are in sorted order, so that the same
+		fields always give the same sql. 'fieldTypes' optionally maps the field
+		names to their type codes.
 		"""
 		retSql = []
 		retParams = []
@@ -2337,12 +3172,14 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		aq = self.AutoQuoteNames
 		tblPrefix = bo.getUpdateTablePrefix(self.Table, autoQuote=aq)
 		nonup = self.getNonUpdateFields()
-		for fld, val in diff.items():
+		if fieldTypes is None:
+			fieldTypes = self._getFieldTypeCodes()
+		for fld, val in sorted(diff.items()):
 			old_val, new_val = val
 			# Skip the fields that are not to be updated.
 			if fld in nonup:
 				continue
-			fieldType = [ds[1] for ds in self.DataStructure if ds[0] == fld][0]
+			fieldType = fieldTypes.get(fld)
 			val = new_val
 			if fieldType == "L" or (isinstance(val, basestring) and "\0" in val):
 				val = self.formatBLOB(val)
@@ -2445,6 +3282,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def beginTransaction(self):
 		"""Begin a SQL transaction."""
+		# Ending a transaction may discard the rows still pending on the server.
+		self._fetchRemaining()
 		ret = None
 		if self.BackendObject:
 			ret = self.BackendObject.beginTransaction(self.AuxCursor)
@@ -2453,6 +3292,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def commitTransaction(self):
 		"""Commit a SQL transaction."""
+		# Ending a transaction may discard the rows still pending on the server.
+		self._fetchRemaining()
 		ret = None
 		if self.BackendObject:
 			ret = self.BackendObject.commitTransaction(self.AuxCursor)
@@ -2461,6 +3302,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def rollbackTransaction(self):
 		"""Roll back (revert) a SQL transaction."""
+		# Ending a transaction may discard the rows still pending on the server.
+		self._fetchRemaining()
 		ret = None
 		if self.BackendObject:
 			ret = self.BackendObject.rollbackTransaction(self.AuxCursor)
@@ -2609,12 +3452,20 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def setChildFilter(self, fld):
 		"""This method sets the appropriate WHERE filter for dependent child queries."""
+		alias = self._getChildFilterAlias()
+		if not isinstance(fld, (list, tuple)):
+			fld = (fld,)
+		filtExpr = "and".join([" %s.%s = %s " % (alias, fldExpr, self.ParamPlaceholder)
+				for fldExpr in fld])
+		self.setChildFilterClause(filtExpr)
 
-		def getTableAlias(fromClause):
-			if not fromClause.strip():
-				return None
+
+	def _getChildFilterAlias(self):
+		"""Return the alias of the table that the child filter applies to."""
+		fromClause = self.sqlManager._fromClause
+		foundAlias = None
+		if fromClause.strip():
 			joinStrings = ["left join", "right join", "outer join", "inner join", "join"]
-			foundAlias = None
 			for joinString in joinStrings:
 				at = fromClause.lower().find(joinString)
 				if at >= 0:
@@ -2623,17 +3474,32 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			if not foundAlias:
 				# The alias is the last 'word' in the FROM clause
 				foundAlias = fromClause.strip().split()[-1]
-			return foundAlias
-
-		alias = getTableAlias(self.sqlManager._fromClause)
-		if not alias:
+		if not foundAlias:
 			# Use the old way (pre 2180) of using the Table (DataSource) property.
-			alias = self.Table
-		if not isinstance(fld, (list, tuple)):
-			fld = (fld,)
-		filtExpr = "and".join([" %s.%s = %s " % (alias, fldExpr, self.ParamPlaceholder)
-				for fldExpr in fld])
-		self.setChildFilterClause(filtExpr)
+			foundAlias = self.Table
+		return foundAlias
+
+
+	def getChildBlockSQL(self, fld, count):
+		"""
+		Return the SQL that selects the child records of 'count' parents at once.
+		Instead of the regular child filter, it matches the link field 'fld'
+		against a list of 'count' params, which come before those of the regular
+		SQL. There is no limit clause, since the limit is meant per parent.
+		"""
+		mgr = self.sqlManager
+		placeholders = ", ".join(count * [self.ParamPlaceholder])
+		filtExpr = " %s.%s in (%s) " % (self._getChildFilterAlias(), fld, placeholders)
+		holdChildFilter = mgr._childFilterClause
+		holdLimit = mgr._limitClause
+		try:
+			mgr._childFilterClause = mgr.BackendObject.setChildFilterClause(filtExpr)
+			mgr._limitClause = None
+			sql = mgr.getSQL()
+		finally:
+			mgr._childFilterClause = holdChildFilter
+			mgr._limitClause = holdLimit
+		return sql
 
 
 	def setNonMatchChildFilterClause(self):
@@ -2774,6 +3640,114 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 				whereClause, groupByClause, orderByClause, limitClause)
 
 
+	def getPageSQL(self, pageSize, offset=0, orderFields=None, afterValues=None,
+			descending=False):
+		"""
+		Return a 2-tuple of the SQL for a page of 'pageSize' rows, and the params
+		that it adds after those of the regular SQL. The rows are ordered on
+		'orderFields', which default to the KeyField.
+
+		If 'afterValues' is passed, the page starts right after the row that
+		has those values in the order fields (keyset paging). Otherwise,
+		'offset' rows are skipped, which requires a backend that supports it.
+		Order fields other than the key fields may hold NULLs, which are
+		placed where the backend sorts them. Order fields that are aliases in
+		the field clause are compared using the aliased expression.
+		"""
+		mgr = self.sqlManager
+		backend = mgr.BackendObject
+		kf = self.KeyField
+		if not isinstance(kf, tuple):
+			kf = (kf,)
+		if orderFields is None:
+			orderFields = kf
+		names = [backend.encloseNames(fld, autoQuote=self.AutoQuoteNames)
+				for fld in orderFields]
+		direction = "desc" if descending else "asc"
+		orderBy = ", ".join(["%s %s" % (name, direction) for name in names])
+
+		whereClause = mgr._whereClause
+		limitClause = pageSize
+		params = ()
+		if afterValues:
+			op = "<" if descending else ">"
+			# Whether NULLs come before the other values in this order
+			nullsBefore = (backend.nullsSortFirst != descending)
+			placeholder = self.ParamPlaceholder
+			terms = []
+			conds = []
+			condParams = ()
+			for fld, name, val in zip(orderFields, names, afterValues):
+				exp = self._getFieldExpression(fld) or name
+				nullable = fld not in kf
+				# The rows that come after the value in this field...
+				if val is None:
+					after = "%s is not null" % exp if nullsBefore else None
+					afterParams = ()
+				else:
+					after = "%s %s %s" % (exp, op, placeholder)
+					if nullable and not nullsBefore:
+						after = "(%s or %s is null)" % (after, exp)
+					afterParams = (val,)
+				if after is not None:
+					terms.append("(%s)" % " and ".join(conds + [after]))
+					params += condParams + afterParams
+				# ...and those that have the same value in it.
+				if val is None:
+					conds.append("%s is null" % exp)
+				else:
+					conds.append("%s = %s" % (exp, placeholder))
+					condParams += (val,)
+			keyset = "(%s)" % (" or ".join(terms) or "1 = 0")
+			if whereClause:
+				whereClause = "(%s) and %s" % (whereClause, keyset)
+			else:
+				whereClause = keyset
+		elif offset:
+			limitClause = backend.getOffsetLimitClause(pageSize, offset)
+			if limitClause is None:
+				raise dException.dException(
+						_("This backend can't skip rows; pages have to be visited in order."))
+
+		holdWhere = mgr._whereClause
+		holdOrderBy = mgr._orderByClause
+		holdLimit = mgr._limitClause
+		try:
+			mgr._whereClause = whereClause
+			mgr._orderByClause = orderBy
+			mgr._limitClause = limitClause
+			sql = mgr.getSQL()
+		finally:
+			mgr._whereClause = holdWhere
+			mgr._orderByClause = holdOrderBy
+			mgr._limitClause = holdLimit
+		return (sql, params)
+
+
+	def _getFieldExpression(self, fld):
+		"""
+		Return the expression that the field clause gives the alias 'fld', or
+		None if 'fld' isn't an alias in it.
+		"""
+		clause = self.sqlManager._fieldClause
+		items = []
+		depth = start = 0
+		for pos, char in enumerate(clause):
+			if char == "(":
+				depth += 1
+			elif char == ")":
+				depth -= 1
+			elif char == "," and not depth:
+				items.append(clause[start:pos])
+				start = pos + 1
+		items.append(clause[start:])
+		for item in items:
+			mtch = self._fieldAliasPat.match(item)
+			if mtch and mtch.group(2).strip("`\"[]") == fld:
+				return mtch.group(1)
+		return None
+
+
 	def getStructureOnlySql(self):
 		"""Creates a SQL statement that will not return any records."""
 		holdWhere = self.sqlManager._whereClause
@@ -2852,6 +3826,13 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		self._autoQuoteNames = self.AuxCursor._autoQuoteNames = val
 
 
+	def _getBulkTypeCorrection(self):
+		return self._bulkTypeCorrection
+
+	def _setBulkTypeCorrection(self, val):
+		self._bulkTypeCorrection = bool(val)
+
+
 	def _getAuxCursor(self):
 		isnew = self.__auxCursor is None
 		if isnew:
@@ -2880,8 +3861,10 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def _setBackendObject(self, obj):
 		self.__backend = obj
-		if obj and obj._cursor is None:
-			obj._cursor = self
+		if obj:
+			obj._cursors.add(self)
+			if obj._cursor is None:
+				obj._cursor = self
 		if self.__auxCursor:
 			self.__auxCursor.__backend = obj
 
@@ -2949,6 +3932,7 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 			val[idx] = (field_alias, field_type, field_pk, table_name, field_name, field_scale)
 			self._types[field_name] = dabo.db.getPythonType(field_type)
 		self._dataStructure = self.AuxCursor._dataStructure = tuple(val)
+		self._fieldScales = self.AuxCursor._fieldScales = None
 
 
 	def _getEncoding(self):
@@ -2958,6 +3942,13 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 		self.BackendObject.Encoding = val
 
 
+	def _getFetchSize(self):
+		return self._fetchSize
+
+	def _setFetchSize(self, val):
+		self._fetchSize = max(0, int(val or 0))
+
+
 	def _getIsAdding(self):
 		"""Return True if the current record is a new record."""
 		if self.RowCount <= 0:
@@ -3017,6 +4008,8 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 	def _getRowCount(self):
 		try:
+			if self._fetchPending:
+				return self._getPendingRowCount()
 			ret = len(self._records)
 		except AttributeError:
 			ret = 0
@@ -3024,15 +4017,19 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 
 
 	def _getRowNumber(self):
+		# The fetched records always include the current row, so this doesn't
+		# need the RowCount of a partly fetched result set.
 		try:
-			ret = min(self.__rownumber, self.RowCount - 1)
+			ret = min(self.__rownumber, len(self._records) - 1)
 		except AttributeError:
 			ret = -1
 		return ret
 
 
 	def _setRowNumber(self, num):
-		self.__rownumber = min(max(0, num), self.RowCount - 1)
+		if self._fetchPending:
+			self._fetchMore(num)
+		self.__rownumber = min(max(0, num), len(self._records) - 1)
 
 
 	def _getTable(self):
@@ -3086,6 +4083,11 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 	BackendObject = property(_getBackendObject, _setBackendObject, None,
 			_("Returns a reference to the object defining backend-specific behavior (dBackend)"))
 
+	BulkTypeCorrection = property(_getBulkTypeCorrection, _setBulkTypeCorrection, None,
+			_("""When True, the field values of each new result set are converted to
+			their DataStructure types column by column right after fetching. When
+			False (default), each record is converted when it's first accessed.  (bool)"""))
+
 	CurrentSQL = property(_getCurrentSQL, None, None,
 			_("Returns the current SQL that will be run, which is one of UserSQL or AutoSQL."))
 
@@ -3113,6 +4115,14 @@ xsi:noNamespaceSchemaLocation = "http://dabodev.com/schema/dabocursor.xsd">
 	FieldDescription = property(_getDescrip, None, None,
 			_("Tuple of field names and types, as returned by the backend  (tuple)"))
 
+	FetchSize = property(_getFetchSize, _setFetchSize, None,
+			_("""Number of rows of a result set that are fetched at once. The remaining
+			rows are fetched as they are accessed, and all of them are fetched
+			before the data set is sorted, searched, filtered or changed. RowCount
+			is obtained with a count query on the same statement. Best suited
+			to large, read-only result sets. Default is 0, which fetches all rows
+			right away.  (int)"""))
+
 	IsAdding = property(_getIsAdding, None, None,
 			_("Returns True if the current record is new and unsaved"))
 
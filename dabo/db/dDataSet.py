@@ -3,8 +3,10 @@ import sys
 import re
 import operator
 import datetime
-import hashlib
+import itertools
+import weakref
 
+from collections import OrderedDict
 from decimal import Decimal
 try:
 	from pysqlite2 import dbapi2 as sqlite
@@ -27,66 +29,420 @@ import dabo
 from dabo.dLocalize import _
 from dabo.lib.utils import ustr
 
+# Gives every data set the key of its tables in the query engine.
+_mirrorKeys = itertools.count(1)
+# Versions of the dRecordLists; see dRecordList
+_recordListVersions = itertools.count(1)
 
 
-class dDataSet(tuple):
-	""" This class assumes that its contents are not ordinary tuples, but
-	rather tuples consisting of dicts, where the dict keys are field names.
-	This is the data structure returned by the dCursorMixin class.
+def _dictFactory(cursor, row):
+	dd = {}
+	for idx, col in enumerate(cursor.description):
+		dd[col[0]] = row[idx]
+	return dd
 
-	It is used to give these data sets the ability to be queried, joined, etc.
-	This is accomplished by using SQLite in-memory databases. If SQLite
-	and pysqlite2 are not installed on the machine this is run on, a
-	warning message will be printed out and the SQL functions will return
-	None. The data will still be usable, though.
+
+class _DictCursor(sqlite.Cursor):
+	def __init__(self, *args, **kwargs):
+		sqlite.Cursor.__init__(self, *args, **kwargs)
+		self.row_factory = _dictFactory
+
+
+def _adapt_decimal(decVal):
+	"""Converts the decimal value to a string for storage"""
+	return ustr(decVal)
+
+
+def _convert_decimal(strVal):
+	"""This is a converter routine. Takes the string representation of a
+	Decimal value and return an actual decimal.
 	"""
-	def __init__(self, sequence=None):
-		# Note that as immutable objects, tuples are created with __new__,
-		# so we must not pass the argument to the __init__ method of tuple.
-		super(dDataSet, self).__init__()
+	return Decimal(strVal)
+
+
+sqlite.register_adapter(Decimal, _adapt_decimal)
+sqlite.register_converter("decimal", _convert_decimal)
+
+
+
+class _MirrorTable(object):
+	"""Bookkeeping for one SQLite table that mirrors the records of a data set."""
+	def __init__(self, name, fields, source):
+		# Name of the table while it isn't renamed to the alias it is queried by
+		self.name = name
+		# The alias the table is currently renamed to, or None
+		self.alias = None
+		# Field names, in the order of the table columns
+		self.fields = fields
+		self.fieldSet = frozenset(fields)
+		# The engine whose change log describes the mirrored records
+		self.source = source
+		# The source engine's version at the last synchronization
+		self.version = source.version
+		# id(record): rowid, and rowid: record. The second dict also keeps the
+		# records alive, so that their ids can't be reused by other objects.
+		# 'rowids' is None when records can't be told apart by identity.
+		self.rowids = {}
+		self.records = {}
+		self.nextRowid = 1
+		# Indexed columns
+		self.indexes = set()
+		# Set when a DML statement modified the table behind our back, or
+		# when the changes needed to bring it up to date were discarded.
+		self.dirty = False
+
+
+
+class _QueryEngine(object):
+	"""
+	SQLite in-memory database shared by a family of data sets: a data set
+	and the data sets derived from it by filtering, sorting, and adding or
+	removing rows. Each data set queried gets a table of its own, which is
+	renamed to the alias used in the query ('dataset', or the join aliases)
+	while it is in use. The least recently used tables are dropped once
+	there are more than maxTables.
+
+	Records are dicts that are modified in place, so the engine keeps a
+	version counter and notes the version at which each record was changed.
+	Re-synchronizing a table only needs to apply the rows that were added,
+	removed or changed since then. Changes are forgotten once every table
+	mirroring the family's records has applied them; tables that fall more
+	than maxChanges changes behind are rebuilt instead.
+	"""
+	# Tables with fewer rows than this don't get any indexes.
+	indexThreshold = 500
+	# Number of tables kept in the database.
+	maxTables = 8
+	# Number of record changes kept for tables that haven't applied them.
+	maxChanges = 10000
+
+	def __init__(self):
 		self._connection = None
+		self._cursor = None
+		self.encoding = None
+		self.version = 0
+		# id(record): version of the last change
+		self._changes = {}
+		# Set when records from this family are mirrored anywhere.
+		self.tracking = False
+		# The tables, in any engine, that mirror records of this family.
+		self._mirrors = weakref.WeakSet()
+		# (alias, mirror key of the data set): table, least recently used first
+		self._tables = OrderedDict()
+		# alias: the table currently renamed to it
+		self._active = {}
+		self._tableCount = 0
+
+
+	def markChanged(self, rec):
+		"""Record that the passed record was modified in place."""
+		if self.tracking:
+			self.version += 1
+			self._changes[id(rec)] = self.version
+			if len(self._changes) > self.maxChanges:
+				self.pruneChanges()
+
+
+	def pruneChanges(self):
+		"""
+		Forget the changes that all of the tables mirroring this family's
+		records have applied. If more than half of maxChanges would still be
+		kept, the tables that need them are rebuilt on their next sync instead.
+		"""
+		if not self._changes:
+			return
+		mirrors = [tbl for tbl in self._mirrors if not tbl.dirty]
+		if not mirrors:
+			self._changes = {}
+			self.tracking = bool(self._mirrors)
+			return
+		oldest = min([tbl.version for tbl in mirrors])
+		if oldest >= self.version:
+			self._changes = {}
+			return
+		changes = dict([(recId, ver) for recId, ver in self._changes.iteritems()
+				if ver > oldest])
+		if len(changes) > self.maxChanges // 2:
+			for tbl in mirrors:
+				if tbl.version < self.version:
+					tbl.dirty = True
+			changes = {}
+		self._changes = changes
+
+
+	def _getCursor(self):
+		if self._connection is None:
+			self._connection = sqlite.connect(":memory:",
+					detect_types=(sqlite.PARSE_DECLTYPES | sqlite.PARSE_COLNAMES),
+					isolation_level="EXCLUSIVE")
+			self.encoding = self._connection.execute("PRAGMA encoding"). \
+					fetchone()[0].lower()
+			self._connection.text_factory = str
+			self._cursor = self._connection.cursor(factory=_DictCursor)
+		return self._cursor
+
+
+	def _rowValues(self, rowid, rec, fields):
+		vals = [rowid]
+		vals.extend([rec.get(fld) for fld in fields])
+		return vals
+
+
+	def _tableName(self, tbl):
+		"""Return the name the table currently has in the database."""
+		return tbl.alias or tbl.name
+
+
+	def _createTable(self, ds, key):
+		"""(Re)create the table for 'key' and fill it with all of the records."""
+		crs = self._getCursor()
+		old = self._tables.pop(key, None)
+		if old is not None:
+			self._dropTable(old)
+		self._tableCount += 1
+		name = "dabo_mirror_%s" % self._tableCount
+		crs.execute(ds._makeCreateTable(ds, name))
+		fields = ds[0].keys()
+		source = ds._engine
+		source.tracking = True
+		tbl = self._tables[key] = _MirrorTable(name, fields, source)
+		source._mirrors.add(tbl)
+		rowids, records = tbl.rowids, tbl.records
+		for rowid, rec in enumerate(ds, 1):
+			rowids[id(rec)] = rowid
+			records[rowid] = rec
+		tbl.nextRowid = len(ds) + 1
+		if len(rowids) != len(ds):
+			# The same record appears more than once.
+			tbl.rowids = None
+		insStmnt = self._insertStatement(name, fields)
+		rowValues = self._rowValues
+		crs.executemany(insStmnt, (rowValues(rowid, rec, fields)
+				for rowid, rec in enumerate(ds, 1)))
+		return tbl
+
+
+	def _dropTable(self, tbl):
+		self._getCursor().execute("drop table if exists %s" % self._tableName(tbl))
+		if tbl.alias is not None and self._active.get(tbl.alias) is tbl:
+			del self._active[tbl.alias]
+		tbl.alias = None
+		tbl.source._mirrors.discard(tbl)
+
+
+	def _activate(self, tbl, alias):
+		"""Rename the table to the alias that queries use for it."""
+		current = self._active.get(alias)
+		if current is tbl:
+			return
+		crs = self._getCursor()
+		if current is not None:
+			crs.execute("alter table %s rename to %s" % (alias, current.name))
+			current.alias = None
+		crs.execute("alter table %s rename to %s" % (tbl.name, alias))
+		tbl.alias = alias
+		self._active[alias] = tbl
+
+
+	def _evictTables(self):
+		"""Drop the least recently used tables that aren't in use by an alias."""
+		excess = len(self._tables) - self.maxTables
+		if excess <= 0:
+			return
+		for key, tbl in self._tables.items():
+			if tbl.alias is None:
+				del self._tables[key]
+				self._dropTable(tbl)
+				excess -= 1
+				if not excess:
+					break
+
+
+	def _insertStatement(self, tableName, fields):
+		# Fields may contain illegal names. This will correct them
+		flds = [fld.replace("dabo-", "dabo_") for fld in fields]
+		return "insert into %s (_rowid_, %s) values (%s)" % (tableName,
+				", ".join(flds), ", ".join(["?"] * (len(flds) + 1)))
+
+
+	def sync(self, ds, alias):
+		"""Make the table for 'alias' reflect the current contents of 'ds'."""
+		key = (alias, ds._mirrorKey)
+		tbl = self._tables.pop(key, None)
+		if tbl is not None:
+			# Keep the most recently used tables last.
+			self._tables[key] = tbl
+		if (tbl is None or tbl.dirty or tbl.rowids is None
+				or tbl.source is not ds._engine or tbl.fieldSet != frozenset(ds[0])
+				or not self._update(tbl, ds)):
+			tbl = self._createTable(ds, key)
+		self._activate(tbl, alias)
+		self._evictTables()
+		tbl.source.pruneChanges()
+		return tbl
+
+
+	def _update(self, tbl, ds):
+		"""
+		Apply the rows added, removed and changed since the table was last
+		synchronized. Return False if the table has to be rebuilt instead.
+		"""
+		current = dict((id(rec), rec) for rec in ds)
+		if len(current) != len(ds):
+			return False
+		crs = self._getCursor()
+		tableName = self._tableName(tbl)
+		rowids, records, fields = tbl.rowids, tbl.records, tbl.fields
+
+		gone = [recId for recId in rowids if recId not in current]
+		if gone:
+			delRows = [(rowids.pop(recId),) for recId in gone]
+			for (rowid,) in delRows:
+				del records[rowid]
+			crs.executemany("delete from %s where _rowid_ = ?" % tableName, delRows)
+
+		source = tbl.source
+		if source.version > tbl.version:
+			since = tbl.version
+			changed = [rowids[recId] for recId, ver in source._changes.iteritems()
+					if ver > since and recId in rowids]
+			if changed:
+				setClause = ", ".join(["%s = ?" % fld.replace("dabo-", "dabo_")
+						for fld in fields])
+				updStmnt = "update %s set %s where _rowid_ = ?" % (tableName, setClause)
+				rowValues = self._rowValues
+				updRows = []
+				for rowid in changed:
+					vals = rowValues(rowid, records[rowid], fields)
+					vals.append(vals.pop(0))
+					updRows.append(vals)
+				crs.executemany(updStmnt, updRows)
+
+		# Keep the rowids of new records in data set order.
+		added = [rec for rec in ds if id(rec) not in rowids]
+		if added:
+			insRows = []
+			rowValues = self._rowValues
+			for rec in added:
+				rowid = tbl.nextRowid
+				tbl.nextRowid += 1
+				rowids[id(rec)] = rowid
+				records[rowid] = rec
+				insRows.append(rowValues(rowid, rec, fields))
+			crs.executemany(self._insertStatement(tableName, fields), insRows)
+		tbl.version = source.version
+		return True
+
+
+	def addIndexes(self, alias, cols, nocase=False):
+		"""Index the passed columns of the table for 'alias', if worthwhile."""
+		tbl = self._active.get(alias)
+		if tbl is None or len(tbl.records) < self.indexThreshold:
+			return
+		collate = ""
+		if nocase:
+			collate = " collate nocase"
+		crs = self._getCursor()
+		for col in cols:
+			col = col.replace("dabo-", "dabo_")
+			if col not in tbl.fieldSet or (col, nocase) in tbl.indexes:
+				continue
+			crs.execute("create index %s_%s_%s on %s (%s%s)" % (tbl.name, col,
+					("nc" if nocase else "cs"), alias, col, collate))
+			tbl.indexes.add((col, nocase))
+
+
+	def execute(self, sqlExpr, params=()):
+		crs = self._getCursor()
+		crs.execute(sqlExpr, params)
+		return crs
+
+
+	def markDirty(self, alias):
+		"""Flag the table in use by the alias as no longer reflecting its data set."""
+		try:
+			self._active[alias].dirty = True
+		except KeyError:
+			pass
+
+
+	def recordsForRowids(self, alias, rowids):
+		"""
+		Return the records for the passed rowids, or None if records can't be
+		identified by their rowids.
+		"""
+		tbl = self._active.get(alias)
+		if tbl is None or tbl.rowids is None:
+			return None
+		records = tbl.records
+		return [records[rowid] for rowid in rowids]
+
+
+
+class _DataSetMixin(object):
+	"""
+	The query API shared by the immutable dDataSet and the mutable
+	dRecordList. The concrete classes supply the sequence behavior.
+	"""
+	_typeDict = {int: "integer", long: "integer", str: "text",
+			unicode: "text", float: "real", datetime.date: "date",
+			datetime.datetime: "timestamp", Decimal: "decimal"}
+
+	# Patterns for finding the columns worth indexing in a query.
+	_whereClausePat = re.compile(r"\bwhere\b(.*?)(?:\bgroup\s+by\b|\border\s+by\b|\blimit\b|$)",
+			re.I | re.S)
+	_orderByClausePat = re.compile(r"\border\s+by\b(.*?)(?:\blimit\b|$)", re.I | re.S)
+	_wordPat = re.compile(r"[A-Za-z_][\w-]*")
+
+	def _initDataSet(self, sequence):
 		self._cursor = None
 		self._bizobj = None
-		self._populated = False
 		self._typeStructure = {}
 		# We may need to encode fields that are not legal names.
 		self.fieldAliases = {}
-		# Keep a hash value to tell if we need to re-populate
-		self._dataHash = ""
-
-		sqlite.register_adapter(Decimal, self._adapt_decimal)
 		# When filtering datasets, we need a reference to the dataset
 		# this dataset was derived from.
 		self._sourceDataSet = None
+		self._mirrorKey = _mirrorKeys.next()
+		# Data sets that wrap another data set belong to its family.
+		if isinstance(sequence, _DataSetMixin):
+			self._engine = sequence._engine
+		else:
+			self._engine = _QueryEngine()
 
-		# Register the converters
-		sqlite.register_converter("decimal", self._convert_decimal)
-
-		self._typeDict = {int: "integer", long: "integer", str: "text",
-				unicode: "text", float: "real", datetime.date: "date",
-				datetime.datetime: "timestamp", Decimal: "decimal"}
 
+	def __getstate__(self):
+		# The query engine holds a SQLite connection, which can't be pickled.
+		ret = self.__dict__.copy()
+		ret.pop("_engine", None)
+		return ret
 
 
-	def __del__(self):
-		if self._cursor is not None:
-			self._cursor.close()
-		if self._connection is not None:
-			self._connection.close()
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		self._mirrorKey = _mirrorKeys.next()
+		self._engine = _QueryEngine()
 
 
-	def __add__(self, *args, **kwargs):
-		return dDataSet(super(dDataSet, self).__add__(*args, **kwargs))
+	def _derive(self, sequence):
+		"""Return a new data set with the passed records that shares this one's engine."""
+		ret = self.__class__(sequence)
+		ret._engine = self._engine
+		return ret
 
 
-	def __mul__(self, *args, **kwargs):
-		return dDataSet(super(dDataSet, self).__mul__(*args, **kwargs))
+	def markChanged(self, rec):
+		"""
+		Notify the data set that the passed record was modified in place,
+		so that the next query picks up the change.
+		"""
+		self._engine.markChanged(rec)
 
 
 	@staticmethod
 	def _adapt_decimal(decVal):
 		"""Converts the decimal value to a string for storage"""
-		return ustr(decVal)
+		return _adapt_decimal(decVal)
 
 
 	@staticmethod
@@ -94,7 +450,7 @@ class dDataSet(tuple):
 		"""This is a converter routine. Takes the string representation of a
 		Decimal value and return an actual decimal.
 		"""
-		return Decimal(strVal)
+		return _convert_decimal(strVal)
 
 
 	def _index(self, rec):
@@ -122,18 +478,19 @@ class dDataSet(tuple):
 				literal = False
 				valOrExpr = valOrExpr.replace("=", "", 1)
 			valOrExpr = self._fldReplace(valOrExpr, "rec")
+		markChanged = self._engine.markChanged
 		if literal:
 			upDict = {field: valOrExpr}
-			if scope is None:
-				[rec.update(upDict) for rec in self]
-			else:
-				[rec.update(upDict) for rec in self
-						if eval(scope)]
+			for rec in self:
+				if scope is None or eval(scope):
+					rec.update(upDict)
+					markChanged(rec)
 		else:
 			# Need to go record-by-record so that the expression evaluates correctly
 			for rec in self:
-				if eval(scope):
+				if scope is None or eval(scope):
 					rec[field] = eval(valOrExpr)
+					markChanged(rec)
 
 
 	def sort(self, col, ascdesc=None, caseSensitive=None):
@@ -143,9 +500,21 @@ class dDataSet(tuple):
 		if caseSensitive is False:
 			# The default of None will be case-sensitive
 			casecollate = " COLLATE NOCASE "
-		stmnt = "select * from dataset order by %s %s %s"
+		if not self:
+			return self
+		engine = self._engine
+		engine.sync(self, "dataset")
+		engine.addIndexes("dataset", [col], nocase=bool(casecollate))
+		stmnt = "select _rowid_ as dabo_rowid from dataset order by %s %s %s"
 		stmnt = stmnt % (col, casecollate, ascdesc)
-		ret = self.execute(stmnt)
+		rowids = [rec["dabo_rowid"] for rec in engine.execute(stmnt).fetchall()]
+		recs = engine.recordsForRowids("dataset", rowids)
+		if recs is None:
+			ret = self.execute("select * from dataset order by %s %s %s"
+					% (col, casecollate, ascdesc))
+		else:
+			# Return copies, like the query above does.
+			ret = self._derive([rec.copy() for rec in recs])
 		# Sorting doesn't change the data, so preserve any source dataset.
 		ret._sourceDataSet = self._sourceDataSet
 		return ret
@@ -197,7 +566,7 @@ class dDataSet(tuple):
 			filtered = [rec for rec in self if (rec[fld] or "").endswith(expr)]
 		elif op == "contains":
 			filtered = [rec for rec in self if expr in (rec[fld] or "")]
-		ret = self.__class__(filtered)
+		ret = self._derive(filtered)
 		ret._sourceDataSet = self
 		ret._filtered_fld = fld
 		ret._filtered_expr = expr
@@ -212,7 +581,7 @@ class dDataSet(tuple):
 			return self
 		stmnt = """ [rec for rec in self if %s] """ % self._fldReplace(expr, "rec")
 		recs = eval(stmnt)
-		ret = self.__class__(recs)
+		ret = self._derive(recs)
 		ret._sourceDataSet = self
 		return ret
 
@@ -296,6 +665,7 @@ class dDataSet(tuple):
 	def _populate(self, ds, alias=None):
 		"""This is the method that converts a Python dataset
 		into a SQLite table with the name specified by 'alias'.
+		Only the changes since the previous call are applied.
 		"""
 		if alias is None:
 			# Use the default
@@ -305,31 +675,17 @@ class dDataSet(tuple):
 			dabo.log.info(_("Cannot populate without data for alias '%s'")
 					% alias)
 			return None
-		hs = hashlib.md5(ustr(ds)).hexdigest()
-		if hs == ds._dataHash:
-			# Data's already there and hasn't changed; no need to re-load it
-			return
-		ds._dataHash = hs
-		if ds._populated:
-			# Clear out the old records
-			self._cursor.execute("delete from %s" % alias)
-		else:
-			# Create the table
-			self._cursor.execute(self._makeCreateTable(ds, alias))
-
-		# Fields may contain illegal names. This will correct them
-		flds = [fld.replace("dabo-", "dabo_") for fld in ds[0]]
-		fldParams = [":%s" % fld for fld in flds]
-		insStmnt = "insert into %s (%s) values (%s)" % (alias,
-				", ".join(flds), ", ".join(fldParams))
+		return self._engine.sync(ds, alias)
 
-		def recGenerator(ds):
-			for rec in ds:
-				yield rec
 
-		self._cursor.executemany(insStmnt, recGenerator(ds))
-		if ds is self:
-			self._populated = True
+	def _indexColumns(self, sqlExpr):
+		"""Return the words in the WHERE and ORDER BY clauses of the statement."""
+		ret = set()
+		for pat in (self._whereClausePat, self._orderByClausePat):
+			mtch = pat.search(sqlExpr)
+			if mtch:
+				ret.update(self._wordPat.findall(mtch.group(1)))
+		return ret
 
 
 	def execute(self, sqlExpr, params=(), cursorDict=None):
@@ -347,80 +703,46 @@ class dDataSet(tuple):
 		additional DataSet objects in a dictionary, where the value is the
 		DataSet, and the key is the alias used to reference that DataSet
 		in your join statement.
-		"""
-		def dict_factory(cursor, row):
-			dd = {}
-			for idx, col in enumerate(cursor.description):
-				dd[col[0]] = row[idx]
-			return dd
-
-		class DictCursor(sqlite.Cursor):
-			def __init__(self, *args, **kwargs):
-				sqlite.Cursor.__init__(self, *args, **kwargs)
-				self.row_factory = dict_factory
-
-		if self._connection is None:
-			self._connection = sqlite.connect(":memory:",
-					detect_types=(sqlite.PARSE_DECLTYPES | sqlite.PARSE_COLNAMES),
-					isolation_level="EXCLUSIVE")
-			if not hasattr(self, "_encoding"):
-				self._encoding = self._connection.execute("PRAGMA encoding"). \
-						fetchone()[0].lower()
-			self._connection.text_factory = str
-		if self._cursor is None:
-			self._cursor = self._connection.cursor(factory=DictCursor)
-
-# 		import time
-# 		st = time.clock()
-# 		print "starting"
 
+		The order of the rows returned by a statement without an ORDER BY
+		clause is not guaranteed.
+		"""
 		# Create the table for this dDataSet
-		self._populate(self, "dataset")
-		if not self._populated:
+		if self._populate(self, "dataset") is None:
 			# No data in the dataset
 			return None
+		engine = self._engine
+		if not hasattr(self, "_encoding"):
+			self._encoding = engine.encoding
 
-# 		pt = time.clock()
-# 		print "POPULATED", pt-st
 		# Now create any of the tables for the join dDataSets
+		aliases = ["dataset"]
 		if cursorDict is not None:
 			for alias, ds in cursorDict.items():
 				self._populate(ds, alias)
+				aliases.append(alias)
+
+		isSelect = sqlExpr.lower().strip().startswith("select ")
+		if isSelect:
+			indexCols = self._indexColumns(sqlExpr)
+			if indexCols:
+				for alias in aliases:
+					engine.addIndexes(alias, indexCols)
 
 		# We have a table now with the necessary data. Run the query!
 		if params and not isinstance(params, tuple):
 			params = (params,)
-		self._cursor.execute(sqlExpr, params)
+		crs = engine.execute(sqlExpr, params)
 
-# 		et = time.clock()
-# 		print "EXECUTED", et - pt
 		# We need to know what sort of statement was run. Only a 'select'
 		# will return results. The rest ('update', 'delete', 'insert') return
 		# nothing. In those cases, we need to run a 'select *' to get the
 		# modified data set.
-		if not sqlExpr.lower().strip().startswith("select "):
-			self._cursor.execute("select * from dataset")
-		tmpres = self._cursor.fetchall()
-
-# 		ft = time.clock()
-# 		print "FETCH", ft-et
-		return dDataSet(tmpres)
-
-# 		res = []
-# 		if tmpres:
-# 			# There will be no description if there are no records.
-# 			dscrp = [fld[0] for fld in self._cursor.description]
-# 			for tmprec in tmpres:
-# 				rec = {}
-# 				for pos, val in enumerate(tmprec):
-# 					fld = dscrp[pos]
-# 					if self.fieldAliases.has_key(fld):
-# 						fld = self.fieldAliases[fld]
-# 					rec[fld] = val
-# 				res.append(rec)
-#
-# 		dt = time.clock()
-# 		print "CONVERTED", dt-ft
+		if not isSelect:
+			# The table no longer mirrors the data set.
+			engine.markDirty("dataset")
+			crs.execute("select * from dataset")
+		return dDataSet(crs.fetchall())
 
 
 	def _getBizobj(self):
@@ -478,6 +800,136 @@ class dDataSet(tuple):
 
 
 
+class dDataSet(_DataSetMixin, tuple):
+	""" This class assumes that its contents are not ordinary tuples, but
+	rather tuples consisting of dicts, where the dict keys are field names.
+	This is the data structure returned by the dCursorMixin class.
+
+	It is used to give these data sets the ability to be queried, joined, etc.
+	This is accomplished by using SQLite in-memory databases. If SQLite
+	and pysqlite2 are not installed on the machine this is run on, a
+	warning message will be printed out and the SQL functions will return
+	None. The data will still be usable, though.
+
+	Data sets that are derived from one another share a single in-memory
+	database, which is updated incrementally. Code that modifies records
+	in place must call markChanged() for those records, or the changes will
+	not be visible to subsequent queries.
+	"""
+	def __init__(self, sequence=None):
+		# Note that as immutable objects, tuples are created with __new__,
+		# so we must not pass the argument to the __init__ method of tuple.
+		super(dDataSet, self).__init__()
+		self._initDataSet(sequence)
+
+
+	def __add__(self, *args, **kwargs):
+		return self._derive(tuple.__add__(self, *args, **kwargs))
+
+
+	def __mul__(self, *args, **kwargs):
+		return self._derive(tuple.__mul__(self, *args, **kwargs))
+
+
+
+class dRecordList(_DataSetMixin, list):
+	"""
+	Mutable, list-backed version of dDataSet, used by dCursorMixin to store
+	its records so that rows can be added, removed and reordered in place.
+	It has the same query API as dDataSet. Note that sort() is the data set
+	sort, which returns a new sorted data set, and not list.sort().
+
+	The version is changed by every change to the rows in the list (not to the
+	contents of the records), so that code that caches information about row
+	positions can tell whether it is stale. Versions are never reused, not even
+	by another list, so (id(list), version) identifies the rows without keeping
+	the list alive.
+	"""
+	# Class default, since unpickling appends rows before restoring the state.
+	_version = 0
+
+	def __init__(self, sequence=None):
+		if sequence is None:
+			sequence = ()
+		list.__init__(self, sequence)
+		self._initDataSet(sequence)
+		self._version = _recordListVersions.next()
+
+
+	def __setstate__(self, state):
+		super(dRecordList, self).__setstate__(state)
+		self._version = _recordListVersions.next()
+
+
+	def __add__(self, *args, **kwargs):
+		return self._derive(list.__add__(self, *args, **kwargs))
+
+
+	def __mul__(self, *args, **kwargs):
+		return self._derive(list.__mul__(self, *args, **kwargs))
+
+
+	def __iadd__(self, other):
+		self._version = _recordListVersions.next()
+		return list.__iadd__(self, other)
+
+
+	def __imul__(self, other):
+		self._version = _recordListVersions.next()
+		return list.__imul__(self, other)
+
+
+	def __setitem__(self, idx, val):
+		self._version = _recordListVersions.next()
+		list.__setitem__(self, idx, val)
+
+
+	def __delitem__(self, idx):
+		self._version = _recordListVersions.next()
+		list.__delitem__(self, idx)
+
+
+	def __setslice__(self, i, j, seq):
+		self._version = _recordListVersions.next()
+		list.__setslice__(self, i, j, seq)
+
+
+	def __delslice__(self, i, j):
+		self._version = _recordListVersions.next()
+		list.__delslice__(self, i, j)
+
+
+	def append(self, rec):
+		self._version = _recordListVersions.next()
+		list.append(self, rec)
+
+
+	def extend(self, seq):
+		self._version = _recordListVersions.next()
+		list.extend(self, seq)
+
+
+	def insert(self, idx, rec):
+		self._version = _recordListVersions.next()
+		list.insert(self, idx, rec)
+
+
+	def pop(self, *args):
+		self._version = _recordListVersions.next()
+		return list.pop(self, *args)
+
+
+	def remove(self, rec):
+		self._version = _recordListVersions.next()
+		list.remove(self, rec)
+
+
+	def reverse(self):
+		self._version = _recordListVersions.next()
+		list.reverse(self)
+
+
+
 # class DataSetOld(tuple):
 # 	""" This class assumes that its contents are not ordinary tuples, but
 # 	rather tuples consisting of dicts, where the dict keys are field names.
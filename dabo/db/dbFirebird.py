@@ -15,6 +15,7 @@ class Firebird(dBackend):
 	# if you need quotes for spaces and bad names, you'll have to supply
 	# them yourself.
 	nameEnclosureChar = ""
+	keepAliveSQL = "select 1 from rdb$database"
 
 	def __init__(self):
 		dBackend.__init__(self)
@@ -237,6 +238,14 @@ class Firebird(dBackend):
 		return "first"
 
 
+	def getLimitPosition(self):
+		return "top"
+
+
+	def getOffsetLimitClause(self, limit, offset):
+		return "%s skip %s" % (limit, offset)
+
+
 	def formSQL(self, fieldClause, fromClause, joinClause,
 				whereClause, groupByClause, orderByClause, limitClause):
 		"""Firebird wants the limit clause before the field clause."""
@@ -63,6 +63,12 @@ class MSSQL(dBackend):
 						for key in range(len(row) / 2):
 							row.pop(key, None)
 					return rows
+				def fetchmany(self, size=None):
+					rows = super(ConCursor, self).fetchmany(size)
+					for row in rows:
+						for key in range(len(row) / 2):
+							row.pop(key, None)
+					return rows
 		else:
 			class ConCursor(self.dbapi.pymssqlCursor):
 				def __init__(self, *args, **kwargs):
@@ -261,6 +267,15 @@ select kc.COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE as kc
 		return "TOP"
 
 
+	def getLimitPosition(self):
+		return "top"
+
+
+	def getOffsetLimitClause(self, limit, offset):
+		"""TOP can't skip rows."""
+		return None
+
+
 	def formSQL(self, fieldClause, fromClause, joinClause,
 				whereClause, groupByClause, orderByClause, limitClause):
 		"""MS SQL wants the limit clause before the field clause."""
@@ -270,6 +285,16 @@ select kc.COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE as kc
 		return sql
 
 
+	def getDeleteBatchSize(self, keyCount):
+		"""SQL Server allows up to 2100 parameters in a statement."""
+		return max(1, 2000 // max(keyCount, 1))
+
+
+	def getInListBatchSize(self, paramCount=0):
+		"""SQL Server allows up to 2100 parameters in a statement."""
+		return max(1, 2000 - paramCount)
+
+
 	def getLastInsertID(self, cursor):
 		"""
 		Pymssql does not populate the 'lastrowid' attribute of the cursor, so we
@@ -24,6 +24,7 @@ class MySQL(dBackend):
 
 	# MySQL uses the backtick to enclose names with spaces.
 	nameEnclosureChar = "`"
+	reliableRowCount = True
 
 	def __init__(self):
 		dBackend.__init__(self)
@@ -128,6 +129,19 @@ class MySQL(dBackend):
 		return "%s%s%s" % (sqt, val, sqt)
 
 
+	def getInsertBatchSize(self, columnCount):
+		"""Keep multi-row inserts well below the default max_allowed_packet."""
+		return 1000
+
+
+	def getDeleteBatchSize(self, keyCount):
+		return max(1, 1000 // max(keyCount, 1))
+
+
+	def getInListBatchSize(self, paramCount=0):
+		return max(1, 1000 - paramCount)
+
+
 	def _isExistingTable(self, tablename, cursor):
 		tbl = self.encloseNames(self.escQuote(tablename))
 		cursor.execute("SHOW TABLES LIKE %s" % tbl)
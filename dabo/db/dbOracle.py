@@ -12,6 +12,9 @@ from dabo.lib.utils import ustr
 
 
 class Oracle(dBackend):
+	keepAliveSQL = "select 1 from dual"
+	nullsSortFirst = False
+
 	def __init__(self):
 		import cx_Oracle as dbapi
 		dBackend.__init__(self)
@@ -132,6 +135,11 @@ class Oracle(dBackend):
 		return "rownum <="
 
 
+	def getOffsetLimitClause(self, limit, offset):
+		"""A rownum condition can't skip rows."""
+		return None
+
+
 	def formSQL(self, fieldClause, fromClause, joinClause,
 				whereClause, groupByClause, orderByClause, limitClause):
 		""" Oracle wants the limit clause as where clause. """
@@ -11,6 +11,9 @@ from dabo.lib.utils import ustr
 
 class Postgres(dBackend):
 	"""Class providing PostgreSQL connectivity. Uses psycopg."""
+	batchInsertIDs = True
+	reliableRowCount = True
+	nullsSortFirst = False
 
 
 	_encodings = {
@@ -223,6 +226,27 @@ class Postgres(dBackend):
 		dabo.dbActivityLog.info("SQL: Commit")
 
 
+	def getInsertReturning(self, cursor):
+		return " returning %s" % self.encloseNames(cursor.KeyField, cursor.AutoQuoteNames)
+
+
+	def getLastInsertIDs(self, cursor, rowCount):
+		"""The PKs come from the 'returning' clause of the insert."""
+		return [row[0] for row in cursor.fetchall()]
+
+
+	def getInsertBatchSize(self, columnCount):
+		return max(1, min(1000, 32767 // max(columnCount, 1)))
+
+
+	def getDeleteBatchSize(self, keyCount):
+		return max(1, min(1000, 32767 // max(keyCount, 1)))
+
+
+	def getInListBatchSize(self, paramCount=0):
+		return max(1, min(1000, 32767 - paramCount))
+
+
 	def getLastInsertID(self, cursor):
 		"""
 		Return the ID of the last inserted row, or None.
@@ -13,6 +13,11 @@ from dabo.lib.utils import ustr
 
 class SQLite(dBackend):
 	"""Class providing SQLite connectivity. Uses sqlite3 or pysqlite2 package."""
+	batchInsertIDs = True
+	reliableRowCount = True
+	# sqlite3 connections refuse to be used outside of their thread.
+	poolAcrossThreads = False
+
 	def __init__(self):
 		dBackend.__init__(self)
 		self.dbModuleName = "pysqlite2"
@@ -143,6 +148,37 @@ class SQLite(dBackend):
 		return self.dbapi.Binary(val)
 
 
+	def getInsertBatchSize(self, columnCount):
+		"""SQLite allows up to 500 rows and 999 parameters in a statement."""
+		if self.dbapi.sqlite_version_info < (3, 7, 11):
+			return 1
+		return max(1, min(500, 999 // max(columnCount, 1)))
+
+
+	def getDeleteBatchSize(self, keyCount):
+		"""SQLite allows up to 999 parameters in a statement."""
+		return max(1, 999 // max(keyCount, 1))
+
+
+	def getInListBatchSize(self, paramCount=0):
+		"""SQLite allows up to 999 parameters in a statement."""
+		return max(1, 999 - paramCount)
+
+
+	def _applyKeepAlive(self):
+		"""
+		An embedded database doesn't drop idle connections, and the
+		connection can't be used from the keep-alive thread anyway.
+		"""
+		pass
+
+
+	def getLastInsertIDs(self, cursor, rowCount):
+		"""The rows of a single insert statement get consecutive rowids."""
+		lastID = cursor.lastrowid
+		return range(lastID - rowCount + 1, lastID + 1)
+
+
 	def formatDateTime(self, val):
 		"""We need to wrap the value in quotes."""
 		sqt = "'"		# single quote
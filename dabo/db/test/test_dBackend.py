@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import gc
+import threading
+import time
+import unittest
+import dabo
+import dabo.dException as dException
+from dabo.db import dBackend
+
+
+class FakeConnection(object):
+	"""Stands in for a DB-API connection to a server that can go away."""
+	def __init__(self):
+		self.broken = False
+		self.pings = 0
+
+	def cursor(self):
+		return FakeCursor(self)
+
+	def close(self):
+		self.broken = True
+
+
+class FakeCursor(object):
+	def __init__(self, conn):
+		self.conn = conn
+
+	def execute(self, sql):
+		if self.conn.broken:
+			raise StandardError("server has gone away")
+		self.conn.pings += 1
+
+	def fetchall(self):
+		return [(1, )]
+
+	def close(self):
+		pass
+
+
+class FakeDaboCursor(object):
+	pass
+
+
+class FakeBackend(dBackend.dBackend):
+	def getConnection(self, connectInfo, **kwargs):
+		self._connection = FakeConnection()
+		return self._connection
+
+
+class Test_KeepAlive(unittest.TestCase):
+	def setUp(self):
+		self.backends = []
+
+	def tearDown(self):
+		for bo in self.backends:
+			bo.KeepAliveInterval = None
+
+	def makeBackend(self, interval=0.05):
+		bo = FakeBackend()
+		bo.getConnection(None)
+		bo._connectArgs = (None, {})
+		bo.KeepAliveInterval = interval
+		self.backends.append(bo)
+		return bo
+
+	def waitFor(self, test, timeout=2):
+		end = time.time() + timeout
+		while not test() and time.time() < end:
+			time.sleep(0.01)
+		return test()
+
+	def test_pingIdle(self):
+		bo = self.makeBackend()
+		self.assertEqual(bo.LastPingLatency, None)
+		self.assertTrue(self.waitFor(lambda: bo._connection.pings >= 2))
+		self.assertTrue(bo.LastPingLatency >= 0)
+
+	def test_skipBusy(self):
+		bo = self.makeBackend(0.1)
+		end = time.time() + 0.3
+		while time.time() < end:
+			bo.lastExecuteTime = time.time()
+			time.sleep(0.01)
+		self.assertEqual(bo._connection.pings, 0)
+
+	def test_reconnect(self):
+		bo = self.makeBackend()
+		old = bo._connection
+		old.broken = True
+		self.assertTrue(self.waitFor(lambda: bo._connection is not old))
+		self.assertTrue(self.waitFor(lambda: bo._connection.pings >= 1))
+
+	def test_skipInUse(self):
+		bo = self.makeBackend()
+		bo.lastExecuteTime = 0
+		bo._beginUse()
+		try:
+			time.sleep(0.2)
+			self.assertEqual(bo._connection.pings, 0)
+		finally:
+			bo._endUse()
+		self.assertTrue(self.waitFor(lambda: bo._connection.pings >= 1))
+
+	def test_lostWithCursors(self):
+		bo = self.makeBackend()
+		crs = FakeDaboCursor()
+		bo._cursors.add(crs)
+		old = bo._connection
+		old.broken = True
+		self.assertTrue(self.waitFor(lambda: bo._connectionLost))
+		self.assertTrue(bo._connection is old)
+		self.assertRaises(dException.ConnectionLostException, bo._beginUse)
+		bo.reconnect()
+		self.assertFalse(bo._connectionLost)
+		bo._beginUse()
+		bo._endUse()
+
+	def test_stop(self):
+		bo = self.makeBackend()
+		self.assertTrue(self.waitFor(lambda: bo._connection.pings >= 1))
+		bo.KeepAliveInterval = None
+		time.sleep(0.1)
+		pings = bo._connection.pings
+		time.sleep(0.15)
+		self.assertEqual(bo._connection.pings, pings)
+
+	def test_sharedThread(self):
+		for num in range(5):
+			self.makeBackend()
+		threads = [thd for thd in threading.enumerate() if thd.getName() == "DaboKeepAlive"]
+		self.assertEqual(len(threads), 1)
+
+	def test_weakReference(self):
+		bo = FakeBackend()
+		bo.getConnection(None)
+		bo.KeepAliveInterval = 60
+		scheduler = dBackend._getKeepAliveScheduler()
+		count = len(scheduler._tokens)
+		del bo
+		gc.collect()
+		self.assertEqual(len(scheduler._tokens), count - 1)
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_KeepAlive)
+	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import dabo
+import dabo.db
+import dabo.dException as dException
+
+
+class Test_dConnectionPool(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.connInfo = {"DbType": "SQLite",
+				"Database": os.path.join(self.tempDir, "pool.db")}
+		# An empty file is an empty SQLite database.
+		open(self.connInfo["Database"], "w").close()
+		self.pool = dabo.db.dConnectionPool(dabo.db.dConnectInfo(self.connInfo),
+				MaxSize=2)
+
+	def tearDown(self):
+		self.pool.close()
+		dabo.db.closePools()
+		shutil.rmtree(self.tempDir)
+
+	def test_reuse(self):
+		pool = self.pool
+		conn = pool.acquire()
+		self.assertTrue(conn.IsPooled)
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (1, 0))
+		conn.release()
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (0, 1))
+		# Releasing twice doesn't add it twice.
+		conn.release()
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (0, 1))
+		self.assertTrue(pool.acquire() is conn)
+
+	def test_copiedSettings(self):
+		ci = dabo.db.dConnectInfo(self.connInfo)
+		ci.KeepAliveInterval = 60
+		ci.Name = "pooled"
+		pool = dabo.db.dConnectionPool(ci)
+		conn = pool.acquire()
+		self.assertEqual(conn.ConnectInfo.KeepAliveInterval, 60)
+		self.assertEqual(conn.getBackendObject().KeepAliveInterval, 60)
+		self.assertEqual(conn.ConnectInfo.Name, "pooled")
+		self.assertFalse(conn.ConnectInfo is ci)
+		conn.release()
+		pool.close()
+
+	def test_waitIndefinitely(self):
+		pool = self.pool
+		pool.Timeout = 0.05
+		conn1, conn2 = pool.acquire(), pool.acquire()
+		got = []
+		waiter = threading.Thread(target=lambda: got.append(pool.acquire(None)))
+		waiter.start()
+		time.sleep(0.2)
+		self.assertEqual(got, [])
+		conn1.release()
+		waiter.join()
+		self.assertTrue(got[0] is conn1)
+
+	def test_ownBackendObjects(self):
+		pool = self.pool
+		conn1, conn2 = pool.acquire(), pool.acquire()
+		self.assertFalse(conn1.getBackendObject() is conn2.getBackendObject())
+		crs = conn2.getDaboCursor()
+		self.assertTrue(crs.connection is conn2.getConnection())
+
+	def test_maxSize(self):
+		pool = self.pool
+		conn1, conn2 = pool.acquire(), pool.acquire()
+		self.assertRaises(dException.DatabaseException, pool.acquire, 0.05)
+
+		# A waiting thread gets the connection as soon as it is released.
+		got = []
+		waiter = threading.Thread(target=lambda: got.append(pool.acquire(5)))
+		waiter.start()
+		time.sleep(0.05)
+		self.assertEqual(got, [])
+		conn1.release()
+		waiter.join()
+		self.assertTrue(got[0] is conn1)
+
+	def test_healthCheck(self):
+		pool = self.pool
+		pool.HealthCheckInterval = 0
+		conn = pool.acquire()
+		conn.release()
+		self.assertTrue(pool.acquire() is conn)
+		conn.release()
+		conn.getConnection().close()
+		fresh = pool.acquire()
+		self.assertFalse(fresh is conn)
+		self.assertFalse(conn.IsPooled)
+		self.assertEqual(pool.InUseCount, 1)
+
+	def test_getPool(self):
+		pool = dabo.db.getPool(self.connInfo, MinSize=1)
+		self.assertEqual(pool.IdleCount, 1)
+		self.assertTrue(dabo.db.getPool(dabo.db.dConnectInfo(self.connInfo)) is pool)
+		other = dict(self.connInfo, Database=os.path.join(self.tempDir, "other.db"))
+		open(other["Database"], "w").close()
+		self.assertFalse(dabo.db.getPool(other) is pool)
+
+	def test_bizobjRelease(self):
+		pool = self.pool
+		conn = pool.acquire()
+		conn.getDaboCursor().execute("create table t (pk INTEGER PRIMARY KEY)")
+		biz = dabo.biz.dBizobj(conn)
+		biz.KeyField = "pk"
+		biz.DataSource = "t"
+		child = dabo.biz.dBizobj(conn)
+		biz.addChild(child)
+		biz.releaseConnection()
+		self.assertEqual(biz._connection, None)
+		self.assertEqual(child._connection, None)
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (0, 1))
+
+	def test_close(self):
+		pool = self.pool
+		conn = pool.acquire()
+		pool.close()
+		self.assertRaises(dException.DatabaseException, pool.acquire)
+		conn.release()
+		self.assertEqual((pool.InUseCount, pool.IdleCount), (0, 0))
+		self.assertFalse(conn.IsPooled)
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_dConnectionPool)
+	unittest.TextTestRunner(verbosity=2).run(suite)
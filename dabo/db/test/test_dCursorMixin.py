@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
+import gc
 import unittest
 import datetime
+import weakref
 from decimal import Decimal
 import dabo.db
 from dabo.lib import getRandomUUID
@@ -210,6 +212,75 @@ insert into %s (cfield, ifield, nfield) values (NULL, NULL, NULL)
 		self.assertEqual(cur.Record.cfield, newVal)
 		self.assertRaises(dabo.dException.FieldNotFoundException, cur.oldVal, "bogusField")
 
+	def test_pkLookups(self):
+		cur = self.cur
+		self.assertTrue(cur.hasPK(2))
+		self.assertFalse(cur.hasPK(99))
+		self.assertEqual(cur._getRowByPk(3), 2)
+		cur.moveToPK(2)
+		self.assertEqual(cur.RowNumber, 1)
+		# Sorting changes the row numbers:
+		cur.sort("cfield")
+		self.assertEqual(cur._getRowByPk(3), 0)
+		self.assertEqual(cur.getPK(), 2)
+		# Changing the PK value must be reflected in lookups:
+		cur.setFieldVal("pk", 42, row=0)
+		self.assertFalse(cur.hasPK(3))
+		self.assertEqual(cur._getRowByPk(42), 0)
+		# New records are found by their temp PK:
+		cur.new()
+		tmpPK = cur.genTempAutoPK()
+		cur.setNewFlag()
+		self.assertEqual(cur._getRowByPk(tmpPK), 3)
+		# Deleting shifts the following rows:
+		cur.first()
+		cur.delete()
+		self.assertFalse(cur.hasPK(42))
+		self.assertEqual(cur._getRowByPk(tmpPK), 2)
+		self.assertEqual(cur.getChangedRows(includeNewUnchanged=True), [2])
+
+	def test_recordStore(self):
+		cur = self.cur
+		snapshot = cur.getDataSet()
+		cur.appendDataSet([{"cfield": "Rec %s" % idx, "ifield": 1000 + idx, "nfield": idx}
+				for idx in range(50)], updateInternals=True)
+		self.assertEqual(cur.RowCount, 53)
+		self.assertEqual(cur.seek("Rec 42", "cfield"), 45)
+		cur.sort("ifield", "DESC")
+		self.assertEqual(cur.getFieldVal("cfield", 1), "Rec 49")
+		cur.moveToRowNum(10)
+		cur.delete()
+		self.assertEqual(cur.RowCount, 52)
+		self.assertTrue(cur.hasPK(2))
+		self.assertEqual(cur.getFieldVal("pk", cur._getRowByPk(2)), 2)
+		# Data sets that were already returned don't change.
+		self.assertTrue(isinstance(snapshot, dabo.db.dDataSet))
+		self.assertEqual(len(snapshot), 3)
+
+	def test_seek(self):
+		cur = self.cur
+		self.assertEqual(cur.seek("Edward Leafe", "cfield"), 1)
+		self.assertEqual(cur.RowNumber, 1)
+		self.assertEqual(cur.seek("edward leafe", "cfield"), -1)
+		self.assertEqual(cur.seek("edward leafe", "cfield", caseSensitive=False), 1)
+		self.assertEqual(cur.seek("D", "cfield", near=True), 1)
+		self.assertEqual(cur.seek("pa", "cfield", caseSensitive=False, near=True,
+				incremental=True), 0)
+		self.assertEqual(cur.seek(42, "ifield", movePointer=False), 1)
+		self.assertEqual(cur.seek(100, "ifield", near=True), 2)
+		self.assertEqual(cur.seek((42, "Edward Leafe"), ("ifield", "cfield")), 1)
+		self.assertFalse(cur.locate("Zelda", "cfield"))
+		# Changing a value must be reflected in subsequent seeks:
+		cur.setFieldVal("cfield", "Zelda", row=2)
+		self.assertEqual(cur.seek("Zelda", "cfield"), 2)
+		self.assertEqual(cur.seek("Carl Karsten", "cfield"), -1)
+		cur.new()
+		cur.setFieldVal("ifield", 7)
+		self.assertEqual(cur.seek(7, "ifield"), 3)
+		cur.first()
+		cur.delete()
+		self.assertEqual(cur.seek(7, "ifield"), 2)
+
 	## - End method unit tests -
 
 	def testMementos(self):
@@ -322,6 +393,167 @@ insert into %s (cfield, ifield, nfield) values (NULL, NULL, NULL)
 		self.assertEqual(rec.ffield, Decimal("11"))
 		self.assertEqual(str(rec.ffield), "11.0")
 
+	def test_bulkTypeCorrection(self):
+		cur = self.cur
+		cur.BulkTypeCorrection = True
+		cur.requery()
+		recs = cur._records
+		self.assertTrue(recs[0][dabo.dConstants.CURSOR_FIELD_TYPES_CORRECTED])
+		self.assertEqual([rec["nfield"] for rec in recs],
+				[Decimal("23.23"), Decimal("42.42"), Decimal("23032.76")])
+		self.assertEqual(str(recs[2]["ffield"]), "11.0")
+
+	def test_typeCorrectionMarksChanged(self):
+		cur = self.cur
+		cur._types["nfield"] = Decimal
+		recs = cur._records
+		recs.execute("select * from dataset")
+		rec = recs[0]
+		self.assertFalse(rec.get(dabo.dConstants.CURSOR_FIELD_TYPES_CORRECTED, False))
+		cur.getFieldVal("nfield", 0)
+		self.assertTrue(id(rec) in recs._engine._changes)
+		ret = recs.execute("select nfield from dataset")
+		self.assertEqual(ret[0]["nfield"], Decimal("23.23"))
+
+	def test_fetchSize(self):
+		cur = self.cur
+		cur.FetchSize = 1
+		cur.requery()
+		self.assertEqual(len(cur._records), 1)
+		self.assertEqual(cur.RowCount, 3)
+		self.assertEqual(cur.getFieldVal("ifield", 1), 42)
+		self.assertEqual(len(cur._records), 2)
+		cur.RowNumber = 2
+		self.assertEqual(cur.Record.ifield, 10223)
+		self.assertEqual(cur.RowCount, 3)
+		cur.RowNumber = 0
+		cur.requery()
+		self.assertEqual(len(cur._records), 1)
+		cur.sort("ifield", "DESC")
+		self.assertEqual(len(cur._records), 3)
+		self.assertEqual(cur.getFieldVal("ifield", 0), 10223)
+
+	def test_recordsStampReleasesRecords(self):
+		cur = self.cur
+		cur._getPKIndex()
+		cur.seek(42, "ifield")
+		ref = weakref.ref(cur._records)
+		cur.requery()
+		gc.collect()
+		self.assertEqual(ref(), None)
+		self.assertNotEqual(cur._pkIndexStamp, cur._recordsStamp())
+
+	def test_fetchSizeCountOnDemand(self):
+		cur = self.cur
+		cur.FetchSize = 1
+		cur.requery()
+		self.assertEqual(cur.RowNumber, 0)
+		cur.RowNumber = 1
+		self.assertEqual(cur.RowNumber, 1)
+		# The rows haven't been counted until RowCount is asked for.
+		self.assertEqual(cur._fetchTotal, None)
+		self.assertEqual(cur.RowCount, 3)
+		self.assertEqual(cur._fetchTotal, 3)
+		cur.RowNumber = 5
+		self.assertEqual(cur.RowNumber, 2)
+
+	def test_saveAllRows(self):
+		cur = self.cur
+		cur.setFieldVal("cfield", "Paul McNett", 0)
+		cur.setFieldVal("ifield", 7, 1)
+		for num in range(3):
+			cur.new()
+			cur.genTempAutoPK()
+			cur.setNewFlag()
+			cur.Record.cfield = "New %s" % num
+			cur.Record.ifield = num
+		cur.save(allRows=True)
+		newPKs = [cur.getFieldVal("pk", row) for row in range(3, 6)]
+		self.assertEqual(len(set(newPKs)), 3)
+		self.assertFalse(cur.isChanged(allRows=True))
+		cur.requery()
+		self.assertEqual(cur.RowCount, 6)
+		self.assertEqual(cur.getFieldVal("cfield", 0), "Paul McNett")
+		self.assertEqual(cur.getFieldVal("ifield", 1), 7)
+		for row, pk in zip(range(3, 6), newPKs):
+			self.assertEqual(cur.getFieldVal("pk", row), pk)
+			self.assertEqual(cur.getFieldVal("cfield", row), "New %s" % (row - 3))
+
+	def test_saveAllRowsInOrder(self):
+		cur = self.cur
+		for num in range(4):
+			cur.new()
+			cur.genTempAutoPK()
+			cur.setNewFlag()
+			# Alternate the fields set, so that alike rows aren't adjacent.
+			if num % 2:
+				cur.Record.ifield = num
+			else:
+				cur.Record.cfield = "New %s" % num
+		cur.save(allRows=True)
+		newPKs = [cur.getFieldVal("pk", row) for row in range(3, 7)]
+		self.assertEqual(newPKs, sorted(newPKs))
+
+	def test_deleteRows(self):
+		cur = self.cur
+		cur.new()
+		cur.genTempAutoPK()
+		cur.setNewFlag()
+		cur.RowNumber = 1
+		cur.deleteRows([0, 2, 3])
+		self.assertEqual(cur.RowCount, 1)
+		self.assertEqual(cur.RowNumber, 0)
+		self.assertEqual(cur.Record.ifield, 42)
+		self.assertFalse(cur.isChanged(allRows=True, includeNewUnchanged=True))
+		cur.requery()
+		self.assertEqual([rec["ifield"] for rec in cur.getDataSet()], [42])
+		cur.deleteRows()
+		self.assertEqual(cur.RowCount, 0)
+		cur.requery()
+		self.assertEqual(cur.RowCount, 0)
+
+	def test_deleteRowsPartly(self):
+		cur = self.cur
+		cur.AuxCursor.execute("delete from %s where ifield = 42" % self.temp_table_name)
+		# One of the records is gone, which is reported even though others were deleted.
+		self.assertRaises(dabo.dException.dException, cur.deleteRows)
+
+	def test_filterThenNewOrDelete(self):
+		cur = self.cur
+		cur.filter("ifield", 42, ">=")
+		self.assertEqual(cur.RowCount, 2)
+		cur.RowNumber = 0
+		cur.delete()
+		cur.removeFilter()
+		self.assertEqual(cur.RowCount, 2)
+		self.assertEqual([rec["ifield"] for rec in cur.getDataSet()], [23, 10223])
+
+		cur.filter("ifield", 42, ">=")
+		cur.new()
+		cur.genTempAutoPK()
+		cur.setNewFlag()
+		cur.removeFilter()
+		self.assertEqual(cur.RowCount, 3)
+		cur.cancel(allRows=True)
+		self.assertEqual(cur.RowCount, 2)
+
+	def test_statementCache(self):
+		cur = self.cur
+		cache = cur.BackendObject._statementCache
+		hits = cache.Hits
+		cur.requery()
+		cur.requery()
+		self.assertTrue(cache.Hits >= hits + 2)
+		self.assertEqual(cur.RowCount, 3)
+		# A unicode statement is encoded before it is cached.
+		sql = u"select cfield from %s where pk = 2" % self.temp_table_name
+		cur.execute(sql)
+		self.assertEqual(cur.Record.cfield, "Edward Leafe")
+		self.assertTrue(isinstance(cache.get((sql, False, cur.Encoding))[0], str))
+		cur.execute(sql)
+		self.assertEqual(cur.Record.cfield, "Edward Leafe")
+		self.assertEqual(cur.RowCount, 1)
+
 
 class Test_dCursorMixin_sqlite(Test_dCursorMixin, unittest.TestCase):
 	def setUp(self):
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import unittest
+import dabo.db
+from dabo.db.dDataSet import dDataSet, dRecordList
+
+
+class Test_dDataSet(unittest.TestCase):
+	def setUp(self):
+		self.data = [{"name": "Ed Leafe", "age": 51, "coder": True},
+				{"name": "Mike Leafe", "age": 21, "coder": False},
+				{"name": "Dan Leafe", "age": 17, "coder": False},
+				{"name": "Paul McNett", "age": 39, "coder": True}]
+		self.ds = dDataSet(self.data)
+
+	def tearDown(self):
+		self.ds = None
+
+	def test_execute(self):
+		res = self.ds.execute("select name from dataset where age > 30 order by age")
+		self.assertEqual([rec["name"] for rec in res], ["Paul McNett", "Ed Leafe"])
+		self.assertEqual(dDataSet().execute("select * from dataset"), None)
+
+	def test_sort(self):
+		ds = self.ds
+		srt = ds.sort("age")
+		self.assertEqual([rec["age"] for rec in srt], [17, 21, 39, 51])
+		# Sorted data sets contain copies of the records.
+		self.assertEqual(srt[0], self.data[2])
+		self.assertFalse(srt[0] is self.data[2])
+		srt[0]["age"] = 99
+		self.assertEqual(self.data[2]["age"], 17)
+		srt = srt.sort("name", "DESC")
+		self.assertEqual(srt[0]["name"], "Paul McNett")
+
+	def test_changes(self):
+		ds = self.ds
+		self.assertEqual(ds.sort("age")[0]["name"], "Dan Leafe")
+		self.data[0]["age"] = 5
+		ds.markChanged(self.data[0])
+		self.assertEqual(ds.sort("age")[0]["name"], "Ed Leafe")
+		ds.replace("age", 99, scope="name == 'Ed Leafe'")
+		self.assertEqual(ds.sort("age", "DESC")[0]["name"], "Ed Leafe")
+		# Derived data sets share the engine, and see the changes.
+		bigger = ds + ({"name": "Carl Karsten", "age": 100, "coder": True},)
+		self.assertTrue(bigger._engine is ds._engine)
+		self.assertEqual(bigger.sort("age", "DESC")[0]["name"], "Carl Karsten")
+		coders = ds.filter("coder", True)
+		self.assertEqual(len(coders.execute("select * from dataset")), 2)
+		self.assertEqual(len(ds.execute("select * from dataset")), 4)
+
+	def test_tablePerDataSet(self):
+		ds = self.ds
+		coders = ds.filter("coder", True)
+		engine = ds._engine
+		creates = []
+		createTable = engine._createTable
+		def countCreate(*args):
+			creates.append(args)
+			return createTable(*args)
+		engine._createTable = countCreate
+		for num in range(3):
+			self.assertEqual(len(ds.execute("select * from dataset")), 4)
+			self.assertEqual(len(coders.execute("select * from dataset")), 2)
+		self.assertEqual(len(creates), 2)
+
+	def test_maxTables(self):
+		engine = self.ds._engine
+		engine.maxTables = 3
+		for age in (17, 21, 39, 51, 17):
+			self.assertEqual(len(self.ds.filter("age", age).execute("select * from dataset")), 1)
+		self.assertEqual(len(engine._tables), 3)
+
+	def test_changeLog(self):
+		ds = self.ds
+		engine = ds._engine
+		coders = ds.filter("coder", True)
+		ds.execute("select * from dataset")
+		coders.execute("select * from dataset")
+		self.data[0]["age"] = 5
+		ds.markChanged(self.data[0])
+		ds.execute("select * from dataset")
+		# The table of 'coders' hasn't applied the change yet.
+		self.assertEqual(len(engine._changes), 1)
+		res = coders.execute("select age from dataset where name = 'Ed Leafe'")
+		self.assertEqual(res[0]["age"], 5)
+		self.assertEqual(engine._changes, {})
+		# Tables that fall too far behind are rebuilt instead.
+		engine.maxChanges = 2
+		for rec in self.data:
+			rec["age"] += 1
+			ds.markChanged(rec)
+		self.assertTrue(len(engine._changes) <= engine.maxChanges)
+		res = coders.execute("select age from dataset order by age")
+		self.assertEqual([rec["age"] for rec in res], [6, 40])
+
+	def test_dml(self):
+		ds = self.ds
+		res = ds.execute("delete from dataset where coder = 0")
+		self.assertEqual(len(res), 2)
+		# The data set itself is unchanged.
+		self.assertEqual(len(ds.execute("select * from dataset")), 4)
+
+	def test_recordList(self):
+		recs = dRecordList(self.ds)
+		self.assertTrue(recs._engine is self.ds._engine)
+		versions = [recs._version]
+		recs.append({"name": "Carl Karsten", "age": 100, "coder": True})
+		versions.append(recs._version)
+		del recs[0]
+		versions.append(recs._version)
+		recs[:] = list(reversed(recs))
+		versions.append(recs._version)
+		self.assertEqual(len(set(versions)), 4)
+		# Versions aren't shared with other lists.
+		self.assertFalse(dRecordList(self.ds)._version in versions)
+		self.assertEqual(recs[0]["name"], "Carl Karsten")
+		# The query API returns data sets of the same kind.
+		srt = recs.sort("age")
+		self.assertTrue(isinstance(srt, dRecordList))
+		self.assertEqual([rec["age"] for rec in srt], [17, 21, 39, 100])
+		self.assertEqual(len(recs.filter("coder", True)), 2)
+		self.assertEqual(len(recs.execute("select * from dataset where age > 30")), 2)
+		self.assertTrue(isinstance(dDataSet(recs), tuple))
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_dDataSet)
+	unittest.TextTestRunner(verbosity=2).run(suite)
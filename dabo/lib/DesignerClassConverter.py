@@ -11,6 +11,9 @@ import re
 import random
 import codecs
 import tempfile
+import hashlib
+import imp
+import marshal
 import dabo
 dabo.ui.loadUI("wx")
 from dabo.dLocalize import _
@@ -20,10 +23,80 @@ import dabo.ui.dialogs as dlgs
 import dabo.lib.xmltodict as xtd
 import dabo.lib.DesignerUtils as desUtil
 from dabo.lib.utils import ustr
+from dabo.lib.lruCache import LRUCache
 # Doesn't matter what platform we're on; Python needs
 # newlines in its compiled code.
 LINESEP = "\n"
 
+# Version of the data stored in the class cache files. Changes to the generated
+# code are picked up from the signature of this file, which every entry depends on.
+_cacheFormat = 1
+_converterFile = "%s.py" % os.path.splitext(os.path.abspath(__file__))[0]
+# Compiled classes, keyed by the hash returned by _getCacheKey(). The values
+# are (dependencies, class name, code object) tuples.
+_classCache = LRUCache(50)
+# Directory for the on-disk copy of the cache; set on first use.
+_classCacheDir = None
+# Number of classes kept in that directory. When more are written, the ones
+# written longest ago are removed.
+_maxCacheEntries = 200
+
+
+def _fileSignature(pth):
+	"""Return the (mtime, size) of the file, or None if it doesn't exist."""
+	try:
+		st = os.stat(pth)
+	except OSError:
+		return None
+	return (st.st_mtime, st.st_size)
+
+
+def _getClassCacheDir():
+	"""Return the directory the compiled classes are saved in, or None if there is none."""
+	global _classCacheDir
+	if _classCacheDir is None:
+		_classCacheDir = ""
+		appDir = utils.getUserAppDataDirectory()
+		if appDir:
+			pth = os.path.join(appDir, "classcache")
+			try:
+				if not os.path.isdir(pth):
+					os.makedirs(pth)
+				_classCacheDir = pth
+			except OSError:
+				pass
+	return _classCacheDir or None
+
+
+def _pruneClassCacheDir(cacheDir, keep, newKey=None):
+	"""
+	Remove the .dcc and .py files of all but the 'keep' most recently written
+	classes in the cache directory. The class just written under newKey is
+	kept in any case, as its files can have the same mtime as older ones.
+	"""
+	try:
+		names = os.listdir(cacheDir)
+	except OSError:
+		return
+	written = {}
+	for nm in names:
+		cacheKey, ext = os.path.splitext(nm)
+		if ext not in (".dcc", ".py"):
+			continue
+		sig = _fileSignature(os.path.join(cacheDir, nm))
+		if sig is not None:
+			written[cacheKey] = max(written.get(cacheKey, 0), sig[0])
+	excess = len(written) - keep
+	if excess <= 0:
+		return
+	written.pop(newKey, None)
+	for cacheKey in sorted(written, key=written.get)[:excess]:
+		for ext in ("dcc", "py"):
+			try:
+				os.remove(os.path.join(cacheDir, "%s.%s" % (cacheKey, ext)))
+			except OSError:
+				pass
+
 
 class DesignerClassConverter(dObject):
 	def __init__(self, *args, **kwargs):
@@ -63,13 +136,31 @@ class DesignerClassConverter(dObject):
 		self._srcFile = None
 		# Encoding to be used
 		self._encoding = dabo.getEncoding()
+		# Signatures of the files the generated class is built from
+		self._dependencies = {}
 
 
 	def classFromText(self, src):
 		"""Given a text file, returns a class object that that file
 		represents. You can pass the text as either a file path,
 		a file object, or raw XML/JSON text.
+
+		The compiled class code is cached, in memory and on disk, along with
+		the modification times of the files it was built from, so that later
+		calls for the same source skip the parsing and code generation until
+		one of those files changes.
 		"""
+		cacheKey = self._getCacheKey(src)
+		if cacheKey is not None:
+			cached = self._getCachedClass(cacheKey)
+			if cached is not None:
+				self.mainClassName, compClass = cached
+				nmSpace = {}
+				exec compClass in nmSpace
+				return nmSpace[self.mainClassName]
+			classFileName = self._getCacheFileName(cacheKey, "py") or self._classFileName
+		else:
+			classFileName = self._classFileName
 		dct = self.dictFromStoredText(src)
 		# Traverse the dct, looking for superclass information
 		super = self.flattenClassDict(dct)
@@ -82,7 +173,7 @@ class DesignerClassConverter(dObject):
 		self.classText += "\n"
 		if isinstance(self.classText, unicode):
 			self.classText = self.classText.encode(self._encoding)
-		open(self._classFileName, "w").write(self.classText)
+		open(classFileName, "w").write(self.classText)
 
 		## For debugging. This creates a copy of the generated code
 		## so that you can help determine any problems.
@@ -94,12 +185,103 @@ class DesignerClassConverter(dObject):
 		# jfcs added self._codeFileName to below
 		# egl - created a tmp file for the main class code that we can use
 		#   for compiling. This allows for full Python introspection.
-		compClass = compile(self.classText, self._classFileName, "exec")
+		compClass = compile(self.classText, classFileName, "exec")
+		if cacheKey is not None:
+			self._storeCachedClass(cacheKey, compClass)
 		nmSpace = {}
 		exec compClass in nmSpace
 		return nmSpace[self.mainClassName]
 
 
+	def _getCacheKey(self, src):
+		"""
+		Return the key the class generated from src is cached under, or None
+		if it isn't cached. File objects aren't, as they can only be read once.
+		"""
+		if not dabo.cacheDesignerClasses or not isinstance(src, basestring):
+			return None
+		if src.startswith("<"):
+			if isinstance(src, unicode):
+				src = src.encode("utf-8")
+			# Relative paths in the text are resolved from the current directory.
+			ident = "text:%s:%s" % (hashlib.md5(src).hexdigest(), os.getcwd())
+		else:
+			ident = "file:%s" % os.path.abspath(utils.resolvePathAndUpdate(src))
+		ident = "%s:%s:%s:%s" % (_cacheFormat, ident, self.CreateDesignerControls,
+				self._encoding)
+		if isinstance(ident, unicode):
+			ident = ident.encode("utf-8")
+		return hashlib.md5(ident).hexdigest()
+
+
+	def _getCacheFileName(self, cacheKey, ext):
+		cacheDir = _getClassCacheDir()
+		if cacheDir is None:
+			return None
+		return os.path.join(cacheDir, "%s.%s" % (cacheKey, ext))
+
+
+	def _getCachedClass(self, cacheKey):
+		"""
+		Return the (class name, code object) tuple cached for the key, or None
+		if there is none, or any of the files it was built from has changed.
+		"""
+		entry = _classCache.get(cacheKey)
+		if entry is None:
+			entry = self._readCacheFile(cacheKey)
+			if entry is None:
+				return None
+			_classCache[cacheKey] = entry
+		deps, clsName, code = entry
+		for pth, sig in deps:
+			if _fileSignature(pth) != sig:
+				_classCache.pop(cacheKey)
+				return None
+		return clsName, code
+
+
+	def _readCacheFile(self, cacheKey):
+		pth = self._getCacheFileName(cacheKey, "dcc")
+		if pth is None:
+			return None
+		try:
+			data = open(pth, "rb").read()
+		except IOError:
+			return None
+		# Code objects can only be loaded by the Python version that created them.
+		magic = imp.get_magic()
+		if not data.startswith(magic):
+			return None
+		try:
+			fmt, deps, clsName, code = marshal.loads(data[len(magic):])
+		except (EOFError, ValueError, TypeError):
+			return None
+		if fmt != _cacheFormat:
+			return None
+		return deps, clsName, code
+
+
+	def _storeCachedClass(self, cacheKey, code):
+		self._addDependency(_converterFile)
+		deps = tuple(self._dependencies.items())
+		_classCache[cacheKey] = (deps, self.mainClassName, code)
+		pth = self._getCacheFileName(cacheKey, "dcc")
+		if pth is None:
+			return
+		data = marshal.dumps((_cacheFormat, deps, self.mainClassName, code))
+		try:
+			open(pth, "wb").write(imp.get_magic() + data)
+		except IOError, e:
+			dabo.log.info(_("Could not write the class cache file '%s': %s") % (pth, e))
+		else:
+			_pruneClassCacheDir(os.path.dirname(pth), _maxCacheEntries, cacheKey)
+
+
+	def _addDependency(self, pth):
+		"""Record a file that the generated class is built from."""
+		self._dependencies[os.path.abspath(pth)] = _fileSignature(pth)
+
+
 	def dictFromStoredText(self, src):
 		"""Takes either a path to a text file, an open file containing the text,
 		or the raw text itself. Determines the format of the stored text, and
@@ -122,6 +304,8 @@ class DesignerClassConverter(dObject):
 			encoding = self._encoding
 		# Get the associated code file, if any
 		codePth = "%s-code.py" % os.path.splitext(pth)[0]
+		# Adding the code file later changes the class, too.
+		self._addDependency(codePth)
 		if os.path.exists(codePth):
 			try:
 				codeContent = codecs.open(codePth, "r", encoding).read()
@@ -145,6 +329,7 @@ class DesignerClassConverter(dObject):
 		except AttributeError:
 			if os.path.exists(src):
 				self._srcFile = src = utils.resolvePathAndUpdate(src)
+				self._addDependency(src)
 				jsonText = file(src).read()
 			else:
 				# It must be raw json
@@ -168,6 +353,7 @@ class DesignerClassConverter(dObject):
 				xml = src = utils.resolvePathAndUpdate(src)
 			if os.path.exists(src):
 				self._srcFile = src
+				self._addDependency(src)
 			else:
 				parseCode = False
 				self._srcFile = os.getcwd()
@@ -777,6 +963,8 @@ class DesignerClassConverter(dObject):
 		for this class.
 		"""
 		conv = DesignerClassConverter()
+		# The outer class depends on this file, too.
+		conv._dependencies = self._dependencies
 		xmlDict = conv.importXmlSrc(pth)
 		conv.createClassText(xmlDict, addImports=False, specList=specList)
 		self.innerClassText += conv.classText + (2 * LINESEP)
@@ -7,6 +7,8 @@ import sys
 import os
 import re
 import pickle
+import time
+import weakref
 from os.path import join as pathjoin
 from zipfile import ZipFile
 from cStringIO import StringIO
@@ -18,6 +20,7 @@ from dabo.dObject import dObject
 from dabo.dLocalize import _
 from dabo.lib.utils import ustr
 from dabo.lib.manifest import Manifest
+from dabo.lib.dataCodec import decodeDataSet
 jsonEncode = dabo.lib.jsonEncode
 jsonDecode = dabo.lib.jsonDecode
 
@@ -32,6 +35,9 @@ class RemoteConnector(object):
 		self._baseURL = None
 		self._authHandler = None
 		self._urlOpener = None
+		# The server's version of the data in each cursor, as sent in the ETag
+		# header of the last requery.
+		self._dataVersions = weakref.WeakKeyDictionary()
 		appDir = dabo.lib.utils.getUserAppDataDirectory()
 		self._dataDir = pathjoin(appDir, "webapps")
 
@@ -70,27 +76,45 @@ class RemoteConnector(object):
 
 
 	def _storeEncodedDataSet(self, enc):
-		pdata, ptyps, pstru = jsonDecode(enc)
-		# The values are pickled, so we need to unpickle them first
-		def safeLoad(val):
-			try:
-				ret = pickle.loads(val)
-			except UnicodeEncodeError:
-				for enctype in (dabo.getEncoding(), "utf-8", "iso8859-1"):
-					try:
-						ret = pickle.loads(val.encode(enctype))
-					except KeyError:
-						continue
-					break
-				else:
-					raise
-			return ret
-		typs = safeLoad(ptyps)
-		data = safeLoad(pdata)
-		stru = safeLoad(pstru)
+		data, typs, stru, extra = decodeDataSet(enc)
 		self.obj._storeData(data, typs, stru)
 
 
+	def _getDataVersion(self, crs):
+		"""Returns the server's version of the cursor's data, or None if it is
+		unknown or the cursor has local changes, so that a delta can't be applied.
+		"""
+		kf = self.obj.KeyField
+		if not isinstance(kf, basestring) or "," in kf:
+			return None
+		version = self._dataVersions.get(crs)
+		if version and crs.isChanged(allRows=True, includeNewUnchanged=True):
+			return None
+		return version
+
+
+	def _mergeDelta(self, changed, deleted, order=None):
+		"""Applies the changed rows, deleted PKs and PK order returned by
+		RemoteBizobj.requeryForClient() to the current cursor's records.
+		"""
+		biz = self.obj
+		crs = biz._CurrentCursor
+		kf = biz.KeyField
+		deleted = set(deleted)
+		changedRecs = dict([(rec[kf], rec) for rec in changed])
+		data = []
+		for rec in crs._records.removeFilters():
+			pk = rec[kf]
+			if pk not in deleted:
+				data.append(changedRecs.pop(pk, rec))
+		# Whatever is left is new.
+		data += [rec for rec in changed if rec[kf] in changedRecs]
+		if order is not None:
+			recs = dict([(rec[kf], rec) for rec in data])
+			data = [recs[pk] for pk in order]
+		biz._storeData(data, crs._types, None)
+
+
 	def requery(self):
 		biz = self.obj
 		biz.setChildLinkFilter()
@@ -103,13 +127,31 @@ class RemoteConnector(object):
 		sqlparams = ustr(biz.getParams())
 		params = {"SQL": sql, "SQLParams": sqlparams, "KeyField": biz.KeyField, "_method": "GET"}
 		prm = urllib.urlencode(params)
+		crs = biz._CurrentCursor
+		headers = {}
+		version = self._getDataVersion(crs)
+		if version:
+			# Lets the server answer with 304 Not Modified, or just the changes.
+			headers["If-None-Match"] = version
+		req = urllib2.Request(url, data=prm, headers=headers)
 		try:
-			res = self.UrlOpener.open(url, data=prm)
+			res = self.UrlOpener.open(req)
 		except urllib2.HTTPError, e:
+			if e.code == 304:
+				crs.lastRequeryTime = time.time()
+				return
 			print "ERR", e
 			return
-		encdata = res.read()
-		self._storeEncodedDataSet(encdata)
+		data, typs, stru, extra = decodeDataSet(res.read())
+		if "deleted" in extra:
+			self._mergeDelta(data, extra["deleted"], extra.get("order"))
+		else:
+			self.obj._storeData(data, typs, stru)
+		newVersion = res.info().getheader("ETag")
+		if newVersion:
+			self._dataVersions[crs] = newVersion
+		else:
+			self._dataVersions.pop(crs, None)
 
 
 	def save(self, startTransaction=False, allRows=False):
@@ -138,6 +180,9 @@ class RemoteConnector(object):
 			# If successful, we need to clear the mementos. We don't need to
 			# store anything; passing None will just  clear the mementos.
 			self.obj._storeData(None, None, None)
+			# New records still have their temporary keys, so the next requery
+			# can't be a delta.
+			self._dataVersions.pop(self.obj._CurrentCursor, None)
 
 
 	def saveAll(self, startTransaction=True):
@@ -151,6 +196,7 @@ class RemoteConnector(object):
 		prm = urllib.urlencode(params)
 		res = self.UrlOpener.open(url, data=prm)
 		encdata = res.read()
+		self._dataVersions.pop(biz._CurrentCursor, None)
 		self._storeEncodedDataSet(encdata)
 
 
@@ -161,6 +207,7 @@ class RemoteConnector(object):
 		prm = urllib.urlencode(params)
 		res = self.UrlOpener.open(url, data=prm)
 		encdata = res.read()
+		self._dataVersions.pop(biz._CurrentCursor, None)
 		self._storeEncodedDataSet(encdata)
 
 
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""Compact serialization of data sets, for sending them between a RemoteBizobj
+and the RemoteConnector of a client bizobj.
+
+The records are stored by column. Each column has a type tag, and columns of
+strings with many repeated values store every distinct value only once. The
+result is JSON, optionally compressed with zlib, so unlike pickle it is safe
+to decode data received from elsewhere.
+
+	enc = encodeDataSet(crs.getDataSet(), crs.getDataTypes(), crs.DataStructure)
+	data, typs, stru, extra = decodeDataSet(enc)
+
+Additional lists of values, such as the PKs of deleted records, can be passed
+as keyword arguments to encodeDataSet(); they are returned in the 'extra' dict.
+
+Values keep their type. Datetime and time values with a time zone come back
+with a fixed-offset tzinfo that has the same UTC offset as the original one.
+The types in the type dict are returned as they were passed for all of the
+value types listed in _typeNames; any other type is returned as the nearest
+of those it is derived from, or None.
+"""
+import base64
+import datetime
+import zlib
+from decimal import Decimal
+import dabo
+import dabo.db
+from dabo.dLocalize import _
+
+# The encoded data starts with one of these.
+_plainPrefix = "DC1j"
+_compressedPrefix = "DC1z"
+# Data shorter than this isn't worth compressing.
+_compressThreshold = 512
+
+# Column type tags, and the functions that convert the values to and from
+# something JSON can hold. None means that no conversion is needed.
+_typeTags = {int: "I", long: "I", bool: "B", float: "F", Decimal: "N",
+		unicode: "C", str: "S", datetime.date: "D", datetime.datetime: "T",
+		datetime.time: "H", datetime.timedelta: "E", buffer: "L", bytearray: "L"}
+
+# The names under which the types in the type dict are encoded.
+_typeNames = dict([(typ.__name__, typ) for typ in (int, long, bool, float, Decimal,
+		unicode, str, datetime.date, datetime.datetime, datetime.time,
+		datetime.timedelta, buffer, bytearray)])
+
+
+class _FixedOffset(datetime.tzinfo):
+	"""The time zone of decoded values that had one: a fixed offset from UTC."""
+	def __init__(self, seconds):
+		self._offset = datetime.timedelta(seconds=seconds)
+		sign = "+-"[seconds < 0]
+		hours, minutes = divmod(abs(seconds) // 60, 60)
+		self._name = "%s%02d:%02d" % (sign, hours, minutes)
+
+	def utcoffset(self, dt):
+		return self._offset
+
+	def dst(self, dt):
+		return datetime.timedelta(0)
+
+	def tzname(self, dt):
+		return self._name
+
+	def __repr__(self):
+		return "<_FixedOffset %s>" % self._name
+
+
+def _offsetSeconds(val):
+	offset = val.utcoffset()
+	return offset.days * 86400 + offset.seconds
+
+
+def _encodeDateTime(val):
+	ret = [val.year, val.month, val.day, val.hour, val.minute, val.second,
+			val.microsecond]
+	if val.utcoffset() is not None:
+		ret.append(_offsetSeconds(val))
+	return ret
+
+
+def _decodeDateTime(val):
+	if len(val) > 7:
+		return datetime.datetime(*val[:7], **{"tzinfo": _FixedOffset(val[7])})
+	return datetime.datetime(*val)
+
+
+def _encodeTime(val):
+	ret = [val.hour, val.minute, val.second, val.microsecond]
+	if val.utcoffset() is not None:
+		ret.append(_offsetSeconds(val))
+	return ret
+
+
+def _decodeTime(val):
+	if len(val) > 4:
+		return datetime.time(*val[:4], **{"tzinfo": _FixedOffset(val[4])})
+	return datetime.time(*val)
+
+
+_encoders = {"I": None, "B": None, "F": None, "C": None,
+		"N": unicode,
+		"S": lambda val: val.decode("latin-1"),
+		"D": lambda val: val.toordinal(),
+		"T": _encodeDateTime,
+		"H": _encodeTime,
+		"E": lambda val: [val.days, val.seconds, val.microseconds],
+		"L": lambda val: base64.b64encode(str(val))}
+
+_decoders = {"I": None, "B": None, "F": None, "C": None,
+		"N": Decimal,
+		"S": lambda val: val.encode("latin-1"),
+		"D": datetime.date.fromordinal,
+		"T": _decodeDateTime,
+		"H": _decodeTime,
+		"E": lambda val: datetime.timedelta(*val),
+		"L": lambda val: buffer(base64.b64decode(val))}
+
+
+def _getTypeTag(val):
+	try:
+		return _typeTags[type(val)]
+	except KeyError:
+		pass
+	for cls in type(val).__mro__:
+		if cls in _typeTags:
+			return _typeTags[cls]
+	raise TypeError(_("Values of type %s cannot be encoded.") % type(val))
+
+
+def _getTypeName(typ):
+	for cls in getattr(typ, "__mro__", ()):
+		if _typeNames.get(cls.__name__) is cls:
+			return cls.__name__
+	return None
+
+
+def _getType(name):
+	if name in _typeNames:
+		return _typeNames[name]
+	# Data encoded before the type names were used holds Dabo type codes.
+	return dabo.db.getPythonType(name)
+
+
+def _getName(name):
+	"""JSON returns all strings as unicode, but field names are normally str."""
+	try:
+		return str(name)
+	except UnicodeEncodeError:
+		return name
+
+
+def _convert(fnc, val):
+	if fnc is None or val is None:
+		return val
+	return fnc(val)
+
+
+def encodeValue(val):
+	"""Returns a (type tag, encoded value) tuple for the value, or None. Values
+	that come back equal from decodeDataSet() have the same JSON for this, even
+	if their types differ, such as int and long.
+	"""
+	if val is None:
+		return None
+	tag = _getTypeTag(val)
+	return (tag, _convert(_encoders[tag], val))
+
+
+def _encodeColumn(vals):
+	"""Returns a list holding the type tag of the column, the encoded values,
+	and for dictionary-encoded columns, the distinct values.
+	"""
+	tags = [_getTypeTag(val) for val in vals if val is not None]
+	tagSet = set(tags)
+	if not tagSet:
+		return ["0", len(vals)]
+	if len(tagSet) > 1:
+		# Mixed types, which SQLite allows. Tag every value.
+		tags = [None] * len(vals)
+		encoded = [None] * len(vals)
+		for pos, val in enumerate(vals):
+			if val is not None:
+				tag = tags[pos] = _getTypeTag(val)
+				encoded[pos] = _convert(_encoders[tag], val)
+		return ["*", encoded, tags]
+	tag = tags[0]
+	encoder = _encoders[tag]
+	if encoder:
+		vals = [_convert(encoder, val) for val in vals]
+	if tag in "CS":
+		distinct = list(set(vals))
+		if 2 * len(distinct) <= len(vals):
+			# Store each value once, and the positions in that list per row.
+			positions = dict([(val, pos) for pos, val in enumerate(distinct)])
+			return [tag, [positions[val] for val in vals], distinct]
+	return [tag, list(vals)]
+
+
+def _decodeColumn(col):
+	tag, vals = col[0], col[1]
+	if tag == "0":
+		return [None] * vals
+	if tag == "*":
+		ret = []
+		for val, valTag in zip(vals, col[2]):
+			if valTag is not None:
+				val = _convert(_decoders[valTag], val)
+			ret.append(val)
+		return ret
+	if len(col) > 2:
+		distinct = col[2]
+		vals = [distinct[pos] for pos in vals]
+	decoder = _decoders[tag]
+	if decoder:
+		vals = [_convert(decoder, val) for val in vals]
+	return vals
+
+
+def encodeDataSet(data, typs=None, stru=None, compress=True, **extra):
+	"""Returns the encoded form of the data, which is a sequence of records
+	with the same fields. The type dict and DataStructure are optional. Any
+	other keyword arguments must be lists of values, which are also encoded.
+	"""
+	fields = []
+	if data:
+		fields = data[0].keys()
+		fieldSet = set(fields)
+		for rec in data:
+			if len(rec) != len(fieldSet):
+				fields += [fld for fld in rec if fld not in fieldSet]
+				fieldSet.update(rec)
+	doc = {"fields": fields, "rows": len(data),
+			"columns": [_encodeColumn([rec.get(fld) for rec in data]) for fld in fields]}
+	if typs is not None:
+		doc["types"] = dict([(fld, _getTypeName(typ))
+				for fld, typ in typs.items()])
+	if stru is not None:
+		doc["structure"] = [list(fld) for fld in stru]
+	if extra:
+		doc["extra"] = dict([(key, _encodeColumn(list(vals)))
+				for key, vals in extra.items()])
+	enc = dabo.lib.jsonEncode(doc)
+	if compress and len(enc) >= _compressThreshold:
+		return _compressedPrefix + zlib.compress(enc)
+	return _plainPrefix + enc
+
+
+def decodeDataSet(enc):
+	"""Returns a (data, types, structure, extra) tuple from the encoded data.
+	The types and structure are None if they weren't encoded; 'extra' is a dict
+	of any other lists of values that were.
+	"""
+	prefix, enc = enc[:4], enc[4:]
+	if prefix == _compressedPrefix:
+		enc = zlib.decompress(enc)
+	elif prefix != _plainPrefix:
+		raise ValueError(_("The data is not in the encoded data set format."))
+	doc = dabo.lib.jsonDecode(enc)
+	fields = [_getName(fld) for fld in doc["fields"]]
+	columns = [_decodeColumn(col) for col in doc["columns"]]
+	data = [dict(zip(fields, vals)) for vals in zip(*columns)]
+	if not columns:
+		data = [{} for num in range(doc["rows"])]
+	typs = doc.get("types")
+	if typs is not None:
+		typs = dict([(_getName(fld), _getType(typ))
+				for fld, typ in typs.items()])
+	stru = doc.get("structure")
+	if stru is not None:
+		stru = tuple([tuple([isinstance(val, unicode) and _getName(val) or val
+				for val in fld]) for fld in stru])
+	extra = dict([(_getName(key), _decodeColumn(col))
+			for key, col in doc.get("extra", {}).items()])
+	return (data, typs, stru, extra)
@@ -27,6 +27,8 @@ class Grid(dabo.ui.dGrid):
 		self._multipleSelection = False
 		# Turn on alternate row coloring
 		self.AlternateRowColoring = True
+		# Page through bizobjs that have a PageSize
+		self.ScrollPaging = True
 
 		super(Grid, self)._initProperties()
 
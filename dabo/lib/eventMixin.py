@@ -15,9 +15,14 @@ class EventMixin(object):
 	"""
 	def bindEvent(self, eventClass, function, _auto=False):
 		"""Bind a dEvent to a callback function."""
-		eb = self._EventBindings
-		if (eventClass, function) not in [(b[0], b[1]) for b in eb]:
-			eb.append((eventClass, function, _auto))
+		handlers = self._EventHandlers
+		try:
+			functions, autoFlags = handlers[eventClass]
+		except KeyError:
+			functions, autoFlags = handlers[eventClass] = ([], {})
+		if function not in autoFlags:
+			functions.append(function)
+			autoFlags[function] = _auto
 
 
 	def bindEvents(self, bindings):
@@ -46,8 +51,16 @@ class EventMixin(object):
 		the event class (dEvents.Hit, for example) as the only parameter.
 		"""
 
-		# Instantiate the event, no matter if there aren't any bindings: the event
-		# did happen, after all, and perhaps we want to log that fact.
+		try:
+			functions = self._EventHandlers[eventClass][0]
+		except KeyError:
+			functions = None
+		if not functions and not dabo.eventLogging:
+			# Nothing is bound to the event, and it doesn't need to be logged, so
+			# there's no need to instantiate it.
+			if uiEvent is not None:
+				return dabo.ui.continueEvent(uiEvent)
+			return None
 
 		# self.__raisedEvents keeps track of the event being raised, to check against
 		# handling the same event twice, resulting from one of the event handlers causing
@@ -70,19 +83,18 @@ class EventMixin(object):
 		event = eventClass(evtObject, uiEvent=uiEvent,
 				eventData=eventData, *args, **kwargs)
 
-		# Now iterate the bindings, and execute the callbacks:
+		# Now execute the callbacks. Iterate over a copy, since the callbacks
+		# may bind or unbind events.
+		functions = list(functions or ())
 		if dabo.reverseEventsOrder:
-			bindings = reversed(self._EventBindings)
-		else:
-			bindings = self._EventBindings
-		for binding in bindings:
-			bindingClass, bindingFunction = binding[0], binding[1]
-			if bindingClass == eventClass:
-				bindingFunction(event)
+			functions.reverse()
+		for function in functions:
+			function(event)
 			if not event.Continue:
 				# The event handler set the Continue flag to False, specifying that
 				# no more event handlers should process the event.
 				break
+		event._releaseUIEvent()
 		try:
 			self.__raisedEvents.pop()
 		except (AttributeError, IndexError):
@@ -111,27 +123,38 @@ class EventMixin(object):
 		removed. If both event and function are None, all event bindings are
 		removed.
 		"""
+		handlers = self._EventHandlers
 		if eventClass is None and function is None:
-			# Short-circuit: blank the entire list of _EventBindings
-			self._EventBindings = []
+			# Short-circuit: remove all the bindings
+			handlers.clear()
+		elif function is None:
+			handlers.pop(eventClass, None)
 		else:
-			# Iterate through _EventBindings and remove the appropriate ones
-			eb = self._EventBindings[:]
-			num = len(self._EventBindings)
-			self._EventBindings = []
-			newBindings = []
-			while eb:
-				binding = eb.pop()
-				bindingClass, bindingFunction = binding[0], binding[1]
-
-				if (eventClass is None or bindingClass == eventClass) and (
-					function is None or bindingFunction == function):
-						# Matched: already popped off, do nothing
-						pass
-				else:
-					# Not matched: put it back
-					newBindings.append(binding)
-			self._EventBindings = newBindings
+			if eventClass is None:
+				eventClasses = handlers.keys()
+			else:
+				eventClasses = [eventClass]
+			for cls in eventClasses:
+				self._removeBinding(cls, function)
+
+
+	def _removeBinding(self, eventClass, function):
+		"""Remove the binding of the function to the event class, if there is one."""
+		handlers = self._EventHandlers
+		try:
+			functions, autoFlags = handlers[eventClass]
+		except KeyError:
+			return
+		if function not in autoFlags:
+			return
+		del autoFlags[function]
+		# Rebuild the list instead of changing it, so that a raiseEvent() in
+		# progress isn't affected.
+		functions = [func for func in functions if func != function]
+		if functions:
+			handlers[eventClass] = (functions, autoFlags)
+		else:
+			del handlers[eventClass]
 
 
 	def autoBindEvents(self, force=True):
@@ -296,30 +319,43 @@ class EventMixin(object):
 
 	def _removeAutoBindings(self):
 		"""Remove all event bindings originally set by autoBindEvents()."""
-		toRemove = []
-		for idx, binding in enumerate(self._EventBindings):
-			if binding[2]:
-				toRemove.append(idx)
-		toRemove.reverse()
-		for idx in toRemove:
-			del(self._EventBindings[idx])
+		for eventClass, (functions, autoFlags) in self._EventHandlers.items():
+			for function in [func for func in functions if autoFlags[func]]:
+				self._removeBinding(eventClass, function)
 
 
 	def _getEventBindings(self):
-		try:
-			return self._eventBindings
-		except AttributeError:
-			self._eventBindings = []
-			return self._eventBindings
+		bindings = []
+		for eventClass, (functions, autoFlags) in self._EventHandlers.items():
+			bindings.extend([(eventClass, function, autoFlags[function])
+					for function in functions])
+		return bindings
 
 	def _setEventBindings(self, val):
 		if isinstance(val, list):
-			self._eventBindings = val
+			self._EventHandlers.clear()
+			for binding in val:
+				self.bindEvent(*binding)
 		else:
 			raise ValueError("EventBindings must be a list.")
 
+
+	def _getEventHandlers(self):
+		try:
+			return self._eventHandlers
+		except AttributeError:
+			self._eventHandlers = {}
+			return self._eventHandlers
+
+
 	_EventBindings = property(_getEventBindings, _setEventBindings, None,
-		_("The list of event bindings ([Event, callback]) for this object."))
+		_("""A list of the event bindings (Event, callback, auto) of this object. It is
+		built from _EventHandlers, so changing the list itself has no effect."""))
+
+	_EventHandlers = property(_getEventHandlers, None, None,
+		_("""Dict of the event bindings of this object. The keys are the event classes,
+		and the values are 2-tuples of the list of callbacks, in the order they were
+		bound, and a dict of the callbacks with their auto-bound flags."""))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import threading
+from dabo.dLocalize import _
+
+
+class LRUCache(object):
+	"""
+	Mapping that holds at most MaxSize items. When it grows past that, the
+	least recently used items are discarded; a quarter of them at a time, so
+	that the cost of finding them is spread over many stores. All operations
+	are thread-safe.
+
+		cache = LRUCache(100)
+		cache[key] = val
+		val = cache.get(key)
+	"""
+	def __init__(self, maxSize=256):
+		self._maxSize = maxSize
+		# Values are [value, tick] lists; the tick is updated on every access.
+		self._data = {}
+		self._tick = 0
+		self._hits = self._misses = 0
+		self._lock = threading.Lock()
+
+
+	def get(self, key, default=None):
+		"""Return the value for key, or default if it isn't cached."""
+		self._lock.acquire()
+		try:
+			try:
+				entry = self._data[key]
+			except KeyError:
+				self._misses += 1
+				return default
+			self._tick += 1
+			entry[1] = self._tick
+			self._hits += 1
+			return entry[0]
+		finally:
+			self._lock.release()
+
+
+	def pop(self, key, default=None):
+		"""Remove key, returning its value, or default if it isn't cached."""
+		self._lock.acquire()
+		try:
+			try:
+				return self._data.pop(key)[0]
+			except KeyError:
+				return default
+		finally:
+			self._lock.release()
+
+
+	def clear(self):
+		self._lock.acquire()
+		try:
+			self._data.clear()
+		finally:
+			self._lock.release()
+
+
+	def keys(self):
+		"""Return the cached keys, least recently used first."""
+		self._lock.acquire()
+		try:
+			items = self._data.items()
+		finally:
+			self._lock.release()
+		items.sort(key=lambda item: item[1][1])
+		return [item[0] for item in items]
+
+
+	def __getitem__(self, key):
+		ret = self.get(key, self)
+		if ret is self:
+			raise KeyError(key)
+		return ret
+
+
+	def __setitem__(self, key, val):
+		self._lock.acquire()
+		try:
+			self._tick += 1
+			self._data[key] = [val, self._tick]
+			if self._maxSize is not None and len(self._data) > self._maxSize:
+				self._trim()
+		finally:
+			self._lock.release()
+
+
+	def __delitem__(self, key):
+		self._lock.acquire()
+		try:
+			del self._data[key]
+		finally:
+			self._lock.release()
+
+
+	def __contains__(self, key):
+		return key in self._data
+
+
+	def __len__(self):
+		return len(self._data)
+
+
+	def _trim(self):
+		"""Drop the least recently used items. Must be called with the lock held."""
+		maxSize = self._maxSize
+		keep = max(1, maxSize - maxSize // 4)
+		if len(self._data) <= keep:
+			return
+		ticks = [entry[1] for entry in self._data.itervalues()]
+		ticks.sort()
+		oldest = ticks[-keep]
+		for key, entry in self._data.items():
+			if entry[1] < oldest:
+				del self._data[key]
+
+
+	def _getHits(self):
+		return self._hits
+
+
+	def _getMaxSize(self):
+		return self._maxSize
+
+	def _setMaxSize(self, val):
+		self._lock.acquire()
+		try:
+			self._maxSize = val
+			if val is not None and len(self._data) > val:
+				self._trim()
+		finally:
+			self._lock.release()
+
+
+	def _getMisses(self):
+		return self._misses
+
+
+	Hits = property(_getHits, None, None,
+			_("Number of get() calls that found their key.  (int)"))
+
+	MaxSize = property(_getMaxSize, _setMaxSize, None,
+			_("Maximum number of items to hold, or None for no limit.  (int)"))
+
+	Misses = property(_getMisses, None, None,
+			_("Number of get() calls that didn't find their key.  (int)"))
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import copy
 import datetime
+import itertools
 
 import decimal
 Decimal = decimal.Decimal
@@ -52,6 +53,8 @@ import reportlab.lib.styles as styles
 import reportlab.platypus as platypus
 #import reportlab.lib.colors as colors
 import dabo
+import dabo.db
+import dabo.biz
 from dabo import getEncoding
 from dabo.lib.xmltodict import xmltodict
 from dabo.lib.xmltodict import dicttoxml
@@ -117,6 +120,31 @@ PROPS_TO_SKIP_DEF = ("designerlock", "totalheight", "comment")
 substitutedFontNames = []   ## keep track of which fonts we've already substituted, to limit logging
 
 
+# Compiled property expressions, shared by all report objects. Each value is
+# a (code, isConstant) tuple. An expression is constant when it doesn't look up
+# any names, such as '"Helvetica"', '10.5' or '(0, 0, 0)'.
+_compiledExpressions = {}
+
+def _compileExpression(expr):
+	"""Return the (code, isConstant) tuple for the passed expression string."""
+	try:
+		return _compiledExpressions[expr]
+	except KeyError:
+		pass
+	code = compile(expr, "<report expression>", "eval")
+	ret = _compiledExpressions[expr] = (code, not code.co_names)
+	return ret
+
+
+def _isImmutable(val):
+	"""Return True if val can be safely shared between getProp() calls."""
+	if isinstance(val, (basestring, bool, int, long, float, Decimal, type(None))):
+		return True
+	if isinstance(val, tuple):
+		return all(_isImmutable(v) for v in val)
+	return False
+
+
 def toPropDict(dataType, default, doc):
 	return {"dataType": dataType, "default": default, "doc": doc}
 
@@ -247,9 +275,15 @@ class Objects(ReportObjectCollection): pass
 
 class ReportObject(CaselessDict):
 	"""Abstract report object, such as a drawable object, a variable, or a group."""
+	## Incremented by setProp() and at the start of each report run, to
+	## invalidate the constant property values cached by getProp().
+	_propGeneration = 0
+
 	def __init__(self, parent=None, *args, **kwargs):
 		super(ReportObject, self).__init__(*args, **kwargs)
 		self.parent = parent
+		self._propCache = {}
+		self._propCacheGeneration = ReportObject._propGeneration
 		self.initAvailableProps()
 		self.insertRequiredElements()
 
@@ -330,15 +364,41 @@ class ReportObject(CaselessDict):
 		If defined, it will be eval()'d. Otherwise,	the default will be returned.
 		If there isn't a default, an exception will be raised as the object isn't
 		set up to have the passed prop.
+
+		Expressions are compiled only once, and the values of constant expressions
+		(ones that don't reference self, fields, variables or functions) are cached
+		until the next setProp() call or report run.
 		"""
+		if not evaluate or prop == "type":
+			return self._getProp(prop, evaluate, returnException)[0]
+		expr = self.get(prop)
+		if self._propCacheGeneration != ReportObject._propGeneration:
+			self._propCache.clear()
+			self._propCacheGeneration = ReportObject._propGeneration
+		else:
+			cached = self._propCache.get(prop)
+			if cached is not None and cached[0] == expr:
+				return cached[1]
+		val, isConstant = self._getProp(prop, evaluate, returnException)
+		if isConstant and _isImmutable(val):
+			self._propCache[prop] = (expr, val)
+		return val
+
+
+	def _getProp(self, prop, evaluate, returnException):
+		"""Return a (value, isConstant) tuple for getProp()."""
+		def evalExpr(expr):
+			code, isConstant = _compileExpression(expr)
+			return eval(code, globals(), {"self": self}), isConstant
+
 		def getDefault(prop):
 			if prop[-4:] != "_def":
 				# First try the default (<prop>_def) value:
 				try:
 					ret = self["%s_def" % prop]
 					if evaluate:
-						ret = eval(ret)
-					return ret
+						return evalExpr(ret)
+					return ret, False
 				except StandardError:
 					pass
 
@@ -348,14 +408,14 @@ class ReportObject(CaselessDict):
 				try:
 					ret = self.ReportForm["Defaults"][prop]
 					if evaluate:
-						ret = eval(ret)
-					return ret
+						return evalExpr(ret)
+					return ret, False
 				except StandardError:
 					try:
 						ret = self.ReportForm["Defaults"][prop[:-4]]
 						if evaluate:
-							ret = eval(ret)
-						return ret
+							return evalExpr(ret)
+						return ret, False
 					except StandardError:
 						pass
 
@@ -367,21 +427,22 @@ class ReportObject(CaselessDict):
 				val = self.AvailableProps[prop]["default"]
 				if not evaluate:
 					# defaults are not stringified:
-					val = repr(val)
-				return val
+					return repr(val), False
+				return val, True
 			else:
 				raise ValueError("Property name '%s' unrecognized." % prop)
 
 		if prop in self:
 			if not evaluate or prop == "type":
-				return self[prop]
+				return self[prop], False
 			try:
-				return eval(self[prop])
+				return evalExpr(self[prop])
 			except Exception, e:
-				# eval() failed. Return the default or the exception string.
+				# eval() failed. Return the default or the exception string. Never
+				# cache it: the expression may well work for the next record.
 				if returnException:
-					return e
-				return getDefault(prop)
+					return e, False
+				return getDefault(prop)[0], False
 		else:
 			# The prop isn't defined, use the default.
 			return getDefault(prop)
@@ -403,6 +464,8 @@ class ReportObject(CaselessDict):
 		if logUndo:
 			self.Report.reportWriter.storeUndo(self, prop, self.getProp(prop, evaluate=False), val)
 		self[prop] = val
+		# Other objects may be using this one as their default:
+		ReportObject._propGeneration += 1
 
 
 	def getPropVal(self, propName):
@@ -1255,6 +1318,14 @@ class ReportWriter(object):
 	get the data denormalized into one cursor, and then call ReportWriter
 	feeding it the Cursor, Report Form, and OutputFile.
 
+	The Cursor doesn't need to be a list: it can also be a generator or any
+	other iterable of dictionaries, or a DB-API cursor with an executed
+	statement, which will be fetched FetchSize rows at a time. Such cursors
+	are consumed as the report prints, so only the current and previous records
+	are held in memory, and RecordCount will be None. A Dabo cursor or bizobj
+	is read FetchSize records at a time with getDataSet(), so that its virtual
+	fields are included.
+
 	More documentation will come.
 	"""
 	_clearMemento = True
@@ -1289,7 +1360,11 @@ class ReportWriter(object):
 
 	def _onReportIteration(self):
 		if self.PrintStatus:
-			print "Processing row %s of %s..." % (self.RecordNumber + 1, len(self.Cursor))
+			recCount = self.RecordCount
+			if recCount is None:
+				print "Processing row %s..." % (self.RecordNumber + 1)
+			else:
+				print "Processing row %s of %s..." % (self.RecordNumber + 1, recCount)
 			sys.stdout.flush()
 
 	def _onReportEnd(self):
@@ -1297,6 +1372,39 @@ class ReportWriter(object):
 			print "Report End."
 
 
+	def _iterCursor(self, cursor):
+		"""Return an iterator over the records of the passed cursor."""
+		if isinstance(cursor, (dabo.db.dCursorMixin, dabo.biz.dBizobj)):
+			# These are DB-API cursors too, but hold their records already.
+			return self._iterDaboCursor(cursor)
+		if hasattr(cursor, "fetchmany") and hasattr(cursor, "description"):
+			return self._iterDbapiCursor(cursor)
+		return iter(cursor)
+
+	def _iterDaboCursor(self, cursor):
+		"""Yield the records of a Dabo cursor or bizobj, FetchSize rows at a time."""
+		fetchSize = self.FetchSize
+		for rowStart in xrange(0, cursor.RowCount, fetchSize):
+			for rec in cursor.getDataSet(rowStart=rowStart, rows=fetchSize):
+				yield rec
+
+	def _iterDbapiCursor(self, cursor):
+		"""Yield the rows of a DB-API cursor as dicts, FetchSize rows at a time."""
+		names = None
+		fetchSize = self.FetchSize
+		while True:
+			rows = cursor.fetchmany(fetchSize)
+			if not rows:
+				break
+			if names is None:
+				names = [d[0] for d in cursor.description]
+			for row in rows:
+				if isinstance(row, dict):
+					yield row
+				else:
+					yield dict(zip(names, row))
+
+
 	def getFramesetCount(self):
 		"""Returns the number of framesets in the report."""
 		return len(self.getFramesets())
@@ -2129,6 +2237,9 @@ class ReportWriter(object):
 		if _form is None:
 			raise ValueError("ReportForm must be set first.")
 
+		# Don't carry cached property values over from a previous run:
+		ReportObject._propGeneration += 1
+
 		_form.reportWriter = self
 
 		_outputFile = self.OutputFile
@@ -2190,9 +2301,28 @@ class ReportWriter(object):
 		self._recordNumber = 0
 		self._currentColumn = 0
 
-		## Let the page header have access to the first record:
-		if len(self.Cursor) > 0:
-			self.Record = self.Cursor[0]
+		## Get the Cursor once: it may be a one-shot iterator, or the TestCursor,
+		## which is re-evaluated on every access.
+		_cursor = self.Cursor
+		if isinstance(_cursor, (dabo.db.dCursorMixin, dabo.biz.dBizobj)):
+			self._recordCount = _cursor.RowCount
+		else:
+			try:
+				self._recordCount = len(_cursor)
+			except TypeError:
+				# Streaming cursor: the count isn't known until the end.
+				self._recordCount = None
+		_records = self._iterCursor(_cursor)
+
+		## Let the page header have access to the first record, which is the
+		## only one we need to read ahead:
+		try:
+			_firstRecord = _records.next()
+		except StopIteration:
+			_records = iter(())
+		else:
+			self.Record = _firstRecord
+			_records = itertools.chain((_firstRecord,), _records)
 
 		def processVariables(forceReset=False):
 			"""Apply the user's expressions to the current value of all the report vars.
@@ -2342,7 +2472,7 @@ class ReportWriter(object):
 				if y < check or maxBandHeight is None:
 					# Move to the next page or column
 					headers_reprinted = False
-					if self.RecordNumber <= len(self.Cursor):
+					if self.RecordCount is None or self.RecordNumber <= self.RecordCount:
 						headers_reprinted = False
 						if self._currentColumn >= columnCount-1:
 							# Move to next page
@@ -2576,7 +2706,7 @@ class ReportWriter(object):
 
 		# Print the dynamic bands (Detail, GroupHeader, GroupFooter):
 		y = None
-		for cursor_idx, record in enumerate(self.Cursor):
+		for cursor_idx, record in enumerate(_records):
 			if self._cancel:
 				self._onReportCancel()
 				return
@@ -2664,6 +2794,9 @@ class ReportWriter(object):
 			self._recordNumber += 1
 
 
+		if self._recordCount is None:
+			self._recordCount = self._recordNumber
+
 		# print the group footers for the last group:
 		for idx, group in enumerate(groupsDesc):
 			y = printBand("groupFooter", y, group)
@@ -2999,6 +3132,7 @@ class ReportWriter(object):
 	def _setCursor(self, val):
 		self._cursor = val
 		self.UseTestCursor = False
+		self._resetRecordCount()
 
 
 	def _getEncoding(self):
@@ -3085,6 +3219,39 @@ class ReportWriter(object):
 			self.ReportForm._liveRecord = val
 
 
+	def _getFetchSize(self):
+		try:
+			v = self._fetchSize
+		except AttributeError:
+			v = self._fetchSize = 1000
+		return v
+
+	def _setFetchSize(self, val):
+		self._fetchSize = int(val)
+
+
+	def _getRecordCount(self):
+		try:
+			v = self._recordCount
+		except AttributeError:
+			# No report has run against this Cursor yet:
+			cursor = self.Cursor
+			if isinstance(cursor, (dabo.db.dCursorMixin, dabo.biz.dBizobj)):
+				v = cursor.RowCount
+			else:
+				try:
+					v = len(cursor)
+				except TypeError:
+					v = None
+		return v
+
+	def _resetRecordCount(self):
+		try:
+			del self._recordCount
+		except AttributeError:
+			pass
+
+
 	def _getRecordNumber(self):
 		try:
 			v = self._recordNumber
@@ -3185,6 +3352,7 @@ class ReportWriter(object):
 
 	def _setUseTestCursor(self, val):
 		self._useTestCursor = bool(val)
+		self._resetRecordCount()
 		if val:
 			self._cursor = None
 
@@ -3220,6 +3388,10 @@ class ReportWriter(object):
 		If None, self.Application.NoneDisplay will be used. If there's no
 		instantiated dApp, then "< None >" will be used."""))
 
+	FetchSize = property(_getFetchSize, _setFetchSize, None,
+		_("""Specifies the number of rows fetched at a time when the Cursor is a
+		DB-API cursor. (int, default 1000)"""))
+
 	PrintStatus = property(_getPrintStatus, _setPrintStatus, None,
 		_("""Specifies whether status info is printed to stdout."""))
 
@@ -3241,6 +3413,12 @@ class ReportWriter(object):
 			self.Record["cFirst"]
 		"""))
 
+	RecordCount = property(_getRecordCount, None, None,
+		_("""Returns the number of records in Cursor.
+
+		Returns None while a streaming Cursor (a generator or DB-API cursor) is
+		being printed, as the count isn't known until all records are read."""))
+
 	RecordNumber = property(_getRecordNumber, None, None,
 		_("Returns the current record number of Cursor."))
 
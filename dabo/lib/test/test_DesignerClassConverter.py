@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import dabo
+import dabo.lib.DesignerClassConverter as dcc
+from dabo.lib.DesignerClassConverter import DesignerClassConverter
+
+
+CDXML = """<?xml version="1.0" encoding="utf-8" standalone="no"?>
+<dForm Caption="%s" Name="dForm" code-ID="dForm-dForm" designerClass="DesForm" Height="200" Width="300" />
+"""
+
+CODE = """# -*- coding: utf-8 -*-
+## *!* ## Dabo Code ID: dForm-dForm
+def hello(self):
+	return "hello"
+"""
+
+
+class Test_ClassCache(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.srcFile = os.path.join(self.tempDir, "form.cdxml")
+		self.writeFile(self.srcFile, CDXML % "First")
+		self.saveCacheDir = dcc._classCacheDir
+		dcc._classCacheDir = os.path.join(self.tempDir, "cache")
+		os.mkdir(dcc._classCacheDir)
+		dcc._classCache.clear()
+		# Count the times the class code is generated.
+		self.generated = 0
+		def createClassText(conv, *args, **kwargs):
+			self.generated += 1
+			return DesignerClassConverter.createClassText(conv, *args, **kwargs)
+		self.createClassText = createClassText
+
+	def tearDown(self):
+		dcc._classCacheDir = self.saveCacheDir
+		dcc._classCache.clear()
+		shutil.rmtree(self.tempDir)
+
+	def writeFile(self, pth, txt):
+		# Make sure the modification time changes.
+		if os.path.exists(pth):
+			mtime = os.stat(pth).st_mtime
+			while time.time() <= mtime + 0.01:
+				time.sleep(0.01)
+		open(pth, "w").write(txt)
+
+	def getClass(self, src=None):
+		conv = DesignerClassConverter()
+		conv.createClassText = lambda *args, **kwargs: self.createClassText(conv,
+				*args, **kwargs)
+		return conv.classFromText(src or self.srcFile)
+
+	def getCaption(self, cls):
+		return cls.__init__.im_func.func_defaults[1]["Caption"]
+
+	def test_pruneCacheDir(self):
+		cacheDir = dcc._classCacheDir
+		for num, cacheKey in enumerate(("old", "mid", "new", "same")):
+			for ext in ("dcc", "py"):
+				pth = os.path.join(cacheDir, "%s.%s" % (cacheKey, ext))
+				open(pth, "w").write("")
+				# "same" has the same mtime as "new".
+				os.utime(pth, (1000, 1000 + min(num, 2)))
+		dcc._pruneClassCacheDir(cacheDir, 2, "same")
+		self.assertEqual(sorted(os.listdir(cacheDir)),
+				["new.dcc", "new.py", "same.dcc", "same.py"])
+
+	def test_cached(self):
+		cls = self.getClass()
+		self.assertEqual(self.getCaption(cls), "First")
+		cls2 = self.getClass()
+		self.assertEqual(self.generated, 1)
+		self.assertEqual(cls2.__name__, cls.__name__)
+		self.assertFalse(cls2 is cls)
+		# The on-disk copy is used when the class isn't in memory.
+		dcc._classCache.clear()
+		self.assertEqual(self.getCaption(self.getClass()), "First")
+		self.assertEqual(self.generated, 1)
+
+	def test_invalidate(self):
+		self.getClass()
+		self.writeFile(self.srcFile, CDXML % "Second")
+		self.assertEqual(self.getCaption(self.getClass()), "Second")
+		self.assertEqual(self.generated, 2)
+		# Adding a code file changes the class, too.
+		self.writeFile(os.path.join(self.tempDir, "form-code.py"), CODE)
+		self.assertEqual(self.getClass().hello.im_func(None), "hello")
+		self.assertEqual(self.generated, 3)
+		self.getClass()
+		self.assertEqual(self.generated, 3)
+
+	def test_rawText(self):
+		self.getClass(CDXML % "Raw")
+		self.getClass(CDXML % "Raw")
+		self.assertEqual(self.generated, 1)
+		self.assertEqual(self.getCaption(self.getClass(CDXML % "Other")), "Other")
+		self.assertEqual(self.generated, 2)
+
+	def test_disabled(self):
+		dabo.cacheDesignerClasses = False
+		try:
+			self.getClass()
+			self.getClass()
+		finally:
+			dabo.cacheDesignerClasses = True
+		self.assertEqual(self.generated, 2)
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_ClassCache)
+	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import datetime
+import unittest
+from decimal import Decimal
+from dabo.lib import dataCodec
+
+
+class Test_dataCodec(unittest.TestCase):
+	def roundTrip(self, data, *args, **kwargs):
+		return dataCodec.decodeDataSet(dataCodec.encodeDataSet(data, *args, **kwargs))
+
+	def test_types(self):
+		data = [{"i": 1, "g": 2 ** 70, "b": True, "f": 1.5, "n": Decimal("0.00"),
+				"c": u"Ägypten", "s": "abc\xff", "d": datetime.date(2010, 5, 6),
+				"t": datetime.datetime(2010, 5, 6, 7, 8, 9, 10), "l": buffer("\x00\x01"),
+				"h": datetime.time(7, 8, 9, 10), "e": datetime.timedelta(-1, 5, 6)},
+				dict.fromkeys("igbfncsdtlhe")]
+		ret = self.roundTrip(data)[0]
+		self.assertEqual(ret, data)
+		for fld, val in data[0].items():
+			self.assertEqual(type(ret[0][fld]), type(val))
+
+	def test_timeZones(self):
+		class EST(datetime.tzinfo):
+			def utcoffset(self, dt):
+				return datetime.timedelta(hours=-5)
+			def dst(self, dt):
+				return datetime.timedelta(0)
+		data = [{"t": datetime.datetime(2010, 5, 6, 7, 8, 9, tzinfo=EST()),
+				"h": datetime.time(7, 8, tzinfo=EST())}]
+		ret = self.roundTrip(data)[0][0]
+		self.assertEqual(ret, data[0])
+		self.assertEqual(ret["t"].utcoffset(), datetime.timedelta(hours=-5))
+		self.assertEqual(ret["h"].tzname(), "-05:00")
+
+	def test_typesKept(self):
+		class Name(unicode):
+			pass
+		typs = {"s": str, "l": long, "h": datetime.time, "n": Name, "o": object}
+		retTyps = self.roundTrip([], typs)[1]
+		self.assertEqual(retTyps, {"s": str, "l": long, "h": datetime.time,
+				"n": unicode, "o": None})
+		# Older data holds Dabo type codes.
+		self.assertEqual(dataCodec._getType("M"), unicode)
+
+	def test_typesAndStructure(self):
+		typs = {"pk": int, "name": unicode, "amount": Decimal}
+		stru = (("pk", "I", True, "t", "pk", None), ("amount", "N", False, "t", "amount", 2))
+		data, retTyps, retStru, extra = self.roundTrip([], typs, stru)
+		self.assertEqual((data, retTyps, retStru, extra), ([], typs, stru, {}))
+		self.assertEqual(type(retStru[0][0]), str)
+
+	def test_mixedColumn(self):
+		data = [{"val": 1}, {"val": u"one"}, {"val": None}, {"val": Decimal("1.0")}]
+		ret = self.roundTrip(data)[0]
+		self.assertEqual([type(rec["val"]) for rec in ret],
+				[int, unicode, type(None), Decimal])
+
+	def test_dictionaryEncoding(self):
+		data = [{"pk": num, "state": [u"open", u"closed", None][num % 3]} for num in range(300)]
+		enc = dataCodec.encodeDataSet(data, compress=False)
+		self.assertEqual(enc.count("closed"), 1)
+		self.assertEqual(self.roundTrip(data)[0], data)
+
+	def test_compression(self):
+		data = [{"pk": num, "name": u"Name %s" % num} for num in range(300)]
+		plain = dataCodec.encodeDataSet(data, compress=False)
+		compressed = dataCodec.encodeDataSet(data)
+		self.assertTrue(len(compressed) < len(plain))
+		self.assertEqual(dataCodec.decodeDataSet(compressed)[0], data)
+
+	def test_extra(self):
+		data, typs, stru, extra = self.roundTrip([], deleted=[3, None, u"x"], order=[])
+		self.assertEqual(extra, {"deleted": [3, None, u"x"], "order": []})
+
+	def test_errors(self):
+		self.assertRaises(TypeError, dataCodec.encodeDataSet, [{"val": object()}])
+		self.assertRaises(ValueError, dataCodec.decodeDataSet, "(lp0\n.")
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_dataCodec)
+	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+import dabo
+import dabo.dEvents as dEvents
+from dabo.lib.eventMixin import EventMixin
+
+
+class Test_EventMixin(unittest.TestCase):
+	def setUp(self):
+		self.obj = EventMixin()
+		self.calls = []
+		self.reverseEventsOrder = dabo.reverseEventsOrder
+		dabo.reverseEventsOrder = False
+
+	def tearDown(self):
+		dabo.reverseEventsOrder = self.reverseEventsOrder
+
+	def handler(self, name, stop=False):
+		def func(evt):
+			self.calls.append(name)
+			if stop:
+				evt.stop()
+		return func
+
+	def test_raiseOrder(self):
+		obj = self.obj
+		first, second = self.handler("first"), self.handler("second")
+		obj.bindEvent(dEvents.Hit, first)
+		obj.bindEvent(dEvents.Update, self.handler("update"))
+		obj.bindEvent(dEvents.Hit, second)
+		obj.bindEvent(dEvents.Hit, first)
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, ["first", "second"])
+		dabo.reverseEventsOrder = True
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, ["first", "second", "second", "first"])
+
+	def test_Continue(self):
+		obj = self.obj
+		obj.bindEvent(dEvents.Hit, self.handler("first", stop=True))
+		obj.bindEvent(dEvents.Hit, self.handler("second"))
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, ["first"])
+
+	def test_raiseUnbound(self):
+		created = []
+		class Counted(dEvents.Hit):
+			def __init__(self, *args, **kwargs):
+				created.append(self)
+				super(Counted, self).__init__(*args, **kwargs)
+		obj = self.obj
+		obj.bindEvent(dEvents.Hit, self.handler("hit"))
+		obj.raiseEvent(Counted)
+		self.assertEqual(created, [])
+		obj.bindEvent(Counted, self.handler("counted"))
+		obj.raiseEvent(Counted)
+		self.assertEqual(len(created), 1)
+		self.assertEqual(self.calls, ["counted"])
+
+	def test_unbindEvent(self):
+		obj = self.obj
+		first, second = self.handler("first"), self.handler("second")
+		obj.bindEvent(dEvents.Hit, first)
+		obj.bindEvent(dEvents.Update, first)
+		obj.bindEvent(dEvents.Hit, second)
+		obj.unbindEvent(dEvents.Hit, first)
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, ["second"])
+		obj.unbindEvent(function=first)
+		self.assertEqual(obj._EventBindings, [(dEvents.Hit, second, False)])
+		obj.unbindEvent()
+		self.assertEqual(obj._EventBindings, [])
+
+	def test_removeAutoBindings(self):
+		obj = self.obj
+		first, second = self.handler("first"), self.handler("second")
+		obj.bindEvent(dEvents.Hit, first, _auto=True)
+		obj.bindEvent(dEvents.Hit, second)
+		obj._removeAutoBindings()
+		self.assertEqual(obj._EventBindings, [(dEvents.Hit, second, False)])
+
+	def test_EventBindings(self):
+		obj = self.obj
+		obj.bindEvent(dEvents.Hit, self.handler("first"))
+		bindings = obj._EventBindings
+		obj._EventBindings = []
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, [])
+		obj._EventBindings = bindings
+		obj.raiseEvent(dEvents.Hit)
+		self.assertEqual(self.calls, ["first"])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import unittest
+from dabo.lib.lruCache import LRUCache
+
+
+class Test_LRUCache(unittest.TestCase):
+	def test_getSet(self):
+		cache = LRUCache(10)
+		cache["a"] = 1
+		self.assertEqual(cache["a"], 1)
+		self.assertEqual(cache.get("b"), None)
+		self.assertEqual(cache.get("b", 2), 2)
+		self.assertRaises(KeyError, cache.__getitem__, "b")
+		self.assertTrue("a" in cache)
+		self.assertEqual((cache.Hits, cache.Misses), (1, 3))
+		self.assertEqual(cache.pop("a"), 1)
+		self.assertEqual(len(cache), 0)
+
+	def test_eviction(self):
+		cache = LRUCache(8)
+		for num in range(8):
+			cache[num] = num
+		# Using 0 makes 1 the least recently used.
+		cache.get(0)
+		cache[8] = 8
+		self.assertEqual(len(cache), 6)
+		self.assertTrue(0 in cache)
+		self.assertTrue(8 in cache)
+		for num in (1, 2, 3):
+			self.assertFalse(num in cache)
+		self.assertEqual(cache.keys(), [4, 5, 6, 7, 0, 8])
+
+	def test_maxSize(self):
+		cache = LRUCache(1)
+		cache["a"] = 1
+		cache["b"] = 2
+		self.assertEqual(cache.keys(), ["b"])
+		cache.MaxSize = None
+		for num in range(100):
+			cache[num] = num
+		self.assertEqual(len(cache), 101)
+		cache.MaxSize = 4
+		self.assertEqual(cache.keys(), [97, 98, 99])
+
+
+if __name__ == "__main__":
+	suite = unittest.TestLoader().loadTestsFromTestCase(Test_LRUCache)
+	unittest.TextTestRunner(verbosity=2).run(suite)
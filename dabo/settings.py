@@ -249,6 +249,10 @@ localizeDabo = True
 # values to Decimal automatically?
 convertFloatToDecimal = True
 
+# Keep the classes compiled from .cdxml files, in memory and in the user's Dabo
+# directory, so that they are only regenerated when one of their files changes.
+cacheDesignerClasses = True
+
 ### Settings - end
 
 
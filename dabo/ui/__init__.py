@@ -14,12 +14,18 @@ would issue::
 
 """
 import os
+import sys
+import types
 import traceback
 import inspect
 import dabo
 from dabo.dLocalize import _
 
 lastCallAfterStack = ""  ## see uiwx/__init__.py in callAfter and callAfterInterval
+# Names the loaded UI module imports on first access, mapped to their modules,
+# and the modules among them that may not be importable; see _LazyUIModule.
+_lazyImports = {}
+_optionalImports = set()
 
 def getUIType():
 	"""Return the identifier of the currently loaded UI, or None."""
@@ -59,6 +65,11 @@ def loadUI(uiType):
 	if currType is None:
 		try:
 			exec("from %s import *" % mods[typ], globals())
+			uiModule = sys.modules[mods[typ]]
+			for nm, modName in getattr(uiModule, "_lazyImports", {}).items():
+				_lazyImports[nm] = "%s.%s" % (mods[typ], modName)
+			for modName in getattr(uiModule, "_optionalImports", ()):
+				_optionalImports.add("%s.%s" % (mods[typ], modName))
 			retVal = True
 		except Exception, e:
 			retVal = False
@@ -228,6 +239,79 @@ def makeProxyProperty(dct, nm, proxyAtts):
 	return property(fget, fset, None, doc)
 
 
+class _LazyUIModule(types.ModuleType):
+	"""
+	Stands in for this module in sys.modules, so that the classes listed in the
+	UI module's _lazyImports are only imported when they are first accessed.
+	Everything else is passed through to the real module.
+	"""
+	def __init__(self, module):
+		super(_LazyUIModule, self).__init__(module.__name__, module.__doc__)
+		self.__dict__["_module"] = module
+
+
+	def __getattr__(self, name):
+		module = self.__dict__["_module"]
+		try:
+			return getattr(module, name)
+		except AttributeError:
+			pass
+		try:
+			modName = _lazyImports[name]
+		except KeyError:
+			raise AttributeError("'module' object has no attribute '%s'" % name)
+		try:
+			__import__(modName)
+		except ImportError, e:
+			if modName not in _optionalImports:
+				raise
+			raise AttributeError(_("'%(name)s' is not available: %(e)s") % locals())
+		ret = getattr(sys.modules[modName], name)
+		# Store it in both the UI module and here, where it was imported before.
+		setattr(sys.modules[modName.rsplit(".", 1)[0]], name, ret)
+		setattr(module, name, ret)
+		return ret
+
+
+	def __setattr__(self, name, val):
+		setattr(self.__dict__["_module"], name, val)
+
+
+	def __delattr__(self, name):
+		delattr(self.__dict__["_module"], name)
+
+
+	def __dir__(self):
+		names = set(dir(self.__dict__["_module"]))
+		# The imported subpackages are stored here.
+		names.update(self.__dict__)
+		names.update(_lazyImports)
+		names.discard("_module")
+		return sorted(names)
+
+
+	def _getAll(self):
+		module = self.__dict__["_module"]
+		names = set(nm for nm in dir(module) if not nm.startswith("_"))
+		for name in _lazyImports:
+			# Leave out the optional classes that can't be imported.
+			try:
+				getattr(self, name)
+			except AttributeError:
+				continue
+			names.add(name)
+		return sorted(names)
+
+
+	__all__ = property(_getAll, None, None,
+			_("""The names imported by 'from dabo.ui import *': the public names of the
+			module, and the classes that are otherwise imported on first access.
+			Reading it imports all of those classes.  (list of str)"""))
+
+
+sys.modules[__name__] = _LazyUIModule(sys.modules[__name__])
+
+
 # Because some of IDEs uses lexical analysis (Wing) instead of the dynamic
 # analysis (PyDev), the following code should make them happy.
 if False:
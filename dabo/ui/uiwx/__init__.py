@@ -29,9 +29,9 @@ if "wx" not in sys.modules and not getattr(sys, "frozen", False):
 ######################################################
 # Very first thing: check for proper wxPython build:
 _failedLibs = []
-# note: may need wx.animate as well
-for lib in ("wx", "wx.stc", "wx.lib.foldpanelbar", "wx.gizmos",
-		"wx.lib.calendar", "wx.lib.masked", "wx.lib.buttons"):
+# Libraries that only some of the controls need, such as wx.stc, are imported
+# along with those controls, when they are first used.
+for lib in ("wx", "wx.grid"):
 
 	if getattr(sys, "frozen", False):
 		# Just import it without catching the ImportError. This will let the
@@ -90,145 +90,133 @@ dabo.ui.dFormMixin = dFormMixin
 from dSizerMixin import dSizerMixin
 dabo.ui.dSizerMixin = dSizerMixin
 
-# Import into public namespace:
-from dBox import dBox
-from dBitmap import dBitmap
-from dBitmapButton import dBitmapButton
-if wx.VERSION >= (2, 8, 8):
-	from dBorderlessButton import dBorderlessButton
-from dButton import dButton
-from dCalendar import dCalendar
-from dCalendar import dExtendedCalendar
-from dCheckBox import dCheckBox
-from dCheckList import dCheckList
-from dCollapsiblePanel import dCollapsiblePanel
-from dColorDialog import dColorDialog
-from dComboBox import dComboBox
-from dDatePicker import dDatePicker
-from dDateTextBox import dDateTextBox
-from dDropdownList import dDropdownList
-from dDialog import dDialog
-from dDialog import dStandardButtonDialog
-from dDialog import dOkCancelDialog
-from dDialog import dYesNoDialog
-from dEditableList import dEditableList
-from dEditBox import dEditBox
-from dEditor import dEditor
-from dFileDialog import dFileDialog
-from dFileDialog import dFolderDialog
-from dFileDialog import dSaveDialog
-from dReportProgress import dReportProgress
-from dSlidePanelControl import dSlidePanelControl
-from dSlidePanelControl import dSlidePanel
-from dFont import dFont
-from dFontDialog import dFontDialog
-from dForm import dForm
-from dForm import dToolForm
-from dForm import dBorderlessForm
-from dFormMain import dFormMain
-from dGauge import dGauge
-from dGlWindow import dGlWindow
-from dGrid import dGrid
-from dGrid import dColumn
-from dGridSizer import dGridSizer
-from dHtmlBox import dHtmlBox
-from dHyperLink import dHyperLink
 import dIcons
-from dImage import dImage
 import dKeys
-from dLabel import dLabel
-from dLine import dLine
-from dListBox import dListBox
-from dListControl import dListControl
-from dBaseMenuBar import dBaseMenuBar
-from dMaskedTextBox import dMaskedTextBox
-from dNumericBox import dNumericBox
-try:
-	from dMediaControl import dMediaControl
-except ImportError:
-	# Versions of wxPython < 2.8.11 on some platforms
-	# do not have the wx.media.MediaCtrl class
-	pass
-from dMenuBar import dMenuBar
-from dMenu import dMenu
-from dMenuItem import dMenuItem
-from dMenuItem import dCheckMenuItem
-from dMenuItem import dRadioMenuItem
-from dMenuItem import dSeparatorMenuItem
 import dMessageBox
-from dRadioList import dRadioList
-from dPanel import dDataPanel
-from dPanel import dPanel
-from dPanel import dScrollPanel
-from dPageFrame import dPageFrame
-from dPageFrame import dPageToolBar
-from dPageFrame import dPageList
-from dPageFrame import dPageSelect
-from dPageFrame import dDockTabs
-from dPageFrameNoTabs import dPageFrameNoTabs
-from dPage import dPage
-from dPdfWindow import dPdfWindow
-from dSearchBox import dSearchBox
-from dShell import dShell
-from dShell import dShellForm
-from dSizer import dSizer
-from dSizer import dSizerV
-from dSizer import dSizerH
-from dBorderSizer import dBorderSizer
-from dSlider import dSlider
-from dSpinner import dSpinner
-from dSplitForm import dSplitForm
-from dSplitter import dSplitter
-from dStatusBar import dStatusBar
-from dTextBox import dTextBox
-from dTimer import dTimer
-from dToolBar import dToolBar
-from dToolBar import dToolBarItem
-from dToggleButton import dToggleButton
-from dTreeView import dNode
-from dTreeView import dTreeView
-from dLed import dLed
 import dUICursors as dUICursors
 import gridRenderers
 from dPageFrameMixin import dPageFrameMixin
-from dAutoComplete import dAutoComplete
-
-
-# Needs importing after at least dPanel:
-from dDockForm import dDockForm
-
-try:
-	from dLinePlot import dLinePlot
-except ImportError:
-	pass
-
-try:
-	from dRichTextBox import dRichTextBox
-except ImportError:
-	pass
 
-#The flatnotebook version we need is not avialable with wxPython < 2.8.4
-if wx.VERSION >= (2, 8, 4):
-	from dPageFrame import dPageStyled
-
-# Support the old names, but issue deprecation warnings.
-class dFoldPanelBar(dSlidePanelControl):
-	def __init__(self, *args, **kwargs):
-		"""**Deprecated:** use dSlidePanelControl instead"""
-		warnings.warn(_("'dFoldPanelBar' is a deprecated name. Use 'dSlidePanelControl' instead"), DeprecationWarning)
-		super(dFoldPanelBar, self).__init__(*args, **kwargs)
-
-class dFoldPanel(dSlidePanel):
-	def __init__(self, *args, **kwargs):
-		"""**Deprecated:** use dSlidePanel instead"""
-		warnings.warn(_("'dFoldPanel' is a deprecated name. Use 'dSlidePanel' instead"), DeprecationWarning)
-		super(dFoldPanel, self).__init__(*args, **kwargs)
-
-class dCheckListBox(dCheckList):
-	def __init__(self, *args, **kwargs):
-		"""**Deprecated:** use dCheckList instead"""
-		warnings.warn(_("'dCheckListBox' is a deprecated name. Use 'dCheckList' instead"), DeprecationWarning)
-		super(dCheckListBox, self).__init__(*args, **kwargs)
+# The public classes are only imported when they are first accessed as attributes
+# of dabo.ui, since most apps use just some of them, and several of them need
+# large or optional libraries. This maps each name to the module that defines it.
+_lazyImports = {
+		"dAutoComplete": "dAutoComplete",
+		"dBaseMenuBar": "dBaseMenuBar",
+		"dBitmap": "dBitmap",
+		"dBitmapButton": "dBitmapButton",
+		"dBorderlessButton": "dBorderlessButton",
+		"dBorderlessForm": "dForm",
+		"dBorderSizer": "dBorderSizer",
+		"dBox": "dBox",
+		"dButton": "dButton",
+		"dCalendar": "dCalendar",
+		"dCheckBox": "dCheckBox",
+		"dCheckList": "dCheckList",
+		"dCheckListBox": "dCheckList",
+		"dCheckMenuItem": "dMenuItem",
+		"dCollapsiblePanel": "dCollapsiblePanel",
+		"dColorDialog": "dColorDialog",
+		"dColumn": "dGrid",
+		"dComboBox": "dComboBox",
+		"dDataPanel": "dPanel",
+		"dDatePicker": "dDatePicker",
+		"dDateTextBox": "dDateTextBox",
+		"dDialog": "dDialog",
+		"dDockForm": "dDockForm",
+		"dDockTabs": "dPageFrame",
+		"dDropdownList": "dDropdownList",
+		"dEditableList": "dEditableList",
+		"dEditBox": "dEditBox",
+		"dEditor": "dEditor",
+		"dExtendedCalendar": "dCalendar",
+		"dFileDialog": "dFileDialog",
+		"dFolderDialog": "dFileDialog",
+		"dFoldPanel": "dSlidePanelControl",
+		"dFoldPanelBar": "dSlidePanelControl",
+		"dFont": "dFont",
+		"dFontDialog": "dFontDialog",
+		"dForm": "dForm",
+		"dFormMain": "dFormMain",
+		"dGauge": "dGauge",
+		"dGlWindow": "dGlWindow",
+		"dGrid": "dGrid",
+		"dGridSizer": "dGridSizer",
+		"dHtmlBox": "dHtmlBox",
+		"dHyperLink": "dHyperLink",
+		"dImage": "dImage",
+		"dLabel": "dLabel",
+		"dLed": "dLed",
+		"dLine": "dLine",
+		"dLinePlot": "dLinePlot",
+		"dListBox": "dListBox",
+		"dListControl": "dListControl",
+		"dMaskedTextBox": "dMaskedTextBox",
+		"dMediaControl": "dMediaControl",
+		"dMenu": "dMenu",
+		"dMenuBar": "dMenuBar",
+		"dMenuItem": "dMenuItem",
+		"dNode": "dTreeView",
+		"dNumericBox": "dNumericBox",
+		"dOkCancelDialog": "dDialog",
+		"dPage": "dPage",
+		"dPageFrame": "dPageFrame",
+		"dPageFrameNoTabs": "dPageFrameNoTabs",
+		"dPageList": "dPageFrame",
+		"dPageSelect": "dPageFrame",
+		"dPageStyled": "dPageFrame",
+		"dPageToolBar": "dPageFrame",
+		"dPanel": "dPanel",
+		"dPdfWindow": "dPdfWindow",
+		"dRadioList": "dRadioList",
+		"dRadioMenuItem": "dMenuItem",
+		"dReportProgress": "dReportProgress",
+		"dRichTextBox": "dRichTextBox",
+		"dSaveDialog": "dFileDialog",
+		"dScrollPanel": "dPanel",
+		"dSearchBox": "dSearchBox",
+		"dSeparatorMenuItem": "dMenuItem",
+		"dShell": "dShell",
+		"dShellForm": "dShell",
+		"dSizer": "dSizer",
+		"dSizerH": "dSizer",
+		"dSizerV": "dSizer",
+		"dSlidePanel": "dSlidePanelControl",
+		"dSlidePanelControl": "dSlidePanelControl",
+		"dSlider": "dSlider",
+		"dSpinner": "dSpinner",
+		"dSplitForm": "dSplitForm",
+		"dSplitter": "dSplitter",
+		"dStandardButtonDialog": "dDialog",
+		"dStatusBar": "dStatusBar",
+		"dTextBox": "dTextBox",
+		"dTimer": "dTimer",
+		"dToggleButton": "dToggleButton",
+		"dToolBar": "dToolBar",
+		"dToolBarItem": "dToolBar",
+		"dToolForm": "dForm",
+		"dTreeView": "dTreeView",
+		"dYesNoDialog": "dDialog",
+		}
+# Modules that can't be imported with some wxPython builds or versions. Their
+# names are then simply missing from dabo.ui.
+_optionalImports = ("dBorderlessButton", "dLinePlot", "dMediaControl", "dRichTextBox")
+
+# Make the lazily imported modules visible to freezing tools such as py2exe.
+if False:
+	import dAutoComplete, dBaseMenuBar, dBitmap, dBitmapButton, \
+			dBorderlessButton, dBorderSizer, dBox, dButton, dCalendar, \
+			dCheckBox, dCheckList, dCollapsiblePanel, dColorDialog, dComboBox, \
+			dDatePicker, dDateTextBox, dDialog, dDockForm, dDropdownList, \
+			dEditableList, dEditBox, dEditor, dFileDialog, dFont, dFontDialog, \
+			dForm, dFormMain, dGauge, dGlWindow, dGrid, dGridSizer, dHtmlBox, \
+			dHyperLink, dImage, dLabel, dLed, dLine, dLinePlot, dListBox, \
+			dListControl, dMaskedTextBox, dMediaControl, dMenu, dMenuBar, \
+			dMenuItem, dNumericBox, dPage, dPageFrame, dPageFrameNoTabs, \
+			dPanel, dPdfWindow, dRadioList, dReportProgress, dRichTextBox, \
+			dSearchBox, dShell, dSizer, dSlidePanelControl, dSlider, dSpinner, \
+			dSplitForm, dSplitter, dStatusBar, dTextBox, dTimer, dToggleButton, \
+			dToolBar, dTreeView
 
 artConstants = {}
 for item in (it for it in dir(wx) if it.startswith("ART_")):
@@ -358,7 +346,7 @@ def callEvery(interval, func, *args, **kwargs):
 	"""
 	def _onHit(evt):
 		func(*args, **kwargs)
-	ret = dTimer(Interval=interval)
+	ret = dabo.ui.dTimer(Interval=interval)
 	ret.bindEvent(dEvents.Hit, _onHit)
 	ret.start()
 	return ret
@@ -511,7 +499,7 @@ def getEventData(wxEvt):
 		except AttributeError:
 			pass
 		# See if it's a menu selection
-		if isinstance(obj, dMenu):
+		if isinstance(obj, dabo.ui.dMenu):
 			itmID = wxEvt.GetId()
 			itm = obj._daboChildren.get(itmID, None)
 			if itm is not None:
@@ -1004,7 +992,7 @@ def getColor(color=None):
 	no selection was made.
 	"""
 	ret = None
-	dlg = dColorDialog(_getActiveForm(), color)
+	dlg = dabo.ui.dColorDialog(_getActiveForm(), color)
 	if dlg.show() == kons.DLG_OK:
 		ret = dlg.getColor()
 	dlg.release()
@@ -1051,17 +1039,17 @@ def getFont(font=None):
 	if font is None:
 		param = None
 	else:
-		if not isinstance(font, dFont):
+		if not isinstance(font, dabo.ui.dFont):
 			# This will help identify older code
 			dabo.log.error("Invalid font class passed to getFont")
 			return None
 		param = font._nativeFont
-	dlg = dFontDialog(_getActiveForm(), param)
+	dlg = dabo.ui.dFontDialog(_getActiveForm(), param)
 	if dlg.show() == kons.DLG_OK:
 		fnt = dlg.getFont()
 	dlg.release()
 	if fnt is not None:
-		ret = dFont(_nativeFont=fnt)
+		ret = dabo.ui.dFont(_nativeFont=fnt)
 	return ret
 
 
@@ -1106,7 +1094,7 @@ def getFile(*args, **kwargs):
 
 	"""
 	wc = _getWild(*args)
-	return _getPath(dFileDialog, wildcard=wc, **kwargs)[0]
+	return _getPath(dabo.ui.dFileDialog, wildcard=wc, **kwargs)[0]
 
 
 def getFileAndType(*args, **kwargs):
@@ -1116,7 +1104,7 @@ def getFileAndType(*args, **kwargs):
 	was made, as well as the wildcard value selected by the user.
 	"""
 	wc = _getWild(*args)
-	pth, idx = _getPath(dFileDialog, wildcard=wc, **kwargs)
+	pth, idx = _getPath(dabo.ui.dFileDialog, wildcard=wc, **kwargs)
 	if idx is None:
 		ret = (pth, idx)
 	else:
@@ -1136,7 +1124,7 @@ def getSaveAs(*args, **kwargs):
 	except KeyError:
 		pass
 	kwargs["wildcard"] = _getWild(*args)
-	return _getPath(dSaveDialog, **kwargs)[0]
+	return _getPath(dabo.ui.dSaveDialog, **kwargs)[0]
 
 
 def getSaveAsAndType(*args, **kwargs):
@@ -1151,7 +1139,7 @@ def getSaveAsAndType(*args, **kwargs):
 	except KeyError:
 		pass
 	kwargs["wildcard"] = _getWild(*args)
-	pth, idx = _getPath(dSaveDialog, **kwargs)
+	pth, idx = _getPath(dabo.ui.dSaveDialog, **kwargs)
 	if idx is None:
 		ret = (pth, idx)
 	else:
@@ -1165,7 +1153,7 @@ def getFolder(message=_("Choose a folder"), defaultPath="", wildcard="*"):
 	Returns the path to the selected folder, or None if no selection
 	was made.
 	"""
-	return _getPath(dFolderDialog, message=message, defaultPath=defaultPath,
+	return _getPath(dabo.ui.dFolderDialog, message=message, defaultPath=defaultPath,
 			wildcard=wildcard)[0]
 # Create an alias that uses 'directory' instead of 'folder'
 getDirectory = getFolder
@@ -1633,7 +1621,7 @@ def browse(dataSource, parent=None, keyCaption=None, includeFields=None,
 		parent = dabo.ui.dForm(None, Caption=cap)
 		parentPassed = False
 
-	grd = dGrid(parent, AlternateRowColoring=True)
+	grd = dabo.ui.dGrid(parent, AlternateRowColoring=True)
 	grd.buildFromDataSet(dataSet, keyCaption=keyCaption,
 			includeFields=includeFields, colOrder=colOrder, colWidths=colWidths,
 			colTypes=colTypes, autoSizeCols=autoSizeCols)
@@ -1981,9 +1969,9 @@ def setdFormClass(typ):
 	"""
 	lowtype = typ.lower().strip()
 	if lowtype == "mdi":
-		dabo.ui.__dict__["dForm"] = dFormChildMDI
+		dabo.ui.dForm = dFormChildMDI
 	elif lowtype == "sdi":
-		dabo.ui.__dict__["dForm"] = dFormSDI
+		dabo.ui.dForm = dFormSDI
 
 
 def spawnProcess(cmd, wait=False, handler=None):
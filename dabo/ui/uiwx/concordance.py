@@ -12,7 +12,7 @@ dabo_to_wx = {}
 wx_to_dabo = {}
 
 for daboName in daboNames:
-	daboClass = getattr(dabo.ui, daboName)
+	daboClass = getattr(dabo.ui, daboName, None)
 	if hasattr(daboClass, "__mro__"):
 		for mro in daboClass.__mro__:
 			if "<class 'wx." in ustr(mro):
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import warnings
 import wx
 import dabo
 import dabo.ui
@@ -75,6 +76,14 @@ class dCheckList(dcm.dControlItemMixin, wx.CheckListBox):
 
 
 
+class dCheckListBox(dCheckList):
+	def __init__(self, *args, **kwargs):
+		"""**Deprecated:** use dCheckList instead"""
+		warnings.warn(_("'dCheckListBox' is a deprecated name. Use 'dCheckList' instead"), DeprecationWarning)
+		super(dCheckListBox, self).__init__(*args, **kwargs)
+
+
+
 class _dCheckList_test(dCheckList):
 	def initProperties(self):
 		# Simulate a database:
@@ -1872,6 +1872,10 @@ class dGrid(cm.dControlMixin, wx.grid.Grid):
 		self._searchable = True
 		self._searchDelay = None
 		self._sortable = True
+		self._scrollPaging = False
+		# Set while a page is being loaded in response to scrolling
+		self._inScrollPaging = False
+		self._lastScrollPos = 0
 
 		#Declare Internal Header Attributes
 		self._headerVerticalAlignment = "Center"
@@ -4178,6 +4182,51 @@ class dGrid(cm.dControlMixin, wx.grid.Grid):
 		evtClass = dabo.ui.getScrollWinEventClass(evt)
 		self.raiseEvent(evtClass, evt)
 		evt.Skip()
+		if self._scrollPaging and not self._inScrollPaging \
+				and evt.GetOrientation() == wx.VERTICAL:
+			# Check the position once the scroll has been carried out.
+			dabo.ui.callAfter(self._pageOnScroll)
+
+
+	def _pageOnScroll(self):
+		"""
+		Load the next page of the bizobj when the grid is scrolled down to the
+		end of its rows, and the prior page when scrolled up to the top.
+		"""
+		if self._inScrollPaging:
+			return
+		biz = self.getBizobj()
+		if not biz or not biz.PageSize or biz.PageNumber is None:
+			return
+		pos = self.GetScrollPos(wx.VERTICAL)
+		thumb = self.GetScrollThumb(wx.VERTICAL)
+		rng = self.GetScrollRange(wx.VERTICAL)
+		lastPos, self._lastScrollPos = self._lastScrollPos, pos
+		if rng <= 0 or thumb >= rng:
+			# All of the rows are visible, so there is nothing to scroll.
+			return
+		# Only page in the direction of the scroll, so that the position
+		# after loading a page doesn't bounce back to the page before.
+		if pos > lastPos and pos + thumb >= rng:
+			pageFunc = biz.nextPage
+		elif pos < lastPos and pos == 0:
+			pageFunc = biz.priorPage
+		else:
+			return
+		self._inScrollPaging = True
+		try:
+			if pageFunc():
+				self._syncRowCount()
+				self._syncCurrentRow()
+				self.refresh()
+		finally:
+			self._lastScrollPos = self.GetScrollPos(wx.VERTICAL)
+			# Scroll events raised while loading the page are still queued.
+			dabo.ui.callAfter(self._endScrollPaging)
+
+
+	def _endScrollPaging(self):
+		self._inScrollPaging = False
 
 
 	def _updateWxSelection(self, evt):
@@ -4905,6 +4954,13 @@ class dGrid(cm.dControlMixin, wx.grid.Grid):
 		self._saveRestoreDataSet = bool(val)
 
 
+	def _getScrollPaging(self):
+		return self._scrollPaging
+
+	def _setScrollPaging(self, val):
+		self._scrollPaging = bool(val)
+
+
 	def _getSearchable(self):
 		return self._searchable
 
@@ -5337,6 +5393,12 @@ class dGrid(cm.dControlMixin, wx.grid.Grid):
 
 				The default is False."""))
 
+	ScrollPaging = property(_getScrollPaging, _setScrollPaging, None,
+			_("""Specifies whether scrolling to the end or the top of the rows loads the
+			next or prior page of the bizobj, when its PageSize is set.  (bool)
+
+				The default is False."""))
+
 	Searchable = property(_getSearchable, _setSearchable, None,
 			_("""Specifies whether the columns can be searched.	  (bool)
 
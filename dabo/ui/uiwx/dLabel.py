@@ -183,7 +183,7 @@ class _dLabel_test(dLabel):
 
 if __name__ == "__main__":
 	from dabo.dApp import dApp
-	class LabelTestForm(dabo.ui.uiwx.dForm):
+	class LabelTestForm(dabo.ui.dForm):
 		def afterInit(self):
 			self.Caption = "dLabel Test"
 			pnl = dabo.ui.dPanel(self)
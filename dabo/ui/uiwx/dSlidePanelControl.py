@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import warnings
 import wx
 import wx.lib.foldpanelbar as fpb
 import dabo
@@ -804,6 +805,21 @@ class dSlidePanelControl(dcm.dControlMixin, wx.lib.foldpanelbar.FoldPanelBar):
 	DynamicSingleton = makeDynamicProperty(Singleton)
 
 
+
+# Support the old names, but issue deprecation warnings.
+class dFoldPanelBar(dSlidePanelControl):
+	def __init__(self, *args, **kwargs):
+		"""**Deprecated:** use dSlidePanelControl instead"""
+		warnings.warn(_("'dFoldPanelBar' is a deprecated name. Use 'dSlidePanelControl' instead"), DeprecationWarning)
+		super(dFoldPanelBar, self).__init__(*args, **kwargs)
+
+class dFoldPanel(dSlidePanel):
+	def __init__(self, *args, **kwargs):
+		"""**Deprecated:** use dSlidePanel instead"""
+		warnings.warn(_("'dFoldPanel' is a deprecated name. Use 'dSlidePanel' instead"), DeprecationWarning)
+		super(dFoldPanel, self).__init__(*args, **kwargs)
+
+
 if __name__ == "__main__":
 	from dabo.dApp import dApp
 	class TestForm(dabo.ui.dForm):
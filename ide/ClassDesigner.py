@@ -973,7 +973,7 @@ class ClassDesigner(dApp):
 			newClass = eval(clsname)
 		except ValueError:
 			dct["fullname"] = cls
-			newClass = dui.__dict__[cls]
+			newClass = getattr(dui, cls)
 
 		# See if it's a class that requires special handling
 		rv["newClass"] = newClass
@@ -1113,7 +1113,7 @@ class ClassDesigner(dApp):
 
 	def _recreateKidsForSplitter(self, obj, kids):
 		for pos, kid in enumerate(kids):
-			pnlClass = dui.__dict__[kid["name"]]
+			pnlClass = getattr(dui, kid["name"])
 			obj.createPanes(pnlClass, pane=pos+1, force=True)
 			if pos == 0:
 				pnl = obj.Panel1
@@ -1294,7 +1294,7 @@ class ClassDesigner(dApp):
 				dabo.log.error("Invalid wizard page class: %s" % nm)
 				dabo.ui.stop("Invalid wizard page class: %s" % nm)
 				pgDct["fullname"] = nm
-				cls = dabo.ui.__dict__[nm]
+				cls = getattr(dabo.ui, nm)
 			atts = pgDct["attributes"]
 			try:
 				del atts["sizerInfo"]
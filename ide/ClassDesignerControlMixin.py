@@ -74,12 +74,9 @@ class ClassDesignerControlMixin(LayoutSaverMixin):
 					dEvents.GridHeaderMouseLeftDown,
 					dEvents.GridHeaderMouseMove,
 					dEvents.GridHeaderMouseLeftUp)
-			badEvents = []
-			for bnd in self._eventBindings:
-				if bnd[0] not in coolEvents:
-					badEvents.append(bnd)
-			for bad in badEvents:
-				self._eventBindings.remove(bad)
+			for eventClass in self._EventHandlers.keys():
+				if eventClass not in coolEvents:
+					self.unbindEvent(eventClass)
 			# Need to kill the sorting behavior
 			def _killProcessSort(col): pass
 			self.processSort = _killProcessSort
@@ -96,12 +93,9 @@ class ClassDesignerControlMixin(LayoutSaverMixin):
 		elif isinstance(self, (dui.dSlidePanelControl, dui.dSlidePanel)):
 			coolEvents = (dEvents.SlidePanelCaptionClick,
 						dEvents.SlidePanelChange)
-			badEvents = []
-			for bnd in self._eventBindings:
-				if bnd[0] not in coolEvents:
-					badEvents.append(bnd)
-			for bad in badEvents:
-				self._eventBindings.remove(bad)
+			for eventClass in self._EventHandlers.keys():
+				if eventClass not in coolEvents:
+					self.unbindEvent(eventClass)
 		else:
 			# This removes all previously-defined bindings
 			self.unbindEvent(None)
@@ -1079,7 +1073,7 @@ class ClassDesignerControlMixin(LayoutSaverMixin):
 			ret.update(splitterProps)
 		elif isinstance(self, dui.dStatusBar):
 			ret.update(fontProps)
-		elif "dMediaControl" in dir(dui) and isinstance(self, dui.dMediaControl):
+		elif hasattr(dui, "dMediaControl") and isinstance(self, dui.dMediaControl):
 			ret.update(mediaControlProps)
 		elif isinstance(self, (dui.dEditBox, dui.dTextBox, dui.dMaskedTextBox)):
 			ret.update(colorProps)
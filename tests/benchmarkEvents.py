@@ -0,0 +1,56 @@
+"""Micro-benchmark for raising Dabo events.
+
+Measures how many events per second EventMixin.raiseEvent() can dispatch,
+both with no handler bound and with a single handler, for a plain event
+and for one carrying a (fake) native event whose EventData is never read.
+
+Run it directly:
+
+	python tests/benchmarkEvents.py [count]
+"""
+
+import sys
+import time
+import dabo
+import dabo.ui
+from dabo import dEvents
+from dabo.lib.eventMixin import EventMixin
+
+
+def getEventData(uiEvent):
+	# Stand-in for a UI library pulling every field out of a native event.
+	return dict(("field%s" % num, num) for num in range(20))
+
+
+def measure(obj, eventClass, uiEvent, count):
+	raiseEvent = obj.raiseEvent
+	start = time.time()
+	for num in xrange(count):
+		raiseEvent(eventClass, uiEvent)
+	elapsed = time.time() - start
+	return count / max(elapsed, 1e-9)
+
+
+def run(count=100000):
+	dabo.ui.getEventData = getEventData
+	# Don't let continueEvent() look for a UI library.
+	dabo.ui.continueEvent = dabo.ui.discontinueEvent = lambda evt: None
+	obj = EventMixin()
+	def handler(evt):
+		pass
+	print "%-40s %12s" % ("case", "events/sec")
+	for label, uiEvent in (("plain", None), ("native", object())):
+		obj.unbindEvent()
+		print "%-40s %12d" % ("%s, no handlers" % label,
+				measure(obj, dEvents.MouseMove, uiEvent, count))
+		obj.bindEvent(dEvents.MouseMove, handler)
+		print "%-40s %12d" % ("%s, one handler" % label,
+				measure(obj, dEvents.MouseMove, uiEvent, count))
+
+
+if __name__ == "__main__":
+	try:
+		count = int(sys.argv[1])
+	except (IndexError, ValueError):
+		count = 100000
+	run(count)
@@ -0,0 +1,93 @@
+"""Startup benchmark for Dabo applications.
+
+Measures the time taken by 'import dabo.ui; dabo.ui.loadUI("wx")' and,
+optionally, by creating the application object and showing a first form.
+The time taken to load each module is reported, both including and
+excluding the modules it imported in turn, so that the expensive imports
+can be found.
+
+Run it directly, so that nothing has been imported yet:
+
+	python tests/benchmarkStartup.py [--form] [number of modules to list]
+"""
+
+import sys
+import imp
+import time
+
+
+class TimingImporter(object):
+	"""Meta path importer that times the loading of every module."""
+	def __init__(self):
+		# (module name, total seconds, seconds not spent in nested imports)
+		self.timings = []
+		self._nested = []
+		self._loading = set()
+
+
+	def find_module(self, fullname, path=None):
+		if fullname in self._loading:
+			# Let the regular import machinery load it.
+			return None
+		try:
+			fp, pth, desc = imp.find_module(fullname.rsplit(".", 1)[-1], path)
+		except ImportError:
+			return None
+		if fp is not None:
+			fp.close()
+		return self
+
+
+	def load_module(self, fullname):
+		self._loading.add(fullname)
+		self._nested.append(0.0)
+		start = time.time()
+		try:
+			__import__(fullname)
+		finally:
+			elapsed = time.time() - start
+			nested = self._nested.pop()
+			if self._nested:
+				self._nested[-1] += elapsed
+			self._loading.discard(fullname)
+			self.timings.append((fullname, elapsed, elapsed - nested))
+		return sys.modules[fullname]
+
+
+def main(args):
+	showForm = "--form" in args
+	args = [arg for arg in args if arg != "--form"]
+	try:
+		count = int(args[0])
+	except IndexError:
+		count = 30
+
+	importer = TimingImporter()
+	sys.meta_path.insert(0, importer)
+	start = time.time()
+	import dabo.ui
+	dabo.ui.loadUI("wx")
+	loadTime = time.time() - start
+	if showForm:
+		app = dabo.dApp(MainFormClass=None)
+		app.setup()
+		frm = dabo.ui.dForm(None, Caption="Startup")
+		frm.show()
+		dabo.ui.yieldUI()
+		formTime = time.time() - start
+	sys.meta_path.remove(importer)
+
+	timings = sorted(importer.timings, key=lambda item: item[2], reverse=True)
+	print "%10s %10s  %s" % ("self ms", "total ms", "module")
+	for name, total, own in timings[:count]:
+		print "%10.1f %10.1f  %s" % (own * 1000, total * 1000, name)
+	print
+	print "Modules loaded: %s" % len(timings)
+	print "import dabo.ui + loadUI(): %.1f ms" % (loadTime * 1000)
+	if showForm:
+		print "Time to first form: %.1f ms" % (formTime * 1000)
+		frm.release()
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
@@ -0,0 +1,89 @@
+"""
+Unit Tests for dEvents.py
+
+If this file is run standalone, it will automatically run all of the test cases found in the file.
+"""
+
+import unittest
+import dabo
+import dabo.ui
+from dabo import dEvents
+from dabo.lib.eventMixin import EventMixin
+
+
+class TestEventData(unittest.TestCase):
+	"""
+	Test List:
+		- EventData isn't built until it is read
+		- Native data overrides keyword args, explicit eventData overrides both
+		- Assigned EventData replaces the native data
+		- EventData can be read after the handlers are done
+		- Events don't carry an instance dict
+	"""
+	def setUp(self):
+		self.nativeCalls = []
+		self.uiFunctions = dict([(nm, getattr(dabo.ui, nm, None))
+				for nm in ("getEventData", "continueEvent")])
+		def getEventData(uiEvent):
+			self.nativeCalls.append(uiEvent)
+			return {"keyCode": 65, "row": 1}
+		dabo.ui.getEventData = getEventData
+		dabo.ui.continueEvent = lambda uiEvent: None
+
+	def tearDown(self):
+		for nm, func in self.uiFunctions.items():
+			if func is None:
+				delattr(dabo.ui, nm)
+			else:
+				setattr(dabo.ui, nm, func)
+
+	def testLazy(self):
+		"""EventData isn't built until it is read"""
+		evt = dEvents.KeyChar(None, uiEvent="native")
+		self.assertEqual(self.nativeCalls, [])
+		self.assertEqual(evt.EventData["keyCode"], 65)
+		self.assertEqual(evt.keyCode, 65)
+		self.assertEqual(self.nativeCalls, ["native"])
+		self.assertTrue("timestamp" in evt.EventData)
+		self.assertTrue(evt.Timestamp > 0)
+
+	def testPrecedence(self):
+		"""Native data overrides keyword args, explicit eventData overrides both"""
+		evt = dEvents.GridCellSelected(None, uiEvent="native",
+				eventData={"col": 3}, row=0, col=0, extra="x")
+		self.assertEqual(evt.row, 1)
+		self.assertEqual(evt.col, 3)
+		self.assertEqual(evt.extra, "x")
+		self.assertRaises(AttributeError, getattr, evt, "missing")
+
+	def testSetEventData(self):
+		"""Assigned EventData replaces the native data"""
+		evt = dEvents.KeyEvent(None, uiEvent="native")
+		evt.EventData = {"keyChar": "a"}
+		self.assertEqual(evt.keyChar, "a")
+		self.assertEqual(self.nativeCalls, [])
+
+	def testKeptEvent(self):
+		"""EventData can be read after the handlers are done"""
+		obj = EventMixin()
+		kept = []
+		def handler(evt):
+			kept.append(evt)
+		obj.bindEvent(dEvents.KeyChar, handler)
+		obj.raiseEvent(dEvents.KeyChar, "native")
+		# Built while the native event was still valid
+		self.assertEqual(self.nativeCalls, ["native"])
+		self.assertEqual(kept[0].keyCode, 65)
+		self.assertEqual(self.nativeCalls, ["native"])
+		self.assertEqual(kept[0]._uiEvent, None)
+
+	def testSlots(self):
+		"""Events don't carry an instance dict"""
+		evt = dEvents.MouseMove(None)
+		self.assertFalse(hasattr(evt, "__dict__"))
+		evt = dEvents.ChildBorn(None, child="kid")
+		self.assertEqual(evt.Child, "kid")
+
+
+if __name__ == "__main__":
+	unittest.main()
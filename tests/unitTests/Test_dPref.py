@@ -0,0 +1,127 @@
+"""
+Unit Tests for dPref.py
+
+If this file is run standalone, it will automatically run all of the test cases found in the file.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import dabo
+from dabo.dPref import dPref, flushPendingPrefs
+
+
+class BaseTestdPref(unittest.TestCase):
+	"""Provides setup methods for the dPref TestCases"""
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.prefDb = os.path.join(self.tempDir, "prefs.db")
+		self.pref = dPref(key="testing", prefDb=self.prefDb)
+
+	def tearDown(self):
+		flushPendingPrefs()
+		self.pref._cxn.close()
+		shutil.rmtree(self.tempDir)
+
+	def getRows(self):
+		crs = self.pref._cursor
+		crs.execute("select ckey, cvalue from daboprefs order by ckey")
+		return [(rec["ckey"], rec["cvalue"]) for rec in crs.getDataSet()]
+
+
+class TestPersistence(BaseTestdPref):
+	"""
+	Test List:
+		- Assignments are saved, and re-assignments update the same row
+		- persist() saves a whole subtree when AutoPersist is False
+		- Duplicate keys in an existing database don't prevent opening it
+	"""
+	def testAssignment(self):
+		"""Assignments are saved, and re-assignments update the same row"""
+		self.pref.a.b = 1
+		self.pref.a.b = 2
+		self.pref.c = "x"
+		self.assertEqual(self.getRows(), [("testing.a.b", "2"), ("testing.c", "x")])
+
+	def testPersist(self):
+		"""persist() saves a whole subtree when AutoPersist is False"""
+		self.pref.AutoPersist = False
+		self.pref.a.b = 1
+		self.pref.a.c = 2
+		self.assertEqual(self.getRows(), [])
+		self.pref.persist()
+		self.assertEqual(self.getRows(), [("testing.a.b", "1"), ("testing.a.c", "2")])
+
+	def testDuplicateKeys(self):
+		"""Duplicate keys in an existing database don't prevent opening it"""
+		crs = self.pref._cursor
+		crs.execute("drop index daboprefs_ckey")
+		for val in ("1", "2"):
+			crs.execute("insert into daboprefs (ckey, ctype, cvalue) values (?, ?, ?)",
+					("testing.dup", "int", val))
+		crs.commitTransaction()
+		pref = dPref(key="testing", prefDb=self.prefDb)
+		self.assertEqual(pref.dup, 2)
+		pref.dup = 3
+		self.assertEqual(self.getRows(), [("testing.dup", "3")])
+		pref._cxn.close()
+
+
+class TestPrefetch(BaseTestdPref):
+	"""
+	Test List:
+		- prefetch() loads nested values without further queries
+		- Missing keys below a prefetched key are looked up once
+		- Wildcard characters in the key are matched literally
+	"""
+	def setUp(self):
+		super(TestPrefetch, self).setUp()
+		self.pref.form.Left = 10
+		self.pref.form.grid.colWidths = [20, 30]
+		self.pref.form_x = True
+		self.reader = dPref(key="testing", prefDb=self.prefDb)
+
+	def tearDown(self):
+		self.reader._cursor.__dict__.pop("execute", None)
+		self.reader._cxn.close()
+		super(TestPrefetch, self).tearDown()
+
+	def disallowQueries(self):
+		def execute(*args, **kwargs):
+			self.fail("Unexpected query: %s" % (args, ))
+		self.reader._cursor.execute = execute
+
+	def testPrefetch(self):
+		"""prefetch() loads nested values without further queries"""
+		self.reader.prefetch()
+		self.disallowQueries()
+		self.assertEqual(self.reader.form.Left, 10)
+		self.assertEqual(self.reader.form.grid.colWidths, [20, 30])
+		self.assertEqual(self.reader.form_x, True)
+
+	def testMissingKeys(self):
+		"""Missing keys below a prefetched key are looked up once"""
+		self.reader.form.prefetch()
+		self.pref.form.Top = 5
+		flushPendingPrefs()
+		self.assertEqual(self.reader.form.Top, 5)
+		self.assertTrue(isinstance(self.reader.form.Width, dPref))
+		self.disallowQueries()
+		self.assertEqual(self.reader.form.getValue("Width"), None)
+
+	def testWildcardKey(self):
+		"""Wildcard characters in the key are matched literally"""
+		other = dPref(key="tenant", prefDb=self.prefDb)
+		other.x = 1
+		flushPendingPrefs()
+		other._cxn.close()
+		pref = dPref(key="te%t", prefDb=self.prefDb)
+		pref.prefetch()
+		self.assertEqual(pref._cache, {})
+		pref._cxn.close()
+
+
+#used for running this module bare without the test suite
+if __name__ == "__main__":
+	unittest.main()
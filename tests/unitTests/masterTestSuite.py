@@ -36,6 +36,10 @@ import Test_dColors
 suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_dColors))
 import Test_dObject
 suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_dObject))
+import Test_dPref
+suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_dPref))
+import Test_dEvents
+suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_dEvents))
 
 
 allTiersTestSuite = unittest.TestSuite(suiteList)
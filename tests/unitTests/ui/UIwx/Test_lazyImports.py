@@ -0,0 +1,68 @@
+"""Test Case for the lazy importing of the dabo.ui classes.
+
+To import this file into the test suite run:
+
+import Test_lazyImports
+suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_lazyImports))
+
+If this file is run standalone, it will automatically run all of the test cases found in the file.
+"""
+
+import sys
+import unittest
+import dabo.ui
+dabo.ui.loadUI('wx')
+import dabo.ui.uiwx as uiwx
+
+
+class TestLazyImports(unittest.TestCase):
+	def testAllNamesResolve(self):
+		for name, modName in uiwx._lazyImports.items():
+			if modName in uiwx._optionalImports:
+				continue
+			if name == "dPageStyled" and not hasattr(sys.modules["dabo.ui.uiwx.dPageFrame"], name):
+				# Only present with newer wxPython versions
+				continue
+			cls = getattr(dabo.ui, name)
+			self.assertEqual(cls.__name__, name)
+			self.assertTrue(getattr(uiwx, name) is cls)
+
+	def testOptionalNames(self):
+		for modName in uiwx._optionalImports:
+			names = [nm for nm, mod in uiwx._lazyImports.items() if mod == modName]
+			for name in names:
+				# Either the class, or missing from the namespace.
+				if hasattr(dabo.ui, name):
+					self.assertEqual(getattr(dabo.ui, name).__name__, name)
+
+	def testDir(self):
+		names = dir(dabo.ui)
+		for name in ("dForm", "dGrid", "dEditor", "loadUI", "callAfter"):
+			self.assertTrue(name in names)
+
+	def testStarImport(self):
+		namespace = {}
+		exec "from dabo.ui import *" in namespace
+		for name in ("dForm", "dGrid", "dEditor", "loadUI", "callAfter"):
+			self.assertTrue(name in namespace)
+		self.assertFalse("_lazyImports" in namespace)
+		self.assertFalse("_module" in namespace)
+
+	def testUnknownName(self):
+		self.assertRaises(AttributeError, getattr, dabo.ui, "dNoSuchControl")
+
+	def testSetAttribute(self):
+		dabo.ui._testLazyValue = 42
+		try:
+			self.assertEqual(dabo.ui._testLazyValue, 42)
+		finally:
+			del dabo.ui._testLazyValue
+		self.assertFalse(hasattr(dabo.ui, "_testLazyValue"))
+
+	def testDeprecatedNames(self):
+		self.assertTrue(issubclass(dabo.ui.dCheckListBox, dabo.ui.dCheckList))
+		self.assertTrue(issubclass(dabo.ui.dFoldPanelBar, dabo.ui.dSlidePanelControl))
+
+
+if __name__ == "__main__":
+	unittest.main()
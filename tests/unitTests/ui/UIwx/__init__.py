@@ -13,6 +13,8 @@ suiteList = []
 #import TestCase suites and add to list here
 import Test_dTextBox
 suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_dTextBox))
+import Test_lazyImports
+suiteList.append(unittest.TestLoader().loadTestsFromModule(Test_lazyImports))
 
 #setup a suite and return it
 def suite():